@@ -1,16 +0,0 @@
-==============================================================================================================LGO FRAMEWORK FINAL REPORT: P_n (Order) and G_max (Volatility)
-C_LGO (Order): 0.0131656904 | C_MAX (Volatility): 0.55
---------------------------------------------------------------------------------------------------------------Index (n)   | Actual P_n    | LGO P_n       | P_n Diff | Actual G_max  | LGO G_max     | G_max Diff
---------------------------------------------------------------------------------------------------------------10          | 29            | 10            | -19      | 6             | 3             | -3
-100         | 541           | 493           | -48      | 20            | 21            | 1
-1000        | 7919          | 7797          | -122     | 36            | 44            | 8
-10000       | 104729        | 104391        | -338     | 72            | 73            | 1
-100000      | 1299709       | 1298610       | -1099    | 114           | 109           | -5
-1000000     | 15485863      | 15480924      | -4939    | 220           | 151           | -69
-10000000    | 179848529     | 179424344     | -424185  | 354           | 199           | -155
-100000000   | 2038074743    | 2038074743    | 0        | 656           | 253           | -403
---------------------------------------------------------------------------------------------------------------TOTAL ABSOLUTE DISTANCE (P_n): 430750
-TOTAL ABSOLUTE DISTANCE (G_max): 645
-=====================================================================================
-
-[Program finished]
@@ -0,0 +1,113 @@
+# lgo/__init__.py - Law of Geometric Order (LGO) Package
+# Importing lgo only runs this file. Submodules (sieve engines, NumPy batch
+# paths, report builders) and the names listed below are imported on first
+# attribute access, so pool workers and CLI calls start in a few ms.
+#
+#   import lgo
+#   lgo.first_n_primes(1000)                     # loads lgo.sieve
+#   lgo.get_predictor("closure_v2")(n, P_n)      # loads lgo.geometric_closure
+#
+# The scripts are run as modules, e.g. python -m lgo.geometric_laws.
+
+import importlib
+
+# --- SUBMODULES ---
+
+SUBMODULES = (
+    "batch", "bench", "breakpoints", "cache", "calibrate", "cli", "definitive_laws", "gapstats",
+    "geometric_closure", "geometric_laws", "instrument", "model", "primecache", "primecount", "probe", "sensitivity",
+    "server", "sieve", "sieve_v2", "store", "stream", "sweep", "table", "unification_laws", "unified_field",
+    "validate",
+)
+
+# --- LAZY NAMES ---
+# Public name -> submodule that defines it.
+_EXPORTS = {
+    "calculate_raw_lgo_gap": "model",
+    "calculate_raw_lgo_gap_batch": "batch",
+    "predict_maximum_prime_gap_batch": "batch",
+    "first_n_primes": "sieve",
+    "primes_in_range": "sieve",
+    "primes_up_to": "sieve",
+    "parallel_primes_in_range": "sieve",
+    "iter_primes": "stream",
+    "iter_prime_gaps": "stream",
+    "iter_gap_chunks": "stream",
+    "PrimeStore": "store",
+    "PrimeTable": "table",
+    "prime_count": "primecount",
+    "nth_prime": "primecount",
+    "li": "geometric_laws",
+    "li_inverse": "geometric_laws",
+    "lgo_prime": "geometric_laws",
+    "lgo_max_gap": "geometric_laws",
+    "is_prime": "probe",
+    "next_prime_within_predicted_gap": "probe",
+    "ResultCache": "cache",
+}
+
+
+def __getattr__(name):
+    if name in SUBMODULES:
+        return importlib.import_module(f"{__name__}.{name}")
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(f"{__name__}.{_EXPORTS[name]}"), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(SUBMODULES) | set(_EXPORTS))
+
+# --- PREDICTOR REGISTRY ---
+# Every predictor is called as predictor(n, P_n) and returns the predicted
+# maximum gap after the nth prime P_n. Entries are either callables or
+# "module:attribute" targets, which are imported on first lookup. This is
+# the only model registry: lgo.validate.GAP_MODELS is a view of it that adds
+# the vectorized evaluators (or a scalar loop for predictors without one).
+
+def _raw_lgo_gap(n, P_n):
+    """lgo.model.calculate_raw_lgo_gap as an (n, P_n) predictor."""
+    from .model import calculate_raw_lgo_gap
+
+    return calculate_raw_lgo_gap(P_n)[0]
+
+
+PREDICTORS = {
+    "lgo_model": _raw_lgo_gap,
+    "sieve_v2": "lgo.sieve_v2:predict_maximum_prime_gap",
+    "closure_v2": "lgo.geometric_closure:predict_maximum_prime_gap",
+}
+
+
+def register_predictor(name, target):
+    """
+    Adds (or replaces) a predictor.
+
+    A replaced predictor's vectorized evaluator (lgo.validate) is dropped
+    with it, so validation scores the new law through its scalar function.
+
+    Args:
+        name (str): Registry name.
+        target: A callable predictor(n, P_n), or a "module:attribute" string
+            naming one, which is imported on first lookup.
+    """
+    PREDICTORS[name] = target
+
+
+def get_predictor(name):
+    """
+    Returns the predictor registered under name, importing it if needed.
+
+    Raises:
+        KeyError: If no predictor is registered under name.
+    """
+    try:
+        target = PREDICTORS[name]
+    except KeyError:
+        raise KeyError(f"unknown predictor {name!r} (registered: {', '.join(sorted(PREDICTORS))})") from None
+    if isinstance(target, str):
+        module, _, attr = target.partition(":")
+        target = PREDICTORS[name] = getattr(importlib.import_module(module), attr)
+    return target
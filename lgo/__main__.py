@@ -0,0 +1,8 @@
+# lgo/__main__.py - Law of Geometric Order (LGO) Command Line Entry Point
+# python -m lgo <command> ...   (see lgo/cli.py)
+
+import sys
+
+from .cli import main
+
+sys.exit(main())
@@ -0,0 +1,264 @@
+# lgo/bench.py - Law of Geometric Order (LGO) Benchmark Suite
+# Times the sieve, predictors, nth-prime lookups and report generation,
+# checks every result against a reference, and compares the timings with
+# machine-tagged JSON baselines.
+#
+# Usage:
+#   python -m lgo.bench                  run and compare with the baseline
+#   python -m lgo.bench --save           run and store a new baseline
+#   python -m lgo.bench --quick          skip the 10^8-scale benchmarks
+
+import argparse
+import json
+import os
+import platform
+import re
+import sys
+import time
+from collections import namedtuple
+from functools import lru_cache
+
+# --- HARNESS ---
+
+BASELINE_DIR = "bench_baselines"
+
+# A benchmark is slower than its baseline when seconds > baseline * (1 + threshold).
+DEFAULT_THRESHOLD = 0.25
+
+Benchmark = namedtuple("Benchmark", "name run check units repeat quick")
+BENCHMARKS = []
+
+
+def benchmark(name, units, check, repeat=3, quick=True):
+    """
+    Registers a benchmark.
+
+    Args:
+        name (str): Unique benchmark name.
+        units (int): Work items per run (for the throughput column).
+        check (callable): check(result) raises AssertionError when the
+            output differs from the reference, so a speedup can never
+            silently change results.
+        repeat (int): Runs per measurement; the fastest one is kept.
+        quick (bool): Included in --quick runs.
+    """
+    def register(run):
+        BENCHMARKS.append(Benchmark(name, run, check, units, repeat, quick))
+        return run
+    return register
+
+
+def machine_tag() -> str:
+    """Identifies the machine/interpreter a baseline belongs to."""
+    raw = f"{platform.node()}-{platform.machine()}-py{sys.version_info[0]}{sys.version_info[1]}"
+    return re.sub(r"[^A-Za-z0-9_.-]", "_", raw)
+
+
+def baseline_path(tag=None) -> str:
+    return os.path.join(BASELINE_DIR, f"{tag or machine_tag()}.json")
+
+
+def run_benchmarks(quick: bool = False, only=None):
+    """
+    Runs the registered benchmarks.
+
+    Returns:
+        dict: name -> {"seconds", "units_per_second", "ok", "error"}
+    """
+    results = {}
+    for bench in BENCHMARKS:
+        if (quick and not bench.quick) or (only and bench.name not in only):
+            continue
+        best = float("inf")
+        error = None
+        for _ in range(bench.repeat):
+            started = time.perf_counter()
+            output = bench.run()
+            best = min(best, time.perf_counter() - started)
+        try:
+            bench.check(output)
+        except AssertionError as exc:
+            error = str(exc) or "output differs from reference"
+        results[bench.name] = {
+            "seconds": best,
+            "units_per_second": bench.units / best if best else 0.0,
+            "ok": error is None,
+            "error": error,
+        }
+    return results
+
+
+def compare(results, baseline, threshold: float = DEFAULT_THRESHOLD):
+    """Returns the names of benchmarks that regressed beyond threshold."""
+    regressions = []
+    for name, result in results.items():
+        reference = baseline.get("results", {}).get(name)
+        if reference and result["seconds"] > reference["seconds"] * (1 + threshold):
+            regressions.append(name)
+    return regressions
+
+
+def save_baseline(results, path=None):
+    path = path or baseline_path()
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w") as fh:
+        json.dump({"machine": machine_tag(), "created": time.time(), "results": results}, fh, indent=2, sort_keys=True)
+    return path
+
+
+def load_baseline(path=None):
+    path = path or baseline_path()
+    if not os.path.exists(path):
+        return None
+    with open(path) as fh:
+        return json.load(fh)
+
+# --- REFERENCE VALUES ---
+
+# pi(x) for the sieve limits.
+_PRIME_COUNTS = {10**6: 78498, 10**7: 664579, 10**8: 5761455}
+_LAST_PRIMES = {10**6: 999983, 10**7: 9999991, 10**8: 99999989}
+
+# Exact P_n anchors.
+_NTH_PRIMES = {10**6: 15485863, 10**7: 179424673, 10**8: 2038074743, 10**9: 22801763489}
+
+# LGO P_n column of the definitive report.
+_LGO_REPORT_PRIMES = [10, 493, 7797, 104391, 1298610, 15480924, 179424344, 2038074743]
+
+_PREDICTOR_SIZE = 10**5
+
+# --- BENCHMARKS ---
+
+def _sieve_check(limit):
+    def check(primes):
+        assert len(primes) == _PRIME_COUNTS[limit], f"pi({limit}) = {len(primes)}"
+        assert primes[-1] == _LAST_PRIMES[limit], f"last prime below {limit} = {primes[-1]}"
+    return check
+
+
+def _register_sieve(limit, repeat, quick, wheel=None):
+    name = f"sieve.primes_up_to.1e{len(str(limit)) - 1}" + (f".wheel{wheel}" if wheel else "")
+
+    @benchmark(name, limit, _sieve_check(limit), repeat, quick)
+    def run():
+        from .sieve import DEFAULT_WHEEL, primes_up_to
+        return primes_up_to(limit, wheel=wheel or DEFAULT_WHEEL)
+
+
+_register_sieve(10**6, 3, True)
+_register_sieve(10**7, 1, True)
+_register_sieve(10**8, 1, False)
+for _wheel in (2, 30, 210):
+    _register_sieve(10**7, 1, True, _wheel)
+
+
+@lru_cache(maxsize=None)
+def _predictor_inputs():
+    from .sieve import first_n_primes
+    primes = first_n_primes(_PREDICTOR_SIZE)
+    return list(range(1, _PREDICTOR_SIZE + 1)), primes
+
+
+def _scalar_raw_gaps():
+    from .model import calculate_raw_lgo_gap
+    _, primes = _predictor_inputs()
+    return [calculate_raw_lgo_gap(P)[0] for P in primes]
+
+
+def _check_raw_gaps(gaps):
+    assert list(gaps) == _scalar_raw_gaps(), "raw LGO gaps differ from the scalar predictor"
+
+
+def _check_max_gaps(gaps):
+    from .geometric_closure import predict_maximum_prime_gap
+    n, primes = _predictor_inputs()
+    assert list(gaps) == list(map(predict_maximum_prime_gap, n, primes)), "max gaps differ from the scalar predictor"
+
+
+@benchmark("predict.raw_lgo_gap.scalar", _PREDICTOR_SIZE, _check_raw_gaps)
+def _bench_raw_scalar():
+    return _scalar_raw_gaps()
+
+
+# The batch benchmarks time the fast log path (exact=False); the checks
+# compare the integer gaps, which match the scalar predictors exactly.
+@benchmark("predict.raw_lgo_gap.batch", _PREDICTOR_SIZE, _check_raw_gaps)
+def _bench_raw_batch():
+    from .batch import calculate_raw_lgo_gap_batch
+    _, primes = _predictor_inputs()
+    return calculate_raw_lgo_gap_batch(primes, exact=False)[0].tolist()
+
+
+@benchmark("predict.max_gap.scalar", _PREDICTOR_SIZE, _check_max_gaps)
+def _bench_max_scalar():
+    from .geometric_closure import predict_maximum_prime_gap
+    n, primes = _predictor_inputs()
+    return list(map(predict_maximum_prime_gap, n, primes))
+
+
+@benchmark("predict.max_gap.batch", _PREDICTOR_SIZE, _check_max_gaps)
+def _bench_max_batch():
+    from .batch import predict_maximum_prime_gap_batch
+    n, primes = _predictor_inputs()
+    return predict_maximum_prime_gap_batch(n, primes, exact=False).tolist()
+
+
+def _check_nth_primes(values):
+    assert values == list(_NTH_PRIMES.values()), f"nth_prime anchors = {values}"
+
+
+@benchmark("nth_prime.exact", len(_NTH_PRIMES), _check_nth_primes, repeat=1)
+def _bench_nth_prime():
+    from .primecount import nth_prime
+    return [nth_prime(n) for n in _NTH_PRIMES]
+
+
+def _check_report(rows):
+    assert [row[2] for row in rows] == _LGO_REPORT_PRIMES, "LGO P_n column changed"
+    assert [row[1] for row in rows][-1] == _NTH_PRIMES[10**8], "actual P_10^8 changed"
+
+
+@benchmark("report.definitive", 1, _check_report, repeat=1)
+def _bench_report():
+    from .geometric_laws import build_report, format_report
+    rows = build_report()
+    format_report(rows)
+    return rows
+
+# --- COMMAND LINE ---
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="LGO benchmark suite")
+    parser.add_argument("--save", action="store_true", help="store the results as this machine's baseline")
+    parser.add_argument("--quick", action="store_true", help="skip the 10^8-scale benchmarks")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="allowed slowdown (0.25 = 25%%)")
+    parser.add_argument("--baseline", help="baseline JSON file (default: bench_baselines/<machine>.json)")
+    parser.add_argument("--only", nargs="*", help="benchmark names to run")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.quick, args.only)
+    baseline = None if args.save else load_baseline(args.baseline)
+    regressions = compare(results, baseline, args.threshold) if baseline else []
+
+    print(f"{'Benchmark':<32} | {'Seconds':<10} | {'Units/s':<14} | {'vs Baseline':<12} | Check")
+    print("-" * 90)
+    for name, result in results.items():
+        reference = (baseline or {}).get("results", {}).get(name)
+        ratio = f"{result['seconds'] / reference['seconds']:.2f}x" if reference else "-"
+        status = "PASS" if result["ok"] else f"FAIL ({result['error']})"
+        if name in regressions:
+            status += " REGRESSION"
+        print(f"{name:<32} | {result['seconds']:<10.4f} | {result['units_per_second']:<14.4g} | {ratio:<12} | {status}")
+
+    failed = [name for name, result in results.items() if not result["ok"]]
+    if args.save:
+        if failed:
+            # A failing run must never become the reference for later runs.
+            print(f"\nBaseline NOT saved: {len(failed)} check(s) failed ({', '.join(failed)})")
+        else:
+            print(f"\nBaseline saved to {save_baseline(results, args.baseline)}")
+    return 1 if failed or regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
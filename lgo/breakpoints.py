@@ -0,0 +1,358 @@
+# lgo/breakpoints.py - Law of Geometric Order (LGO) Predictor Breakpoint Index
+# After floor() and even-rounding the gap predictors are step functions of
+# P: predict_maximum_prime_gap changes value about 110 times below 10^18.
+# The builders here find every step exactly and store the steps as a sorted
+# run table, so a prediction is one bisect and range questions ("all P with
+# predicted gap 154", "primes per predicted-gap bucket") need no logs.
+#
+# Step positions are first located with float arithmetic and then settled
+# with Decimal evaluation of the defining expressions (the model constants
+# taken as the exact decimals they are written as, sqrt(2), pi and e to the
+# working precision). Precision is raised until the sign of x(P) - t is
+# certain, so no boundary depends on a float rounding of floor().
+
+import math
+from bisect import bisect_right
+from decimal import Decimal, localcontext
+from fractions import Fraction
+from functools import lru_cache
+
+import numpy as np
+
+from .geometric_closure import C_ROOT_GEOMETRIC, THRESHOLD_BREAKPOINT
+from .model import ADDITIVE_FACTOR, FINAL_ROOT_SCALING_CONSTANT, THRESHOLD
+
+# --- INDEX PARAMETERS ---
+
+# Exclusive upper bound on P covered by default (int64 lookups stay exact).
+DEFAULT_LIMIT = 10**18
+
+# P_400 + 1: the Sieve Field of predict_maximum_prime_gap is only used for
+# n <= THRESHOLD_BREAKPOINT, so its piece is indexed up to P_400.
+SIEVE_PIECE_LIMIT = 2742
+
+# Decimal digits tried in turn when certifying the sign of x(P) - t.
+_PRECISIONS = (32, 64, 128, 256)
+
+# Float values this close (relative) to a step are re-checked exactly.
+_FLOAT_GUARD = 1e-9
+
+# --- EXACT ARITHMETIC ---
+
+def _decimal_pi():
+    """pi to the current Decimal precision (series from the decimal module docs)."""
+    with localcontext() as ctx:
+        ctx.prec += 2
+        three = Decimal(3)
+        lasts, t, s, n, na, d, da = 0, three, 3, 1, 0, 0, 24
+        while s != lasts:
+            lasts = s
+            n, na = n + na, na + 8
+            d, da = d + da, da + 32
+            t = (t * n) / d
+            s += t
+    return +s
+
+
+@lru_cache(maxsize=None)
+def _constants(prec: int) -> dict:
+    """The predictor constants as Decimals with prec significant digits."""
+    with localcontext() as ctx:
+        ctx.prec = prec
+        pi, e = _decimal_pi(), Decimal(1).exp()
+        return {
+            "sqrt2": Decimal(2).sqrt(),
+            "sieve_v2": 1 / pi ** 4,
+            "closure_v2": 1 / pi ** 4 - e / (pi ** 4 * pi.sqrt()),
+            "additive": Decimal(repr(ADDITIVE_FACTOR)),
+            "root": Decimal(repr(FINAL_ROOT_SCALING_CONSTANT)),
+        }
+
+
+def _compare(expr, P: int, t) -> int:
+    """Certified sign of expr(P) - t (-1, 0 is never returned, or 1)."""
+    for prec in _PRECISIONS:
+        with localcontext() as ctx:
+            ctx.prec = prec
+            diff = expr(Decimal(P), _constants(prec)) - t
+            if abs(diff) > Decimal(10) ** (12 - prec) * max(1, abs(Decimal(t))):
+                return 1 if diff > 0 else -1
+    raise ArithmeticError(f"cannot separate x({P}) from the step at {t}")
+
+# --- PIECES ---
+# A piece is (float x(P), Decimal x(P, constants)); its value at P is
+# max(minimum, unit * floor(x / unit)): unit 1 for calculate_raw_lgo_gap,
+# unit 2 with minimum 2 for predict_maximum_prime_gap.
+
+def _max_gap_entropy():
+    return (
+        lambda P: C_ROOT_GEOMETRIC * math.log(P) * math.log(math.log(P)),
+        lambda P, k: k["sqrt2"] * P.ln() * P.ln().ln(),
+    )
+
+
+def _max_gap_sieve(model):
+    c_add = {"sieve_v2": "C_ADD_GEOMETRIC", "closure_v2": "C_ADD_PRIME_CORRECTED"}[model]
+    from . import batch
+
+    c_float = getattr(batch, c_add)
+    return (
+        lambda P: C_ROOT_GEOMETRIC * (math.log(P) ** 2) - c_float * P,
+        lambda P, k: k["sqrt2"] * P.ln() ** 2 - k[model] * P,
+    )
+
+
+def _raw_sieve():
+    return (
+        lambda P: math.log(P) ** 2 + ADDITIVE_FACTOR * math.log(P) ** 2,
+        lambda P, k: P.ln() ** 2 * (1 + k["additive"]),
+    )
+
+
+def _raw_entropy():
+    return (
+        lambda P: FINAL_ROOT_SCALING_CONSTANT * math.log(P),
+        lambda P, k: k["root"] * P.ln(),
+    )
+
+
+def _exact_value(piece, P, unit, minimum):
+    """Step value at P; the float value is re-checked exactly near a step."""
+    x_float, x_exact = piece
+    x = x_float(P)
+    value = max(minimum, unit * math.floor(x / unit))
+    if abs(x - round(x / unit) * unit) > _FLOAT_GUARD * max(1.0, abs(x)):
+        return value
+    while value > minimum and _compare(x_exact, P, value) < 0:
+        value -= unit
+    while _compare(x_exact, P, value + unit) >= 0:
+        value += unit
+    return value
+
+
+def _scan_runs(piece, lo, hi, unit, minimum):
+    """Runs over [lo, hi) by evaluating every integer (short or non-monotone pieces)."""
+    starts, values = [], []
+    for P in range(lo, hi):
+        value = _exact_value(piece, P, unit, minimum)
+        if not values or value != values[-1]:
+            starts.append(P)
+            values.append(value)
+    return starts, values
+
+
+def _settle_step(x_exact, P, b, hi, t):
+    """
+    Smallest Q in (P, hi) with x(Q) >= t, starting from the float estimate b.
+
+    Near 10^18 a float x is only good to a few thousand integers of P, so
+    the step is bracketed by galloping out from b and then bisected with
+    exact comparisons. x(P) < t <= x(hi - 1) is known on entry.
+    """
+    a, c, width = b - 1, b, 1
+    while a > P and _compare(x_exact, a, t) >= 0:
+        a, c, width = max(P, a - width), a, width * 2
+    while _compare(x_exact, c, t) < 0:
+        a, c, width = c, min(hi - 1, c + width), width * 2
+    while c - a > 1:
+        m = (a + c) // 2
+        if _compare(x_exact, m, t) >= 0:
+            c = m
+        else:
+            a = m
+    return c
+
+
+def _monotone_runs(piece, lo, hi, unit, minimum):
+    """
+    Runs over [lo, hi) of a piece with x(P) increasing.
+
+    For each next step t the smallest P with x(P) >= t is found by float
+    bisection and then settled exactly by _settle_step.
+    """
+    x_float, x_exact = piece
+    starts, values = [lo], [_exact_value(piece, lo, unit, minimum)]
+    P = lo
+    while True:
+        t = values[-1] + unit
+        if _compare(x_exact, hi - 1, t) < 0:
+            return starts, values
+        a, b = P, hi - 1
+        while b - a > 1:
+            m = (a + b) // 2
+            if x_float(m) >= t:
+                b = m
+            else:
+                a = m
+        P = _settle_step(x_exact, P, b, hi, t)
+        starts.append(P)
+        values.append(_exact_value(piece, P, unit, minimum))
+
+# --- INDEX ---
+
+class BreakpointIndex:
+    """
+    Sorted run table of a step function over the integers lo <= P < limit.
+
+    Run i covers starts[i] <= P < starts[i + 1] (the last one up to limit)
+    with the value values[i].
+    """
+
+    def __init__(self, starts, values, limit: int):
+        self.starts = list(starts)
+        self.values = list(values)
+        self.limit = limit
+        self._starts = np.array(self.starts, dtype=np.int64)
+        self._values = np.array(self.values, dtype=np.int64)
+
+    def __len__(self):
+        return len(self.starts)
+
+    def __repr__(self):
+        return f"BreakpointIndex({len(self)} runs, {self.starts[0]} <= P < {self.limit})"
+
+    def lookup(self, P: int) -> int:
+        """Value at P (one bisect)."""
+        if not self.starts[0] <= P < self.limit:
+            raise ValueError(f"P = {P} is outside the index range [{self.starts[0]}, {self.limit})")
+        return self.values[bisect_right(self.starts, P) - 1]
+
+    def lookup_batch(self, P):
+        """Vectorized lookup over an integer array (one searchsorted)."""
+        P = np.asarray(P, dtype=np.int64)
+        if P.size and (P.min() < self.starts[0] or P.max() >= self.limit):
+            raise ValueError(f"values outside the index range [{self.starts[0]}, {self.limit})")
+        return self._values[np.searchsorted(self._starts, P, side="right") - 1]
+
+    def runs(self):
+        """Yields (lo, hi, value) for every run, hi exclusive."""
+        bounds = self.starts[1:] + [self.limit]
+        yield from zip(self.starts, bounds, self.values)
+
+    def intervals(self, value: int):
+        """All [lo, hi) ranges of P where the index equals value."""
+        return [(lo, hi) for lo, hi, v in self.runs() if v == value]
+
+    def bucket_prime_counts(self, lo: int, hi: int) -> dict:
+        """
+        Number of primes lo <= p < hi in each value bucket.
+
+        Needs one prime_count per run boundary inside [lo, hi), so the cost
+        is that of pi(hi) (seconds around 10^13).
+        """
+        from .primecount import prime_count
+
+        counts = {}
+        for run_lo, run_hi, value in self.runs():
+            a, b = max(lo, run_lo), min(hi, run_hi)
+            if a < b:
+                counts[value] = counts.get(value, 0) + prime_count(b - 1) - prime_count(a - 1)
+        return counts
+
+
+class MaxGapIndex:
+    """
+    predict_maximum_prime_gap as two run tables: sieve (n <= THRESHOLD_BREAKPOINT,
+    P < SIEVE_PIECE_LIMIT) and entropy (n > THRESHOLD_BREAKPOINT).
+
+    Sieve-field queries with P >= SIEVE_PIECE_LIMIT (n <= 400 with a P_n
+    that is not the nth prime) fall back to the model's scalar formula.
+    """
+
+    def __init__(self, sieve: BreakpointIndex, entropy: BreakpointIndex, model: str = "closure_v2"):
+        self.sieve = sieve
+        self.entropy = entropy
+        self.model = model
+
+    def _scalar(self, n, P_n):
+        if self.model == "sieve_v2":
+            from .sieve_v2 import predict_maximum_prime_gap
+        else:
+            from .geometric_closure import predict_maximum_prime_gap
+        return predict_maximum_prime_gap(n, P_n)
+
+    def predict(self, n: int, P_n: int) -> int:
+        """
+        Exact value of the gap formula at (n, P_n), each step certified in
+        Decimal arithmetic. predict_maximum_prime_gap evaluates the same
+        formula in floats and rounds across a step at a few places above
+        ~10^14 (26 of the entropy steps below 10^18 with the default index,
+        e.g. P = 244222913058453: 162 here, 164 from the scalar); there the
+        index is the correct value. Everywhere else the two agree.
+
+        Raises:
+            ValueError: If n > THRESHOLD_BREAKPOINT and P_n is outside the
+                entropy index range.
+        """
+        if n <= THRESHOLD_BREAKPOINT:
+            if P_n >= self.sieve.limit:
+                return self._scalar(n, P_n)
+            return self.sieve.lookup(P_n)
+        return self.entropy.lookup(P_n)
+
+    def predict_batch(self, n, P_n):
+        """Vectorized predict over broadcast arrays (n, P_n)."""
+        n, P_n = np.broadcast_arrays(np.asarray(n), np.asarray(P_n, dtype=np.int64))
+        result = np.empty(P_n.shape, dtype=np.int64)
+        sieve_field = n <= THRESHOLD_BREAKPOINT
+        outside = sieve_field & (P_n >= self.sieve.limit)
+        sieve_field &= ~outside
+        result[sieve_field] = self.sieve.lookup_batch(P_n[sieve_field])
+        result[~sieve_field & ~outside] = self.entropy.lookup_batch(P_n[~sieve_field & ~outside])
+        if outside.any():
+            result[outside] = [self._scalar(i, P) for i, P in zip(n[outside].tolist(), P_n[outside].tolist())]
+        return result
+
+# --- BUILDERS ---
+
+def build_max_gap_index(model: str = "closure_v2", limit: int = DEFAULT_LIMIT) -> MaxGapIndex:
+    """
+    Exact breakpoint index of predict_maximum_prime_gap.
+
+    Args:
+        model (str): "closure_v2" (lgo/geometric_closure.py) or "sieve_v2"
+            (lgo/sieve_v2.py); they differ in the Sieve Field C_add.
+        limit (int): Exclusive upper bound on P for the Entropy Field.
+    """
+    sieve = BreakpointIndex(*_scan_runs(_max_gap_sieve(model), 2, SIEVE_PIECE_LIMIT, 2, 2), SIEVE_PIECE_LIMIT)
+    entropy = BreakpointIndex(*_monotone_runs(_max_gap_entropy(), 2, limit, 2, 2), limit)
+    return MaxGapIndex(sieve, entropy, model)
+
+
+def build_raw_gap_index(limit: int = DEFAULT_LIMIT) -> BreakpointIndex:
+    """
+    Exact breakpoint index of the predicted gap of calculate_raw_lgo_gap.
+
+    Covers 0 <= Pn < limit; Pn < 2 is the "Invalid" value 0. The field
+    switch 1/Pn > THRESHOLD is decided with rationals.
+    """
+    switch = math.ceil(1 / Fraction(repr(THRESHOLD)))
+    sieve_starts, sieve_values = _monotone_runs(_raw_sieve(), 2, switch, 1, 0)
+    entropy_starts, entropy_values = _monotone_runs(_raw_entropy(), switch, limit, 1, 0)
+    starts, values = [0], [0]
+    for P, value in zip(sieve_starts + entropy_starts, sieve_values + entropy_values):
+        if value != values[-1]:
+            starts.append(P)
+            values.append(value)
+    return BreakpointIndex(starts, values, limit)
+
+
+@lru_cache(maxsize=None)
+def max_gap_index(model: str = "closure_v2") -> MaxGapIndex:
+    """build_max_gap_index(model) with the default limit, built once per process."""
+    return build_max_gap_index(model)
+
+
+if __name__ == "__main__":
+    import time
+
+    started = time.perf_counter()
+    index = max_gap_index()
+    print(f"closure_v2 index: {len(index.sieve)} sieve + {len(index.entropy)} entropy runs "
+          f"below 10^18, built in {time.perf_counter() - started:.3f} s")
+    print("-" * 50)
+    for lo, hi in index.entropy.intervals(154)[:1]:
+        print(f"Predicted gap 154 for {lo} <= P < {hi}")
+    print("Primes per predicted-gap bucket below 10^7:")
+    for value, count in sorted(index.entropy.bucket_prime_counts(2750, 10**7).items()):
+        print(f"  {value:>4}: {count}")
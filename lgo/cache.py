@@ -0,0 +1,235 @@
+# lgo/cache.py - Law of Geometric Order (LGO) Persistent Result Cache
+# Content-addressed on-disk cache for prime chunks and per-model scoring
+# results, keyed by range, engine version and the LGO model constants.
+
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+import time
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # non-POSIX: eviction runs without the inter-process lock
+    fcntl = None
+
+# --- CACHE PARAMETERS ---
+
+# Bump when a change to the sieve/predictor engines alters cached outputs.
+ENGINE_VERSION = 1
+
+DEFAULT_CACHE_DIR = os.environ.get("LGO_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "lgo"))
+
+# Size cap for all entries together (bytes). Least recently used entries
+# are evicted first once it is exceeded.
+DEFAULT_MAX_BYTES = 1 << 30
+
+# Eviction frees entries down to this fraction of max_bytes, so a full
+# cache is rescanned once per ~10% of max_bytes written, not on every put.
+LOW_WATER = 0.9
+
+# Temporary files older than this (seconds) were left by a killed writer
+# and are deleted by the eviction scan.
+STALE_TMP_SECONDS = 3600
+
+_MISSING = object()
+
+# --- KEYS ---
+
+def model_constants() -> dict:
+    """
+    Returns every constant that changes a gap/P_n prediction, read from
+    the modules the evaluators read them from at call time (lgo.batch for
+    the gap laws, lgo.geometric_laws for the P_n law), so a patched
+    constant changes the key and the computed values together.
+    """
+    from . import batch, geometric_laws
+
+    return {
+        "ADDITIVE_FACTOR": batch.ADDITIVE_FACTOR,
+        "THRESHOLD": batch.THRESHOLD,
+        "FINAL_ROOT_SCALING_CONSTANT": batch.FINAL_ROOT_SCALING_CONSTANT,
+        "C_ROOT_GEOMETRIC": batch.C_ROOT_GEOMETRIC,
+        "THRESHOLD_BREAKPOINT": batch.THRESHOLD_BREAKPOINT,
+        "C_ADD_GEOMETRIC": batch.C_ADD_GEOMETRIC,
+        "C_ADD_PRIME_CORRECTED": batch.C_ADD_PRIME_CORRECTED,
+        "C_LGO": geometric_laws.C_LGO,
+        "C_MAX": geometric_laws.C_MAX,
+    }
+
+
+def cache_key(kind: str, **params) -> str:
+    """
+    Content address of a result: SHA-256 of the canonical JSON of the
+    result kind, the engine version and the parameters (range, constants).
+    """
+    payload = json.dumps({"kind": kind, "engine": ENGINE_VERSION, **params}, sort_keys=True, default=repr)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+# --- CACHE ---
+
+class ResultCache:
+    """
+    On-disk cache shared safely by several worker processes.
+
+    Entries are written to a temporary file and moved into place with
+    os.replace, so readers only ever see complete entries. Reads refresh
+    the entry's mtime, which is the LRU clock used by eviction. Eviction
+    runs under an exclusive flock so two processes never evict at once.
+
+    A running total of the entry sizes is kept in a sidecar file (.size),
+    updated under the same lock by every put, so a put only scans the
+    directory when the total goes past max_bytes (or the sidecar is
+    missing). The scan recomputes the total exactly.
+    """
+
+    def __init__(self, directory=None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = os.fspath(directory or DEFAULT_CACHE_DIR)
+        self.max_bytes = max_bytes
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key + ".pkl")
+
+    def _files(self):
+        for shard in os.scandir(self.directory):
+            if shard.is_dir():
+                yield from os.scandir(shard.path)
+
+    def _entries(self):
+        return (entry for entry in self._files() if entry.name.endswith(".pkl"))
+
+    @contextmanager
+    def _locked(self):
+        with open(os.path.join(self.directory, ".lock"), "a") as lock:
+            if fcntl:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            yield
+
+    # --- running size total (call with the lock held) ---
+
+    def _read_total(self):
+        try:
+            with open(os.path.join(self.directory, ".size")) as fh:
+                return int(fh.read())
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def _write_total(self, total: int):
+        with open(os.path.join(self.directory, ".size"), "w") as fh:
+            fh.write(str(total))
+
+    def get(self, key: str, default=None):
+        path = self._path(key)
+        try:
+            with open(path, "rb") as fh:
+                value = pickle.load(fh)
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            return default
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass  # evicted by another process after the read
+        return value
+
+    def put(self, key: str, value):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        try:
+            replaced = os.stat(path).st_size
+        except FileNotFoundError:
+            replaced = 0
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                pickle.dump(value, fh, protocol=pickle.HIGHEST_PROTOCOL)
+                size = fh.tell()
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+        with self._locked():
+            total = self._read_total()
+            if total is None or total + size - replaced > self.max_bytes:
+                self._evict()
+            else:
+                self._write_total(total + size - replaced)
+
+    def get_or_compute(self, kind: str, compute, **params):
+        """Returns the cached result for (kind, params), computing it on a miss."""
+        key = cache_key(kind, **params)
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def size(self) -> int:
+        return sum(entry.stat().st_size for entry in self._entries())
+
+    def evict(self):
+        """Deletes least recently used entries until the cache fits LOW_WATER * max_bytes."""
+        with self._locked():
+            self._evict()
+
+    def _evict(self):
+        """Full scan (lock held): drops stale temp files, then LRU entries."""
+        stale = time.time() - STALE_TMP_SECONDS
+        entries = []
+        for entry in self._files():
+            try:
+                stat = entry.stat()
+                if entry.name.endswith(".pkl"):
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+                elif entry.name.endswith(".tmp") and stat.st_mtime < stale:
+                    os.unlink(entry.path)
+            except FileNotFoundError:
+                continue
+        total = sum(size for _, size, _ in entries)
+        target = self.max_bytes if total <= self.max_bytes else LOW_WATER * self.max_bytes
+        for _, size, path in sorted(entries):
+            if total <= target:
+                break
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+        self._write_total(total)
+
+    def clear(self):
+        with self._locked():
+            for entry in list(self._entries()):
+                try:
+                    os.unlink(entry.path)
+                except FileNotFoundError:
+                    pass
+            self._write_total(0)
+
+# --- CACHED ENGINE CALLS ---
+
+def cached_primes_in_range(lo: int, hi: int, cache=None):
+    """Primes in [lo, hi) as an int64 NumPy array, served from the cache when present."""
+    import numpy as np
+
+    from .sieve import primes_in_range
+
+    cache = cache or ResultCache()
+    return cache.get_or_compute(
+        "primes", lambda: np.array(primes_in_range(lo, hi), dtype=np.int64), lo=lo, hi=hi
+    )
+
+
+def cached_validate(stop=None, count=None, models=None, cache=None):
+    """lgo.validate.validate(), keyed by range, model names and model constants."""
+    from .validate import GAP_MODELS, validate
+
+    cache = cache or ResultCache()
+    names = sorted(models or GAP_MODELS)
+    return cache.get_or_compute(
+        "validate", lambda: validate(stop, count, names),
+        stop=stop, count=count, models=names, constants=model_constants(),
+    )
@@ -0,0 +1,227 @@
+# lgo/calibrate.py - Law of Geometric Order (LGO) Constant Calibration Engine
+# Fits the gap-law constants (ADDITIVE_FACTOR, THRESHOLD,
+# FINAL_ROOT_SCALING_CONSTANT, C_MAX, C_ROOT / C_ADD) against the table of
+# maximal prime gaps, evaluating whole parameter grids in vectorized form.
+
+import math
+from collections import namedtuple
+
+import numpy as np
+
+from .batch import C_ADD_PRIME_CORRECTED, C_ROOT_GEOMETRIC, THRESHOLD_BREAKPOINT
+from .geometric_laws import C_MAX, MAXIMAL_GAP_RECORDS, MAXIMAL_GAP_VERIFIED_LIMIT
+from .model import ADDITIVE_FACTOR, FINAL_ROOT_SCALING_CONSTANT, THRESHOLD
+
+# --- CALIBRATION PARAMETERS ---
+
+# Loss = sum |predicted - actual| + UNDERSHOOT_PENALTY * (records under-predicted).
+# A maximal-gap law that misses a record is worse than one that overshoots.
+UNDERSHOOT_PENALTY = 100.0
+
+# Candidates evaluated per vectorized block (bounds memory to CHUNK x records).
+GRID_CHUNK = 1 << 15
+
+# Records scored per step; candidates whose partial loss already exceeds the
+# best full loss are dropped before the remaining records are scored.
+RECORD_BLOCK = 8
+
+# --- RECORD TABLE ---
+
+def record_table(limit: int = MAXIMAL_GAP_VERIFIED_LIMIT, stop=None):
+    """
+    Builds the maximal-gap table once, with logs precomputed.
+
+    Args:
+        limit (int): Use the verified records from MAXIMAL_GAP_RECORDS whose
+            gap ends at or below limit.
+        stop (int, optional): Instead, stream the sieve up to stop and
+            collect the records directly (lgo.stream.gap_records).
+
+    Returns:
+        dict[str, ndarray]: n, P, gap, and log_P, log2_P, loglog_P.
+    """
+    if stop is not None:
+        from .stream import gap_records, iter_prime_gaps
+
+        rows = list(gap_records(iter_prime_gaps(stop=stop)))
+        n = np.array([r[0] for r in rows], dtype=np.int64)
+        P = np.array([r[1] for r in rows], dtype=np.int64)
+        gap = np.array([r[2] for r in rows], dtype=np.int64)
+    else:
+        from .primecount import prime_count
+
+        records = [(g, p) for g, p in MAXIMAL_GAP_RECORDS if p + g <= limit]
+        P = np.array([p for _, p in records], dtype=np.int64)
+        gap = np.array([g for g, _ in records], dtype=np.int64)
+        n = np.array([prime_count(p) for _, p in records], dtype=np.int64)
+
+    log_P = np.log(P.astype(np.float64))
+    return {"n": n, "P": P, "gap": gap, "log_P": log_P, "log2_P": log_P ** 2, "loglog_P": np.log(log_P)}
+
+# --- MODELS ---
+# predict(params, table) -> predicted gaps, where params maps each parameter
+# name to a column (k, 1) and the table arrays are rows (1, r).
+
+CalibrationModel = namedtuple("CalibrationModel", "name params defaults predict")
+
+
+def _predict_lgo_model(params, t):
+    Phi_n = t["log2_P"]
+    low_density = 1.0 / t["P"] > params["THRESHOLD"]
+    sieve_psi = Phi_n + params["ADDITIVE_FACTOR"] * Phi_n
+    entropy_psi = params["FINAL_ROOT_SCALING_CONSTANT"] * np.sqrt(Phi_n)
+    return np.floor(np.where(low_density, sieve_psi, entropy_psi))
+
+
+def _predict_volatility(params, t):
+    return np.rint(params["C_MAX"] * t["log2_P"])
+
+
+def _predict_max_gap(params, t):
+    sieve_gap = params["C_ROOT"] * t["log2_P"] - params["C_ADD"] * t["P"]
+    entropy_gap = params["C_ROOT"] * t["log_P"] * t["loglog_P"]
+    result = np.floor(np.where(t["n"] <= THRESHOLD_BREAKPOINT, sieve_gap, entropy_gap))
+    result -= np.mod(result, 2)
+    return np.maximum(result, 2)
+
+
+CALIBRATION_MODELS = {
+    "lgo_model": CalibrationModel(
+        "lgo_model", ("ADDITIVE_FACTOR", "THRESHOLD", "FINAL_ROOT_SCALING_CONSTANT"),
+        {"ADDITIVE_FACTOR": ADDITIVE_FACTOR, "THRESHOLD": THRESHOLD,
+         "FINAL_ROOT_SCALING_CONSTANT": FINAL_ROOT_SCALING_CONSTANT},
+        _predict_lgo_model,
+    ),
+    "volatility": CalibrationModel("volatility", ("C_MAX",), {"C_MAX": C_MAX}, _predict_volatility),
+    "max_gap": CalibrationModel(
+        "max_gap", ("C_ROOT", "C_ADD"),
+        {"C_ROOT": C_ROOT_GEOMETRIC, "C_ADD": C_ADD_PRIME_CORRECTED},
+        _predict_max_gap,
+    ),
+}
+
+# --- LOSS ---
+
+def _rows(table, start, stop):
+    return {key: values[np.newaxis, start:stop] for key, values in table.items()}
+
+
+def evaluate(model, params, table, penalty: float = UNDERSHOOT_PENALTY, best=math.inf):
+    """
+    Loss of k candidates (params: name -> array of length k).
+
+    Records are scored RECORD_BLOCK at a time; a candidate is dropped once
+    its partial loss exceeds best, and its loss is reported as inf.
+
+    Returns:
+        ndarray: float64 loss per candidate.
+    """
+    columns = {name: np.asarray(params[name], dtype=np.float64)[:, np.newaxis] for name in model.params}
+    k = len(next(iter(columns.values())))
+    loss = np.zeros(k)
+    alive = np.arange(k)
+    records = len(table["gap"])
+
+    for start in range(0, records, RECORD_BLOCK):
+        rows = _rows(table, start, start + RECORD_BLOCK)
+        predicted = model.predict({name: col[alive] for name, col in columns.items()}, rows)
+        error = predicted - rows["gap"]
+        loss[alive] += np.abs(error).sum(axis=1) + penalty * (error < 0).sum(axis=1)
+        if math.isfinite(best):
+            hopeless = loss[alive] > best
+            loss[alive[hopeless]] = math.inf
+            alive = alive[~hopeless]
+            if not alive.size:
+                break
+    return loss
+
+# --- SEARCH ---
+
+def grid_search(model, grid, table, penalty: float = UNDERSHOOT_PENALTY, chunk: int = GRID_CHUNK):
+    """
+    Exhaustive search over the Cartesian product of grid values.
+
+    The product is never materialized: each chunk of flat indices is
+    unravelled into parameter columns, scored with early termination
+    against the best loss so far (seeded with the model's current
+    constants), and discarded.
+
+    Args:
+        model (CalibrationModel): Entry of CALIBRATION_MODELS.
+        grid (dict[str, array_like]): Candidate values per parameter.
+        table (dict): record_table() output.
+
+    Returns:
+        tuple[dict, float, dict]: (best params, best loss, stats with the
+        number of candidates evaluated and pruned early).
+    """
+    axes = [np.asarray(grid.get(name, [model.defaults[name]]), dtype=np.float64) for name in model.params]
+    shape = tuple(len(axis) for axis in axes)
+    total = math.prod(shape)
+
+    best_params = dict(model.defaults)
+    best = float(evaluate(model, {k: [v] for k, v in best_params.items()}, table, penalty)[0])
+    pruned = 0
+
+    for start in range(0, total, chunk):
+        flat = np.arange(start, min(start + chunk, total))
+        index = np.unravel_index(flat, shape)
+        params = {name: axis[i] for name, axis, i in zip(model.params, axes, index)}
+        loss = evaluate(model, params, table, penalty, best)
+        pruned += int(np.isinf(loss).sum())
+        i = int(np.argmin(loss))
+        if loss[i] < best:
+            best = float(loss[i])
+            best_params = {name: float(values[i]) for name, values in params.items()}
+
+    return best_params, best, {"evaluated": total, "pruned": pruned}
+
+
+def pattern_search(model, table, start=None, step=None, penalty: float = UNDERSHOOT_PENALTY,
+                   iterations: int = 200, samples: int = 4096, seed=None):
+    """
+    Derivative-free refinement (the losses are step functions, so gradients
+    are useless): each iteration scores a cloud of random perturbations of
+    the current point in one vectorized call, moves to the best one, and
+    halves the step size when nothing improves.
+
+    Returns:
+        tuple[dict, float]: (best params, best loss)
+    """
+    rng = np.random.default_rng(seed)
+    point = dict(start or model.defaults)
+    step = dict(step or {name: abs(value) * 0.25 or 0.1 for name, value in point.items()})
+    best = float(evaluate(model, {k: [v] for k, v in point.items()}, table, penalty)[0])
+
+    for _ in range(iterations):
+        cloud = {
+            name: point[name] + step[name] * rng.uniform(-1.0, 1.0, samples) for name in model.params
+        }
+        loss = evaluate(model, cloud, table, penalty, best)
+        i = int(np.argmin(loss))
+        if loss[i] < best:
+            best = float(loss[i])
+            point = {name: float(values[i]) for name, values in cloud.items()}
+        else:
+            step = {name: value / 2 for name, value in step.items()}
+            if all(value < 1e-12 for value in step.values()):
+                break
+    return point, best
+
+
+if __name__ == "__main__":
+    table = record_table()
+    print(f"Maximal-gap records: {len(table['gap'])} (up to P = {int(table['P'][-1])})")
+    searches = {
+        "lgo_model": {
+            "ADDITIVE_FACTOR": np.linspace(0.0, 0.5, 101),
+            "THRESHOLD": np.geomspace(1e-4, 1e-1, 100),
+            "FINAL_ROOT_SCALING_CONSTANT": np.linspace(0.5, 20.0, 100),
+        },
+        "volatility": {"C_MAX": np.linspace(0.3, 1.0, 70001)},
+        "max_gap": {"C_ROOT": np.linspace(1.0, 3.0, 1001), "C_ADD": np.linspace(0.0, 0.05, 1001)},
+    }
+    for name, grid in searches.items():
+        model = CALIBRATION_MODELS[name]
+        params, loss, stats = grid_search(model, grid, table)
+        print(f"{name:<11} | loss {loss:<10.1f} | {params} | {stats}")
@@ -0,0 +1,342 @@
+# lgo/cli.py - Law of Geometric Order (LGO) Command Line Tool
+# Streams integers from stdin or files through the batch predictors and the
+# sieve engines and writes NDJSON, CSV or raw little-endian int64 records.
+# Input and output are handled a chunk (about 1 MiB) at a time, so millions
+# of values are converted with NumPy and one format operation per chunk.
+#
+# Usage:
+#   python -m lgo predict < primes.txt                 P_n -> max predicted gap
+#   python -m lgo predict --index --to csv ns.txt      n -> P_n -> gap
+#   python -m lgo predict --from u64 --to raw in.bin -o out.bin
+#   python -m lgo sieve 1000000000000 --start 999999000000
+#   python -m lgo nth-prime < ns.txt
+#   python -m lgo validate --stop 10000000 --to csv
+
+import argparse
+import os
+import sys
+
+import numpy as np
+
+from . import instrument
+from .batch import THRESHOLD_BREAKPOINT
+
+# --- STREAMING INPUT ---
+
+# Bytes read per input chunk.
+CHUNK_BYTES = 1 << 20
+
+INPUT_FORMATS = ("text", "u64", "i64")
+_RAW_DTYPES = {"u64": "<u8", "i64": "<i8"}
+
+
+def _open_sources(paths):
+    """Yields binary file handles for paths ("-" is stdin)."""
+    for path in paths or ["-"]:
+        if path == "-":
+            yield sys.stdin.buffer
+        else:
+            with open(path, "rb") as fh:
+                yield fh
+
+
+def read_values(paths=None, fmt: str = "text", chunk_bytes: int = CHUNK_BYTES):
+    """
+    Streams integers from files (or stdin) as int64 arrays.
+
+    Args:
+        paths (list[str], optional): Input files; "-" or None reads stdin.
+        fmt (str): "text" (integers separated by whitespace or commas),
+            "u64" or "i64" (packed little-endian 8-byte integers).
+        chunk_bytes (int): Bytes read per chunk.
+
+    Yields:
+        ndarray: int64 values, at most about chunk_bytes / 2 per array.
+
+    Raises:
+        ValueError: On malformed text, values outside int64 or a binary
+            input whose length is not a multiple of 8.
+    """
+    for fh in _open_sources(paths):
+        if fmt == "text":
+            yield from _read_text(fh, chunk_bytes)
+        else:
+            yield from _read_raw(fh, _RAW_DTYPES[fmt], chunk_bytes)
+
+
+def _read_text(fh, chunk_bytes):
+    tail = b""
+    while True:
+        data = fh.read(chunk_bytes)
+        if not data:
+            break
+        data = tail + data
+        # Split after the last separator; the partial number is kept for the next chunk.
+        cut = max(data.rfind(b"\n"), data.rfind(b" "), data.rfind(b","), data.rfind(b"\t"))
+        data, tail = data[:cut + 1], data[cut + 1:]
+        values = _parse_text(data)
+        if values.size:
+            yield values
+    values = _parse_text(tail)
+    if values.size:
+        yield values
+
+
+def _parse_text(data):
+    fields = data.replace(b",", b" ").split()
+    try:
+        return np.array(fields, dtype=np.int64)
+    except (ValueError, OverflowError):
+        bad = next((f for f in fields if not f.lstrip(b"+-").isdigit()), None)
+        raise ValueError(f"not an int64 integer: {(bad or b'').decode(errors='replace')!r}") from None
+
+
+def _read_raw(fh, dtype, chunk_bytes):
+    chunk_bytes -= chunk_bytes % 8
+    while True:
+        data = fh.read(chunk_bytes)
+        if not data:
+            return
+        if len(data) % 8:
+            rest = fh.read(8 - len(data) % 8)
+            data += rest
+            if len(data) % 8:
+                raise ValueError("binary input length is not a multiple of 8 bytes")
+        values = np.frombuffer(data, dtype=dtype)
+        if dtype == "<u8" and values.size and values.max() > np.iinfo(np.int64).max:
+            raise ValueError("u64 value does not fit in int64")
+        yield values.astype(np.int64)
+
+# --- STREAMING OUTPUT ---
+
+OUTPUT_FORMATS = ("ndjson", "csv", "raw")
+
+
+class RowWriter:
+    """
+    Writes column arrays as NDJSON, CSV or raw records.
+
+    Each write() formats a whole chunk with a single %-format of a repeated
+    row template, so the per-row cost stays in C.
+
+    Args:
+        fh: Binary output handle.
+        fmt (str): "ndjson", "csv" (header written once) or "raw" (one
+            little-endian int64 per column per row, no header).
+        names (list[str]): Column names.
+        labels (dict, optional): name -> sequence of strings for columns that
+            hold integer codes; text formats write the label, raw the code.
+    """
+
+    def __init__(self, fh, fmt: str, names, labels=None):
+        if fmt not in OUTPUT_FORMATS:
+            raise ValueError(f"unknown output format {fmt!r}")
+        self.fh = fh
+        self.fmt = fmt
+        self.names = list(names)
+        self.labels = {name: np.asarray(values, dtype=object) for name, values in (labels or {}).items()}
+        self.rows = 0
+        if fmt == "ndjson":
+            fields = (f'"{name}": "%s"' if name in self.labels else f'"{name}": %s' for name in self.names)
+            self._template = "{" + ", ".join(fields) + "}\n"
+        elif fmt == "csv":
+            self._template = ",".join(["%s"] * len(self.names)) + "\n"
+            self.fh.write((",".join(self.names) + "\n").encode())
+
+    def write(self, *columns):
+        """Writes one chunk given as equal-length columns (arrays or lists)."""
+        size = len(columns[0])
+        if not size:
+            return
+        if self.fmt == "raw":
+            self.fh.write(np.column_stack([np.asarray(c, dtype="<i8") for c in columns]).tobytes())
+        else:
+            flat = np.empty(size * len(columns), dtype=object)
+            for i, (name, column) in enumerate(zip(self.names, columns)):
+                if name in self.labels:
+                    column = self.labels[name][np.asarray(column, dtype=np.intp)]
+                elif isinstance(column, np.ndarray):
+                    column = column.tolist()
+                elif None in column:
+                    column = ["null" if self.fmt == "ndjson" else "" if v is None else v for v in column]
+                flat[i::len(columns)] = column
+            self.fh.write((self._template * size % tuple(flat.tolist())).encode())
+        self.rows += size
+        if instrument.ENABLED:
+            instrument.count("cli.rows", size)
+            instrument.tick()
+
+# --- PRIME LOOKUPS ---
+
+# Largest index answered from the shared prime cache (lgo.primecache, 4
+# bytes per prime below 2^32); larger indices go through primecount.nth_prime
+# one at a time.
+INDEX_TABLE_LIMIT = 1 << 25
+
+
+def nth_primes(n):
+    """
+    Vectorized P_n for an int64 array of indices (n >= 1).
+
+    Indices up to INDEX_TABLE_LIMIT (or up to what the process-wide prime
+    cache already holds) are read from lgo.primecache, which keeps the
+    primes for the rest of the process.
+    """
+    from .primecache import shared_cache
+
+    n = np.asarray(n, dtype=np.int64)
+    if not n.size:
+        return n.copy()
+    if n.min() < 1:
+        raise ValueError(f"prime index must be >= 1, got {int(n.min())}")
+    cache = shared_cache()
+    table = cache.first_n(max(min(int(n.max()), INDEX_TABLE_LIMIT), cache.count))
+
+    large = n > len(table)
+    P_n = table[np.where(large, 1, n) - 1].astype(np.int64)
+    if large.any():
+        from .primecount import nth_prime
+
+        P_n[large] = np.fromiter(map(nth_prime, n[large].tolist()), dtype=np.int64)
+    return P_n
+
+
+def field_indices(P_n):
+    """
+    Prime indices for the predictors' field switch: pi(P_n) for P_n up to
+    P_{THRESHOLD_BREAKPOINT + 1}, THRESHOLD_BREAKPOINT + 1 above it. Only
+    whether n <= THRESHOLD_BREAKPOINT changes a prediction, so these are
+    exact where it matters without counting primes below large values.
+    """
+    table = nth_primes(np.arange(1, THRESHOLD_BREAKPOINT + 2))
+    return np.searchsorted(table, P_n, side="right")
+
+# --- SUBCOMMANDS ---
+
+def _cmd_predict(args, out):
+    from .validate import FIELD_LABELS, GAP_MODELS
+
+    model = GAP_MODELS[args.model]
+    names = (["n"] if args.index else []) + ["P_n", "predicted_gap", "field"]
+    labels = ["Invalid"] + [FIELD_LABELS[code] for code in sorted(FIELD_LABELS)]
+    writer = RowWriter(out, args.to, names, {"field": labels})
+    for values in read_values(args.files, args.input_format):
+        if args.index:
+            n, P_n = values, nth_primes(values)
+        else:
+            n, P_n = field_indices(values), values
+        with instrument.phase(f"predict.{model.name}"):
+            predicted, fields = model.evaluate(n, P_n)
+        writer.write(*(([n] if args.index else []) + [P_n, predicted, fields]))
+    return writer
+
+
+def _cmd_nth_prime(args, out):
+    writer = RowWriter(out, args.to, ["n", "P_n"])
+    for n in read_values(args.files, args.input_format):
+        writer.write(n, nth_primes(n))
+    return writer
+
+
+def _cmd_sieve(args, out):
+    from .stream import iter_prime_blocks
+
+    writer = RowWriter(out, args.to, ["p"])
+    for block in iter_prime_blocks(args.start, args.stop, wheel=args.wheel):
+        writer.write(np.array(block, dtype=np.int64))
+    return writer
+
+
+def _cmd_validate(args, out):
+    from .validate import FIELD_LABELS, validate
+
+    scores = validate(stop=args.stop, count=args.count, models=args.model, chunk_size=args.chunk_size)
+    names = ["model", "primes", "max_gap"]
+    for label in FIELD_LABELS.values():
+        names += [f"{label.lower()}_violations", f"{label.lower()}_record_violations"]
+    names += ["first_failure", "first_record_failure"]
+    writer = RowWriter(out, args.to, names, {"model": list(scores)})
+
+    columns = [list(range(len(scores))), [s["primes"] for s in scores.values()],
+               [s["max_gap"] for s in scores.values()]]
+    for label in FIELD_LABELS.values():
+        columns += [[s["violations"][label] for s in scores.values()],
+                    [s["record_violations"][label] for s in scores.values()]]
+    columns += [[s["first_failure"] for s in scores.values()], [s["first_record_failure"] for s in scores.values()]]
+    writer.write(*columns)
+    return writer
+
+# --- COMMAND LINE ---
+
+def _add_io_arguments(parser, inputs=True, formats=OUTPUT_FORMATS):
+    if inputs:
+        parser.add_argument("files", nargs="*", help="input files (default: stdin, '-' also means stdin)")
+        parser.add_argument("--from", dest="input_format", choices=INPUT_FORMATS, default="text",
+                            help="input encoding (default: text)")
+    parser.add_argument("--to", choices=formats, default="ndjson", help="output format (default: ndjson)")
+    parser.add_argument("-o", "--output", default="-", help="output file (default: stdout)")
+
+
+def build_parser():
+    from .sieve import DEFAULT_WHEEL, WHEEL_MODULI
+    from .validate import GAP_MODELS
+
+    parser = argparse.ArgumentParser(prog="lgo", description="LGO bulk prediction, sieve and validation tool")
+    parser.add_argument("--profile", metavar="PATH", help="write instrumentation counters as JSON ('-' for stderr)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    predict = commands.add_parser("predict", help="maximum predicted gap for each P_n (or n)")
+    _add_io_arguments(predict)
+    predict.add_argument("--index", action="store_true", help="inputs are prime indices n, not P_n")
+    predict.add_argument("--model", choices=sorted(GAP_MODELS), default="closure_v2", help="gap law (default: closure_v2)")
+    predict.set_defaults(run=_cmd_predict)
+
+    nth = commands.add_parser("nth-prime", help="P_n for each index n")
+    _add_io_arguments(nth)
+    nth.set_defaults(run=_cmd_nth_prime)
+
+    sieve = commands.add_parser("sieve", help="all primes start <= p < stop")
+    sieve.add_argument("stop", type=int)
+    sieve.add_argument("--start", type=int, default=2)
+    sieve.add_argument("--wheel", type=int, choices=WHEEL_MODULI, default=DEFAULT_WHEEL)
+    _add_io_arguments(sieve, inputs=False)
+    sieve.set_defaults(run=_cmd_sieve)
+
+    check = commands.add_parser("validate", help="score the gap laws over the primes up to a bound")
+    bound = check.add_mutually_exclusive_group(required=True)
+    bound.add_argument("--stop", type=int, help="exclusive bound on P_n")
+    bound.add_argument("--count", type=int, help="number of primes")
+    check.add_argument("--model", nargs="*", choices=sorted(GAP_MODELS), help="gap laws (default: all)")
+    check.add_argument("--chunk-size", type=int, default=1 << 16)
+    _add_io_arguments(check, inputs=False, formats=("ndjson", "csv"))
+    check.set_defaults(run=_cmd_validate)
+    return parser
+
+
+def main(argv=None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.profile:
+        instrument.enable()
+
+    to_stdout = args.output == "-"
+    out = sys.stdout.buffer if to_stdout else open(args.output, "wb")
+    try:
+        args.run(args, out)
+        out.flush()
+    except BrokenPipeError:
+        # Reader went away (e.g. piped into head): stop quietly and keep
+        # the interpreter's final stdout flush from raising again.
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+    except ValueError as exc:
+        parser.exit(2, f"lgo: error: {exc}\n")
+    finally:
+        if not to_stdout:
+            out.close()
+        if args.profile:
+            instrument.dump(args.profile)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
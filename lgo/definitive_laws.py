@@ -0,0 +1,15 @@
+# =====================================================================================
+# lgo/definitive_laws.py
+# LGO FRAMEWORK FINAL REPORT: P_n (Order) and G_max (Volatility)
+#
+# Regenerates the definitive report from lgo/geometric_laws.py instead of
+# storing pasted output. Actual P_n values are computed exactly
+# (lgo.primecount.nth_prime), actual G_max values come from the verified
+# maximal-gap record table.
+# =====================================================================================
+
+from .geometric_laws import REPORT_INDICES, build_report, format_report
+
+if __name__ == "__main__":
+    print(format_report(build_report(REPORT_INDICES)))
+    print("\n[Program finished]")
@@ -0,0 +1,326 @@
+# lgo/gapstats.py - Law of Geometric Order (LGO) Mergeable Gap Statistics
+# One streaming pass over consecutive primes collects, per decade of P,
+# the gap-size histogram, mean gap, merit g/ln(p), Cramer ratio g/ln^2(p)
+# and the residual g - Psi_n of the raw LGO magnitude (lgo/model.py), plus
+# the maximal-gap record list. Memory is fixed (one histogram row per
+# decade). Accumulators of adjacent ranges merge into exactly the state a
+# single pass over the joined range would have produced.
+#
+# Usage:
+#   stats = GapStatistics.from_stream(2, 10**8)
+#   a, b = GapStatistics.from_stream(2, 10**6), GapStatistics.from_stream(10**6, 10**8)
+#   a.merge(b).to_dict() == stats.to_dict()     # True
+#   stats.summary()["decades"][-1]["mean_merit"]
+
+import numpy as np
+
+from .batch import calculate_raw_lgo_gap_batch
+
+# --- ACCUMULATOR PARAMETERS ---
+
+# Decades 10^d <= P < 10^(d+1) for d = 0..18 (all of int64).
+DECADES = 19
+_DECADE_BOUNDS = np.array([10 ** d for d in range(1, DECADES)], dtype=np.int64)
+
+# Gap sizes with their own histogram column; larger gaps are kept in a dict.
+HISTOGRAM_BINS = 1 << 11
+
+# Float sums are accumulated as integers in fixed point (value * 2^bits,
+# rounded per gap), so they add up exactly in any order or grouping.
+FIXED_POINT_BITS = 32
+_SQUARE_BITS = 16
+_SUM_CHUNK = 1 << 16
+
+
+def _fixed_sum(values, bits: int) -> int:
+    """Exact integer sum of round(values * 2^bits), in int64-safe chunks."""
+    fixed = np.rint(values * float(1 << bits)).astype(np.int64)
+    return sum(int(fixed[i:i + _SUM_CHUNK].sum()) for i in range(0, len(fixed), _SUM_CHUNK))
+
+
+def _extreme(values, P, gaps, index, pick):
+    """[value, index, P, gap] at the first maximum (pick=np.argmax) or minimum."""
+    i = int(pick(values))
+    return [float(values[i]), index + i, int(P[i]), int(gaps[i])]
+
+
+def _better(current, candidate, sign):
+    """Candidate replaces current only if strictly larger (sign 1) / smaller (sign -1)."""
+    return current is None or (candidate is not None and sign * (candidate[0] - current[0]) > 0)
+
+# --- ACCUMULATOR ---
+
+# name -> 1 to keep the largest value per decade, -1 for the smallest.
+_EXTREMES = (("max_merit", 1), ("max_cramer", 1), ("min_residual", -1), ("max_residual", 1))
+_SUMS = ("gaps", "gap_sum", "merit_sum", "residual_sum", "residual_sq_sum")
+
+
+class GapStatistics:
+    """
+    Streaming, mergeable gap statistics over consecutive primes.
+
+    Feed blocks of consecutive primes in order with update(). The newest
+    prime's gap stays open until the next block (or merged accumulator)
+    supplies the following prime. Gap positions are counted from the
+    first prime seen (position 0); summary() turns them into indices n.
+    """
+
+    def __init__(self):
+        self.primes = 0
+        self.first_prime = None
+        self.last_prime = None
+        self.max_gap = 0
+        self.records = []  # [position, P, gap] of each running-maximum gap
+        self.histogram = np.zeros((DECADES, HISTOGRAM_BINS), dtype=np.int64)
+        self.overflow = {}  # (decade, gap) -> count for gaps >= HISTOGRAM_BINS
+        self.sums = {name: [0] * DECADES for name in _SUMS}
+        self.extremes = {name: [None] * DECADES for name, _ in _EXTREMES}
+
+    @classmethod
+    def from_stream(cls, start: int = 2, stop=None, wheel=None):
+        """Accumulator over the primes start <= p < stop, from lgo.stream."""
+        from .sieve import DEFAULT_WHEEL
+        from .stream import iter_prime_blocks
+
+        stats = cls()
+        for block in iter_prime_blocks(start, stop, wheel=wheel or DEFAULT_WHEEL):
+            stats.update(block)
+        return stats
+
+    # --- streaming ---
+
+    def update(self, primes):
+        """
+        Adds a block of consecutive primes following the ones seen so far.
+
+        Raises:
+            ValueError: If the block does not start above the last prime.
+        """
+        primes = np.asarray(primes, dtype=np.int64)
+        if not primes.size:
+            return self
+        if self.last_prime is None:
+            self.first_prime = int(primes[0])
+            P, position = primes, 0
+        else:
+            if primes[0] <= self.last_prime:
+                raise ValueError(f"block starts at {int(primes[0])}, not after {self.last_prime}")
+            P, position = np.concatenate(([self.last_prime], primes)), self.primes - 1
+        self.primes += len(primes)
+        self.last_prime = int(primes[-1])
+        self._add_gaps(position, P[:-1], np.diff(P))
+        return self
+
+    def _add_gaps(self, position, P, gaps):
+        if not gaps.size:
+            return
+        running = np.maximum.accumulate(np.maximum(gaps, self.max_gap))
+        new = gaps > np.concatenate(([self.max_gap], running[:-1]))
+        for i in np.flatnonzero(new).tolist():
+            self.records.append([position + i, int(P[i]), int(gaps[i])])
+        self.max_gap = int(running[-1])
+
+        # P is increasing, so each decade is one contiguous slice.
+        bounds = np.searchsorted(P, _DECADE_BOUNDS)
+        decades = np.searchsorted(_DECADE_BOUNDS, P[[0, -1]], side="right").tolist()
+        for d in range(decades[0], decades[1] + 1):
+            lo = int(bounds[d - 1]) if d else 0
+            hi = int(bounds[d]) if d < DECADES - 1 else len(P)
+            if lo < hi:
+                self._add_decade(d, position + lo, P[lo:hi], gaps[lo:hi])
+
+    def _add_decade(self, d, position, P, gaps):
+        small = gaps < HISTOGRAM_BINS
+        self.histogram[d] += np.bincount(gaps[small], minlength=HISTOGRAM_BINS)
+        if not small.all():
+            for gap, count in zip(*np.unique(gaps[~small], return_counts=True)):
+                self.overflow[d, int(gap)] = self.overflow.get((d, int(gap)), 0) + int(count)
+
+        log_P = np.log(P.astype(np.float64))
+        merit = gaps / log_P
+        cramer = merit / log_P
+        # Fast log path: Psi_n may be one ulp off the scalar value, far
+        # below the 2^-32 fixed-point resolution of the sums.
+        residual = gaps - calculate_raw_lgo_gap_batch(P, exact=False)[1]
+
+        sums = self.sums
+        sums["gaps"][d] += len(gaps)
+        sums["gap_sum"][d] += int(gaps.sum())
+        sums["merit_sum"][d] += _fixed_sum(merit, FIXED_POINT_BITS)
+        sums["residual_sum"][d] += _fixed_sum(residual, FIXED_POINT_BITS)
+        sums["residual_sq_sum"][d] += _fixed_sum(residual * residual, _SQUARE_BITS)
+
+        candidates = {
+            "max_merit": _extreme(merit, P, gaps, position, np.argmax),
+            "max_cramer": _extreme(cramer, P, gaps, position, np.argmax),
+            "min_residual": _extreme(residual, P, gaps, position, np.argmin),
+            "max_residual": _extreme(residual, P, gaps, position, np.argmax),
+        }
+        self._take_extremes(d, candidates)
+
+    def _take_extremes(self, d, candidates):
+        for name, sign in _EXTREMES:
+            if _better(self.extremes[name][d], candidates[name], sign):
+                self.extremes[name][d] = candidates[name]
+
+    # --- merging ---
+
+    def merge(self, other):
+        """
+        Appends the statistics of the range that directly follows this one.
+
+        The boundary gap (last prime here to other's first prime) is added,
+        so merging shard accumulators in order equals one pass over the
+        whole range. Merging is associative: (a.merge(b)).merge(c) and
+        a.merge(b.merge(c)) give the same state.
+
+        Raises:
+            ValueError: If other does not start above this range's last prime.
+        """
+        if not other.primes:
+            return self
+        if self.last_prime is not None:
+            if other.first_prime <= self.last_prime:
+                raise ValueError(f"cannot append a range starting at {other.first_prime} after {self.last_prime}")
+            self._add_gaps(self.primes - 1, np.array([self.last_prime]), np.array([other.first_prime - self.last_prime]))
+        else:
+            self.first_prime = other.first_prime
+
+        offset = self.primes
+        for position, P, gap in other.records:
+            if gap > self.max_gap:
+                self.records.append([position + offset, P, gap])
+                self.max_gap = gap
+        self.histogram += other.histogram
+        for key, count in other.overflow.items():
+            self.overflow[key] = self.overflow.get(key, 0) + count
+        for name in _SUMS:
+            self.sums[name] = [a + b for a, b in zip(self.sums[name], other.sums[name])]
+        for d in range(DECADES):
+            self._take_extremes(d, {
+                name: None if other.extremes[name][d] is None else
+                [other.extremes[name][d][0], other.extremes[name][d][1] + offset] + other.extremes[name][d][2:]
+                for name, _ in _EXTREMES
+            })
+        self.primes += other.primes
+        self.last_prime = other.last_prime
+        return self
+
+    # --- persistence ---
+
+    def to_dict(self) -> dict:
+        """JSON-serializable state (histograms as sparse [decade, gap, count] rows)."""
+        decades, gaps = np.nonzero(self.histogram)
+        histogram = [[int(d), int(g), int(self.histogram[d, g])] for d, g in zip(decades, gaps)]
+        histogram += [[d, g, c] for (d, g), c in sorted(self.overflow.items())]
+        return {
+            "primes": self.primes,
+            "first_prime": self.first_prime,
+            "last_prime": self.last_prime,
+            "max_gap": self.max_gap,
+            "records": [list(r) for r in self.records],
+            "histogram": sorted(histogram),
+            "sums": {name: list(values) for name, values in self.sums.items()},
+            "extremes": {name: [None if e is None else list(e) for e in values] for name, values in self.extremes.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        stats = cls()
+        stats.primes, stats.first_prime, stats.last_prime = data["primes"], data["first_prime"], data["last_prime"]
+        stats.max_gap = data["max_gap"]
+        stats.records = [list(r) for r in data["records"]]
+        for d, gap, count in data["histogram"]:
+            if gap < HISTOGRAM_BINS:
+                stats.histogram[d, gap] = count
+            else:
+                stats.overflow[d, gap] = count
+        stats.sums = {name: list(values) for name, values in data["sums"].items()}
+        stats.extremes = {name: [None if e is None else list(e) for e in values] for name, values in data["extremes"].items()}
+        return stats
+
+    # --- reports ---
+
+    def gap_histogram(self, decade=None) -> dict:
+        """gap -> count over all decades, or for one decade."""
+        rows = self.histogram if decade is None else self.histogram[decade:decade + 1]
+        counts = {int(g): int(c) for g, c in enumerate(rows.sum(axis=0)) if c}
+        for (d, gap), count in self.overflow.items():
+            if decade is None or d == decade:
+                counts[gap] = counts.get(gap, 0) + count
+        return dict(sorted(counts.items()))
+
+    def summary(self, first_index: int = 1) -> dict:
+        """
+        Per-decade report.
+
+        Args:
+            first_index (int): Prime index n of the first prime seen (1 when
+                the stream started at 2); positions become n = first_index + position.
+
+        Returns:
+            dict: "primes", "gaps", "max_gap", "records" as [n, P_n, gap],
+            and "decades": one entry per decade with gaps, holding the gap
+            count, mean gap, mean merit, the max merit and max Cramer ratio
+            (value, n, P_n, gap) and the Psi_n residual mean, std, min and max.
+        """
+        def located(entry):
+            return None if entry is None else {
+                "value": entry[0], "n": first_index + entry[1], "P_n": entry[2], "gap": entry[3]}
+
+        scale, square_scale = float(1 << FIXED_POINT_BITS), float(1 << _SQUARE_BITS)
+        decades = []
+        for d in range(DECADES):
+            count = self.sums["gaps"][d]
+            if not count:
+                continue
+            mean_residual = self.sums["residual_sum"][d] / scale / count
+            variance = self.sums["residual_sq_sum"][d] / square_scale / count - mean_residual ** 2
+            decades.append({
+                "decade": d,
+                "range": [10 ** d, 10 ** (d + 1)],
+                "gaps": count,
+                "mean_gap": self.sums["gap_sum"][d] / count,
+                "mean_merit": self.sums["merit_sum"][d] / scale / count,
+                "max_merit": located(self.extremes["max_merit"][d]),
+                "max_cramer": located(self.extremes["max_cramer"][d]),
+                "psi_residual": {
+                    "mean": mean_residual,
+                    "std": max(variance, 0.0) ** 0.5,
+                    "min": located(self.extremes["min_residual"][d]),
+                    "max": located(self.extremes["max_residual"][d]),
+                },
+            })
+        return {
+            "primes": self.primes,
+            "gaps": sum(self.sums["gaps"]),
+            "max_gap": self.max_gap,
+            "records": [[first_index + position, P, gap] for position, P, gap in self.records],
+            "decades": decades,
+        }
+
+
+def format_summary(summary) -> str:
+    """Formats GapStatistics.summary() as a per-decade text table."""
+    lines = [
+        f"{'Decade':<8} | {'Gaps':<12} | {'Mean Gap':<9} | {'Mean Merit':<10} | {'Max Merit':<9} | "
+        f"{'Max Cramer':<10} | Psi Residual (mean +/- std)",
+        "-" * 100,
+    ]
+    for row in summary["decades"]:
+        residual = row["psi_residual"]
+        lines.append(
+            f"10^{row['decade']:<5} | {row['gaps']:<12} | {row['mean_gap']:<9.3f} | {row['mean_merit']:<10.4f} | "
+            f"{row['max_merit']['value']:<9.4f} | {row['max_cramer']['value']:<10.4f} | "
+            f"{residual['mean']:.3f} +/- {residual['std']:.3f}"
+        )
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    import time
+
+    started = time.perf_counter()
+    stats = GapStatistics.from_stream(2, 10**8)
+    print(f"Gap statistics for the primes below 10^8 in {time.perf_counter() - started:.2f} s")
+    print(format_summary(stats.summary()))
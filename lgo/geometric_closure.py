@@ -1,8 +1,10 @@
 import math
 import time
 
+from . import instrument
+
 # =================================================================
-# LGO_Geometric_Closure_V2.py (UNIFIED AND FINALIZED PROGRAM)
+# lgo/geometric_closure.py (UNIFIED AND FINALIZED PROGRAM)
 #
 # This file unifies the LGO Geometric Closure Law (Zero-Error Physics)
 # with the corrected LGO Prime Sieve Protocol (Perfect Number Theory).
@@ -78,38 +80,22 @@ def run_geometric_sieve(N_target=1000):
     """
     print(f"\n[4. SIEVE EXECUTION: Finding the first {N_target} Primes using LGO Geometric Constraints]")
     
-    primes = [2, 3]
-    # We start checking from the next potential prime number (P_3 = 5)
-    num = 5 
-    
+    from .table import PrimeTable
+
     start_time = time.time()
     
-    while len(primes) < N_target:
-        is_prime = True
-        
-        # Optimization: Only check factors up to the square root of the number
-        limit = math.isqrt(num)
-        
-        # This is the standard Sieve of Eratosthenes loop
-        for p in primes:
-            if p > limit:
-                break
-            if num % p == 0:
-                is_prime = False
-                break
-        
-        if is_prime:
-            primes.append(num)
-            
-        # Instead of jumping by the predicted gap (g_max), we increment by 2
-        # and confirm the prediction works at the largest required steps.
-        # This solves the issue of missing primes reported by users.
-        num += 2 
+    # Primes from the process-wide prime cache (lgo.primecache), so a later,
+    # larger target only sieves the new segments. The table always starts
+    # from [2, 3] (P_1, P_2) and keeps the primes and their gaps as typed
+    # arrays (lgo.table).
+    primes = PrimeTable.first_n(max(N_target, 2))
 
     end_time = time.time()
     
     print(f"--> SUCCESS: Found {len(primes)} primes in {end_time - start_time:.3f} seconds.")
     print(f"--> The {N_target}-th prime is P_{N_target} = {primes[-1]}.")
+    if instrument.ENABLED:
+        print(instrument.format_report())
     
     # Final check of the prediction at the endpoint
     n_final = len(primes)
@@ -0,0 +1,260 @@
+# lgo/geometric_laws.py - Law of Geometric Order (LGO) Prime and Volatility Laws
+# Implements the two definitive laws described in the README:
+#   1. Law of Geometric Order:      P_n predictor anchored by C_LGO.
+#   2. Law of Geometric Volatility: G_max predictor anchored by C_MAX.
+# Running this file regenerates the LGO FRAMEWORK FINAL REPORT.
+
+import math
+from bisect import bisect_right
+from functools import lru_cache
+
+# --- 1. DEFINITIVE GEOMETRIC CONSTANTS ---
+
+# C_LGO: Geometric Constriction Slope Factor (Order). Zero error at P_{10^8}.
+C_LGO = 0.0131656904
+
+# C_MAX: Geometric Volatility Factor (Chaos Boundary).
+C_MAX = 0.55
+
+# Euler–Mascheroni constant, the constant term of Ramanujan's Li(x) series.
+EULER_GAMMA = 0.5772156649015329
+
+# Indices verified in the definitive report.
+REPORT_INDICES = (10, 100, 1000, 10**4, 10**5, 10**6, 10**7, 10**8)
+
+# Maximal prime gaps (gap, first prime of the gap): every gap larger than all
+# earlier gaps, verified here by a full sieve up to 4.4 * 10^9 (OEIS A002386).
+MAXIMAL_GAP_VERIFIED_LIMIT = 4_400_000_000
+MAXIMAL_GAP_RECORDS = (
+    (1, 2), (2, 3), (4, 7), (6, 23), (8, 89), (14, 113), (18, 523),
+    (20, 887), (22, 1129), (34, 1327), (36, 9551), (44, 15683),
+    (52, 19609), (72, 31397), (86, 155921), (96, 360653), (112, 370261),
+    (114, 492113), (118, 1349533), (132, 1357201), (148, 2010733),
+    (154, 4652353), (180, 17051707), (210, 20831323), (220, 47326693),
+    (222, 122164747), (234, 189695659), (248, 191912783), (250, 387096133),
+    (282, 436273009), (288, 1294268491), (292, 1453168141),
+    (320, 2300942549), (336, 3842610773), (354, 4302407359),
+)
+_RECORD_ENDS = [p + g for g, p in MAXIMAL_GAP_RECORDS]
+
+# Entries kept by each memoized scalar function (li, li_inverse,
+# lgo_prime_raw); batch and grid callers use the *_batch versions.
+SCALAR_CACHE_SIZE = 1 << 12
+
+# --- 2. LOGARITHMIC INTEGRAL Li(x) AND ITS INVERSE ---
+
+@lru_cache(maxsize=SCALAR_CACHE_SIZE)
+def li(x: float) -> float:
+    """
+    Logarithmic integral li(x) for x > 1, via Ramanujan's series:
+
+        li(x) = gamma + ln ln x + sqrt(x) * sum_{n>=1} [ (-1)^(n-1) (ln x)^n
+                / (n! 2^(n-1)) * sum_{k=0}^{floor((n-1)/2)} 1/(2k+1) ]
+
+    The series converges for every x > 1 and needs about 2 * ln(x) terms.
+    """
+    if x <= 1:
+        raise ValueError(f"li(x) requires x > 1, got {x}")
+    L = math.log(x)
+    total = 0.0
+    factor = -2.0  # becomes (-1)^(n-1) L^n / (n! 2^(n-1)), starting at L for n = 1
+    inner = 0.0
+    n = 0
+    while True:
+        n += 1
+        factor *= -L / (2 * n)
+        if n % 2 == 1:
+            inner += 1.0 / n  # 1/(2k+1) with 2k+1 = n
+        term = factor * inner
+        total += term
+        if n > L and abs(term) < 1e-17 * abs(total):
+            break
+    return EULER_GAMMA + math.log(L) + math.sqrt(x) * total
+
+
+@lru_cache(maxsize=SCALAR_CACHE_SIZE)
+def li_inverse(y: float) -> float:
+    """
+    Returns x with li(x) = y, i.e. the Li(x) estimate P_{n, Li(x)} of P_n
+    when y = n. Newton steps x -= (li(x) - y) * ln(x), started from the
+    Cipolla expansion, converge in a handful of iterations.
+    """
+    if y < 2:
+        raise ValueError(f"li_inverse(y) requires y >= 2, got {y}")
+    x = max(cipolla_expansion(y), 2.0)
+    for _ in range(50):
+        step = (li(x) - y) * math.log(x)
+        x -= step
+        if abs(step) <= 1e-13 * x:
+            break
+    return x
+
+# --- 3. LAW OF GEOMETRIC ORDER (P_n) ---
+
+def cipolla_expansion(n: float) -> float:
+    """
+    The asymptotic expansion of Li^-1(n) through the (ln ln n)^2 / ln^2 n
+    term (Cipolla, 1902):
+
+        n * [ ln n + ln ln n - 1 + (ln ln n - 2) / ln n
+              - ((ln ln n)^2 - 6 ln ln n + 11) / (2 ln^2 n) ]
+    """
+    L = math.log(n)
+    LL = math.log(L)
+    return n * (L + LL - 1 + (LL - 2) / L - (LL * LL - 6 * LL + 11) / (2 * L * L))
+
+
+@lru_cache(maxsize=SCALAR_CACHE_SIZE)
+def lgo_prime_raw(n: int) -> float:
+    """
+    The Law of Geometric Order, unrounded:
+
+        P_n,LGO = P_n,Li(x) - C_LGO * n / ln^2(n)
+
+    where P_n,Li(x) is the high-order Li(x) expansion (cipolla_expansion)
+    and the single geometric constriction term C_LGO / ln^2(n) replaces the
+    statistical tail of the expansion.
+
+    The expansion is used rather than the exact inverse li_inverse(n):
+    C_LGO was fitted against the truncated expansion (zero error at
+    P_{10^8}), and the constriction term stands in for exactly the tail
+    the truncation drops. With li_inverse(n) as the base the same C_LGO
+    is ~54000 off at P_{10^8}. li_inverse stays available as the exact
+    Li^-1(n) estimate of P_n.
+    """
+    L = math.log(n)
+    return cipolla_expansion(n) - C_LGO * n / (L * L)
+
+
+def lgo_prime(n: int) -> int:
+    """Returns the LGO predicted n-th prime (nearest integer), for n >= 3."""
+    return round(lgo_prime_raw(n))
+
+# --- 4. LAW OF GEOMETRIC VOLATILITY (G_max) ---
+
+def lgo_max_gap(P: float) -> int:
+    """Returns the LGO maximal gap near P: C_MAX * ln(P)^2, to the nearest integer."""
+    return round(C_MAX * math.log(P) ** 2)
+
+
+def actual_max_gap(P: int) -> int:
+    """
+    Returns the largest gap between consecutive primes <= P, read from
+    MAXIMAL_GAP_RECORDS.
+    """
+    if P > MAXIMAL_GAP_VERIFIED_LIMIT:
+        raise ValueError(f"no verified maximal-gap records beyond {MAXIMAL_GAP_VERIFIED_LIMIT}")
+    i = bisect_right(_RECORD_ENDS, P)
+    return MAXIMAL_GAP_RECORDS[i - 1][0] if i else 0
+
+# --- 5. BATCH MODE ---
+
+def lgo_prime_batch(n):
+    """
+    Vectorized lgo_prime_raw over an array of indices (float64 result).
+
+    Uses NumPy's log, so individual values may differ from the scalar
+    function in the last ulp.
+    """
+    import numpy as np
+
+    n = np.asarray(n, dtype=np.float64)
+    L = np.log(n)
+    LL = np.log(L)
+    return n * (L + LL - 1 + (LL - 2) / L - (LL * LL - 6 * LL + 11) / (2 * L * L)) - C_LGO * n / (L * L)
+
+
+def li_batch(x):
+    """Vectorized li(x) for an array of x > 1 (same Ramanujan series)."""
+    import numpy as np
+
+    x = np.asarray(x, dtype=np.float64)
+    L = np.log(x)
+    total = np.zeros_like(x)
+    factor = np.full_like(x, -2.0)
+    inner = 0.0
+    L_max = float(L.max(initial=0.0))
+    n = 0
+    while True:
+        n += 1
+        factor = factor * (-L / (2 * n))
+        if n % 2 == 1:
+            inner += 1.0 / n
+        term = factor * inner
+        total += term
+        if n > L_max and np.all(np.abs(term) < 1e-17 * np.abs(total)):
+            break
+    return EULER_GAMMA + np.log(L) + np.sqrt(x) * total
+
+
+def li_inverse_batch(y):
+    """Vectorized li_inverse for an array of y >= 2 (simultaneous Newton steps)."""
+    import numpy as np
+
+    y = np.asarray(y, dtype=np.float64)
+    L = np.log(y)
+    LL = np.log(L)
+    x = np.maximum(y * (L + LL - 1 + (LL - 2) / L - (LL * LL - 6 * LL + 11) / (2 * L * L)), 2.0)
+    for _ in range(50):
+        step = (li_batch(x) - y) * np.log(x)
+        x = x - step
+        if np.all(np.abs(step) <= 1e-13 * x):
+            break
+    return x
+
+# --- 6. DEFINITIVE REPORT ---
+
+def build_report(indices=REPORT_INDICES, actual_primes=None):
+    """
+    Computes the rows of the LGO FRAMEWORK FINAL REPORT.
+
+    Args:
+        indices (iterable[int]): Prime indices n to report.
+        actual_primes (dict[int, int], optional): Known P_n values. Missing
+            ones are computed exactly with lgo.primecount.nth_prime.
+
+    Returns:
+        list[tuple]: (n, actual P_n, LGO P_n, actual G_max, LGO G_max) rows.
+    """
+    from .primecount import nth_prime
+
+    actual_primes = actual_primes or {}
+    rows = []
+    for n in indices:
+        actual = actual_primes.get(n) or nth_prime(n)
+        predicted = lgo_prime(n)
+        rows.append((n, actual, predicted, actual_max_gap(actual), lgo_max_gap(predicted)))
+    return rows
+
+
+def format_report(rows) -> str:
+    """Formats report rows in the layout of LGO_Definitive_Laws.py."""
+    rule = "-" * 110
+    lines = [
+        "=" * 110,
+        "LGO FRAMEWORK FINAL REPORT: P_n (Order) and G_max (Volatility)",
+        f"C_LGO (Order): {C_LGO} | C_MAX (Volatility): {C_MAX}",
+        rule,
+        "Index (n)   | Actual P_n    | LGO P_n       | P_n Diff | Actual G_max  | LGO G_max     | G_max Diff",
+        rule,
+    ]
+    total_p = total_g = 0
+    for n, actual, predicted, actual_gap, predicted_gap in rows:
+        p_diff = predicted - actual
+        g_diff = predicted_gap - actual_gap
+        total_p += abs(p_diff)
+        total_g += abs(g_diff)
+        lines.append(
+            f"{n:<11} | {actual:<13} | {predicted:<13} | {p_diff:<8} | {actual_gap:<13} | {predicted_gap:<13} | {g_diff}"
+        )
+    lines += [
+        rule,
+        f"TOTAL ABSOLUTE DISTANCE (P_n): {total_p}",
+        f"TOTAL ABSOLUTE DISTANCE (G_max): {total_g}",
+        "=" * 85,
+    ]
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    print(format_report(build_report()))
@@ -0,0 +1,198 @@
+# lgo/instrument.py - Law of Geometric Order (LGO) Hot-Path Instrumentation
+# Opt-in counters, phase timers and progress output for the sieve engines,
+# the predictors and the validation/probe stages.
+#
+# The engines check the ENABLED flag once per segment, chunk or call, never
+# per number, so leaving the hooks in costs one attribute test when off.
+#
+#   from lgo import instrument
+#   instrument.enable(progress=5.0)        # progress line every 5 s (stderr)
+#   ...run a sieve / validation...
+#   instrument.dump("profile.json")
+#
+# Setting LGO_PROFILE=<path> (or "-" for stderr) enables it for a whole run
+# and writes the JSON snapshot at exit; LGO_PROGRESS=<seconds> adds progress.
+
+import os
+import sys
+import time
+from collections import defaultdict
+
+# --- STATE ---
+
+ENABLED = False
+
+_counters = defaultdict(int)
+_phases = defaultdict(lambda: [0.0, 0])  # name -> [seconds, calls]
+_started = time.perf_counter()
+
+_progress = None  # callable(snapshot) or None
+_interval = 0.0
+_next_progress = 0.0
+
+
+def enable(progress=None, interval: float = None):
+    """
+    Turns instrumentation on (and resets it).
+
+    Args:
+        progress: None for no progress output, True (or a number of seconds)
+            for a line on stderr, or a callable receiving snapshot().
+        interval (float, optional): Seconds between progress reports
+            (default: the number passed as progress, else 10).
+    """
+    global ENABLED, _progress, _interval
+    if progress is True or isinstance(progress, (int, float)) and not isinstance(progress, bool):
+        if interval is None and progress is not True:
+            interval = float(progress)
+        progress = _print_progress
+    _progress = progress
+    _interval = 10.0 if interval is None else interval
+    reset()
+    ENABLED = True
+
+
+def disable():
+    """Turns instrumentation off; the collected values stay readable."""
+    global ENABLED
+    ENABLED = False
+
+
+def reset():
+    """Clears every counter and phase timer and restarts the clock."""
+    global _started, _next_progress
+    _counters.clear()
+    _phases.clear()
+    _started = time.perf_counter()
+    _next_progress = _started + _interval
+
+# --- RECORDING (call only when ENABLED) ---
+
+def count(name: str, n: int = 1):
+    """Adds n to a counter."""
+    _counters[name] += n
+
+
+def add_time(name: str, seconds: float, calls: int = 1):
+    """Adds time spent in a phase."""
+    entry = _phases[name]
+    entry[0] += seconds
+    entry[1] += calls
+
+
+class _Phase:
+    __slots__ = ("name", "started")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        add_time(self.name, time.perf_counter() - self.started)
+        return False
+
+
+class _NullPhase:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_PHASE = _NullPhase()
+
+
+def phase(name: str):
+    """Context manager timing a phase (a no-op while disabled)."""
+    return _Phase(name) if ENABLED else _NULL_PHASE
+
+
+def tick():
+    """Emits a progress report if one is due. Engines call this per segment/chunk."""
+    global _next_progress
+    if _progress is not None:
+        now = time.perf_counter()
+        if now >= _next_progress:
+            _next_progress = now + _interval
+            _progress(snapshot())
+
+# --- REPORTING ---
+
+def snapshot() -> dict:
+    """
+    Returns the current values as plain JSON-serializable data.
+
+    Returns:
+        dict: "elapsed" seconds, "counters", "phases" (name -> seconds and
+        calls) and "rates": every counter ending in ".primes" or
+        ".candidates" divided by the elapsed time.
+    """
+    elapsed = time.perf_counter() - _started
+    counters = dict(sorted(_counters.items()))
+    rates = {
+        f"{name}_per_second": value / elapsed
+        for name, value in counters.items()
+        if elapsed > 0 and name.endswith((".primes", ".candidates"))
+    }
+    return {
+        "elapsed": elapsed,
+        "counters": counters,
+        "phases": {name: {"seconds": s, "calls": c} for name, (s, c) in sorted(_phases.items())},
+        "rates": rates,
+    }
+
+
+def dump(target=None):
+    """
+    Writes snapshot() as JSON to a path, an open file, or stdout (None).
+    """
+    import json
+
+    text = json.dumps(snapshot(), indent=2)
+    if target is None or target == "-":
+        (sys.stdout if target is None else sys.stderr).write(text + "\n")
+    elif hasattr(target, "write"):
+        target.write(text + "\n")
+    else:
+        with open(target, "w") as fh:
+            fh.write(text + "\n")
+
+
+def format_report(snap=None) -> str:
+    """Formats a snapshot as a text table (phases, then counters)."""
+    snap = snap or snapshot()
+    lines = [f"{'Phase':<32} | {'Seconds':<10} | {'Calls':<8}", "-" * 56]
+    for name, entry in snap["phases"].items():
+        lines.append(f"{name:<32} | {entry['seconds']:<10.4f} | {entry['calls']:<8}")
+    lines += ["", f"{'Counter':<32} | {'Value':<14} | Per Second", "-" * 64]
+    for name, value in snap["counters"].items():
+        rate = snap["rates"].get(f"{name}_per_second")
+        lines.append(f"{name:<32} | {value:<14} | {'' if rate is None else f'{rate:.4g}'}")
+    return "\n".join(lines)
+
+
+def _print_progress(snap):
+    rates = ", ".join(f"{name.replace('_per_second', '')}/s={rate:.3g}" for name, rate in snap["rates"].items())
+    print(f"[lgo {snap['elapsed']:.1f}s] {rates}", file=sys.stderr, flush=True)
+
+# --- ENVIRONMENT OPT-IN ---
+
+def _enable_from_environment():
+    path = os.environ.get("LGO_PROFILE")
+    progress = os.environ.get("LGO_PROGRESS")
+    if not path and not progress:
+        return
+    enable(progress=float(progress) if progress else None)
+    if path:
+        import atexit
+
+        atexit.register(dump, path)
+
+
+_enable_from_environment()
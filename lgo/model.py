@@ -1,4 +1,4 @@
-# lgo_model.py - Law of Geometric Order (LGO) Core Prediction Module
+# lgo/model.py - Law of Geometric Order (LGO) Core Prediction Module
 # Zenodo Artifact: Implementation of the LGO Piecewise Geometric Law
 
 import math
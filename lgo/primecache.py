@@ -0,0 +1,206 @@
+# lgo/primecache.py - Law of Geometric Order (LGO) Incremental Prime Cache
+# One process-wide table of all primes below a growing limit. Requests past
+# the limit sieve only the missing segments (lgo.stream), so asking for the
+# first 1000 primes and then the first 2000 sieves the range once. The
+# predictors' nth-prime lookups (lgo.cli, lgo.server) and the first-N
+# demos (PrimeTable.first_n) read from it.
+#
+# Primes are stored as uint32 while they fit (uint64 above 2^32), and a
+# memory ceiling (max_bytes; SHARED_MAX_BYTES or LGO_PRIME_CACHE_MB for the
+# shared cache) drops the highest segments first once a request is answered.
+#
+# Usage:
+#   from lgo import primecache
+#   primecache.nth_prime(10**6)          # 15485863, sieves up to it once
+#   primecache.primes_up_to(10**6)       # read-only uint32 view, no sieving
+#   primecache.is_prime(15485863)        # True, binary search in the table
+
+import os
+import threading
+
+import numpy as np
+
+from . import instrument
+from .sieve import DEFAULT_WHEEL
+
+# --- CACHE PARAMETERS ---
+
+# Segment spans grow with the cached limit (lo) between these bounds, so
+# small caches stay cheap and large ones extend in few steps.
+MIN_SEGMENT_SPAN = 1 << 16
+MAX_SEGMENT_SPAN = 1 << 24
+
+# Memory ceiling of the shared cache: 256 MiB (64M primes as uint32), or
+# LGO_PRIME_CACHE_MB MiB from the environment; 0 or less means no ceiling.
+DEFAULT_MAX_BYTES = 256 << 20
+_CEILING_MB = float(os.environ.get("LGO_PRIME_CACHE_MB", DEFAULT_MAX_BYTES / (1 << 20)))
+SHARED_MAX_BYTES = int(_CEILING_MB * (1 << 20)) if _CEILING_MB > 0 else None
+
+_UINT32_MAX = (1 << 32) - 1
+
+# --- CACHE ---
+
+class PrimeCache:
+    """
+    All primes below `limit`, extended segment by segment on demand.
+
+    The primes live in one buffer with spare capacity, so growth appends
+    in place. The buffer is uint32 until a segment reaches past 2^32 and
+    uint64 from then on. Returned arrays are read-only views; they stay
+    valid (and unchanged) when the cache later grows or evicts segments.
+
+    Args:
+        max_bytes (int, optional): Buffer size allowed after a request.
+            Above it, the highest segments are evicted until the rest fits.
+            The request that went past it is still answered in full.
+        wheel (int): Wheel modulus used for sieving new segments.
+    """
+
+    def __init__(self, max_bytes=None, wheel: int = DEFAULT_WHEEL):
+        self.max_bytes = max_bytes
+        self.wheel = wheel
+        self._primes = np.empty(0, dtype=np.uint32)
+        self._count = 0
+        self._limit = 0
+        self._segments = []  # (limit, count) after each appended segment
+        self._lock = threading.RLock()
+
+    @property
+    def limit(self) -> int:
+        """Every prime below limit is cached."""
+        return self._limit
+
+    @property
+    def count(self) -> int:
+        """Number of cached primes, pi(limit - 1)."""
+        return self._count
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the prime buffer, spare capacity included."""
+        return self._primes.nbytes
+
+    def clear(self):
+        with self._lock:
+            self.__init__(self.max_bytes, self.wheel)
+
+    # --- growth and eviction ---
+
+    def _extend(self, stop=None, count=None):
+        """Appends segments until limit >= stop or the cache holds count primes."""
+        from .stream import iter_prime_blocks
+
+        while (stop is not None and self._limit < stop) or (count is not None and self._count < count):
+            lo = self._limit
+            hi = lo + min(max(lo, MIN_SEGMENT_SPAN), MAX_SEGMENT_SPAN)
+            dtype = np.uint32 if hi - 1 <= _UINT32_MAX else np.uint64
+            blocks = [np.array(block, dtype=dtype) for block in iter_prime_blocks(lo, hi, wheel=self.wheel)]
+            primes = np.concatenate(blocks) if blocks else np.empty(0, dtype=dtype)
+
+            end = self._count + len(primes)
+            if end > len(self._primes) or dtype != self._primes.dtype:
+                # Grow by half (a new buffer, so earlier views keep theirs).
+                grown = np.empty(max(end, len(self._primes) + len(self._primes) // 2), dtype=dtype)
+                grown[:self._count] = self._primes[:self._count]
+                self._primes = grown
+            self._primes[self._count:end] = primes
+            self._count, self._limit = end, hi
+            self._segments.append((hi, end))
+            if instrument.ENABLED:
+                instrument.count("primecache.segments")
+                instrument.count("primecache.primes", len(primes))
+
+    def _trim(self):
+        """Evicts the highest segments while the buffer is above max_bytes."""
+        if self.max_bytes is None or self._primes.nbytes <= self.max_bytes:
+            return
+        while self._segments and self._count * self._primes.itemsize > self.max_bytes:
+            self._segments.pop()
+            self._limit, self._count = self._segments[-1] if self._segments else (0, 0)
+            if instrument.ENABLED:
+                instrument.count("primecache.evictions")
+        # A fresh buffer, so views handed out earlier keep their values.
+        self._primes = self._primes[:self._count].copy()
+
+    def _view(self, stop):
+        view = self._primes[:stop]
+        view.flags.writeable = False
+        return view
+
+    # --- lookups ---
+
+    def primes_up_to(self, x: int):
+        """Read-only array (uint32 / uint64) of the primes p <= x."""
+        with self._lock:
+            self._extend(stop=x + 1)
+            result = self._view(int(np.searchsorted(self._primes[:self._count], x, side="right")))
+            self._trim()
+            return result
+
+    def first_n(self, N: int):
+        """Read-only array (uint32 / uint64) of P_1..P_N."""
+        with self._lock:
+            self._extend(count=N)
+            result = self._view(max(N, 0))
+            self._trim()
+            return result
+
+    def nth_prime(self, n: int) -> int:
+        """P_n (P_1 = 2)."""
+        if n < 1:
+            raise ValueError(f"prime index must be >= 1, got {n}")
+        return int(self.first_n(n)[n - 1])
+
+    def nth_primes(self, n):
+        """Vectorized P_n (int64) for an array of indices n >= 1."""
+        n = np.asarray(n, dtype=np.int64)
+        if not n.size:
+            return n.copy()
+        if n.min() < 1:
+            raise ValueError(f"prime index must be >= 1, got {int(n.min())}")
+        return self.first_n(int(n.max()))[n - 1].astype(np.int64)
+
+    def is_prime(self, x: int) -> bool:
+        """
+        Table lookup below limit. Larger x are tested with Miller-Rabin
+        (lgo.probe.is_prime) without growing the cache.
+        """
+        if x < 2:
+            return False
+        with self._lock:
+            if x < self._limit:
+                i = int(np.searchsorted(self._primes[:self._count], x))
+                return i < self._count and int(self._primes[i]) == x
+        from .probe import is_prime
+
+        return is_prime(x)
+
+# --- SHARED CACHE ---
+
+_shared = None
+_shared_lock = threading.Lock()
+
+
+def shared_cache() -> PrimeCache:
+    """The process-wide PrimeCache (created on first use)."""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = PrimeCache(SHARED_MAX_BYTES)
+        return _shared
+
+
+def primes_up_to(x: int):
+    return shared_cache().primes_up_to(x)
+
+
+def nth_prime(n: int) -> int:
+    return shared_cache().nth_prime(n)
+
+
+def nth_primes(n):
+    return shared_cache().nth_primes(n)
+
+
+def is_prime(x: int) -> bool:
+    return shared_cache().is_prime(x)
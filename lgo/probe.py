@@ -0,0 +1,206 @@
+# lgo/probe.py - Law of Geometric Order (LGO) Gap-Window Probe
+# Uses predict_maximum_prime_gap as the search window for the next prime
+# after a (possibly huge) P, so the volatility law can be tested far beyond
+# any range that can be sieved.
+
+import math
+import random
+from collections import namedtuple
+from functools import lru_cache
+
+from . import instrument
+from .sieve import DEFAULT_WHEEL, base_primes, primes_in_range
+from .geometric_closure import predict_maximum_prime_gap
+
+# --- PROBE PARAMETERS ---
+
+# Window candidates divisible by a prime below this bound are discarded
+# before any Miller-Rabin test is run.
+SMALL_PRIME_LIMIT = 1 << 12
+
+# The first 13 prime bases make Miller-Rabin deterministic for every
+# n < 3,317,044,064,679,887,385,961,981 (> 2^81).
+_MR_BASES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+MR_DETERMINISTIC_LIMIT = 3317044064679887385961981
+
+# Extra random bases used above the deterministic limit, drawn from a
+# module-private generator unless the caller passes one (the global random
+# state is never touched).
+_MR_EXTRA_ROUNDS = 16
+_RNG = random.Random()
+
+ProbeResult = namedtuple("ProbeResult", "P next_prime actual_gap predicted_gap held")
+
+
+@lru_cache(maxsize=None)
+def _small_primes():
+    """Trial-division primes below SMALL_PRIME_LIMIT, sieved on first use."""
+    return base_primes(SMALL_PRIME_LIMIT)
+
+# --- PRIMALITY ---
+
+def is_prime(n: int, rng=None) -> bool:
+    """
+    Miller-Rabin primality test.
+
+    Deterministic below MR_DETERMINISTIC_LIMIT. Above it, 16 extra random
+    bases are added, so a composite slips through with probability < 4^-29.
+
+    Args:
+        n (int): Number to test.
+        rng (random.Random, optional): Source of the extra bases.
+    """
+    if n < 2:
+        return False
+    for p in _MR_BASES:
+        if n % p == 0:
+            return n == p
+
+    d, s = n - 1, 0
+    while not d & 1:
+        d >>= 1
+        s += 1
+
+    bases = _MR_BASES
+    if n >= MR_DETERMINISTIC_LIMIT:
+        rng = rng or _RNG
+        bases += tuple(rng.randrange(2, n - 1) for _ in range(_MR_EXTRA_ROUNDS))
+
+    for a in bases:
+        x = pow(a, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+# --- WINDOW SIEVE ---
+
+def _window_survivors(lo: int, hi: int, wheel: int = DEFAULT_WHEEL):
+    """
+    Returns the numbers in [lo, hi] with no prime factor below
+    SMALL_PRIME_LIMIT (small primes themselves are kept).
+
+    Only the candidates coprime to the wheel modulus are stored and
+    sieved; the sieve engine with the small primes as sieving primes
+    leaves exactly these survivors.
+    """
+    with instrument.phase("probe.window_sieve"):
+        survivors = primes_in_range(lo, hi + 1, _small_primes(), wheel=wheel)
+    if instrument.ENABLED:
+        instrument.count("probe.windows")
+        instrument.count("probe.candidates", hi + 1 - lo)
+        instrument.count("probe.survivors", len(survivors))
+    return survivors
+
+
+def _first_prime(candidates):
+    """First Miller-Rabin prime among candidates, or None."""
+    with instrument.phase("probe.miller_rabin"):
+        tested = 0
+        for candidate in candidates:
+            tested += 1
+            if is_prime(candidate):
+                break
+        else:
+            candidate = None
+    if instrument.ENABLED:
+        instrument.count("probe.miller_rabin", tested)
+    return candidate
+
+
+def next_prime_after(P: int, wheel: int = DEFAULT_WHEEL) -> int:
+    """Returns the smallest prime > P."""
+    lo = P + 1
+    width = max(64, 2 * int(math.log(max(P, 2)) ** 2))
+    while True:
+        candidate = _first_prime(_window_survivors(lo, lo + width, wheel))
+        if candidate is not None:
+            return candidate
+        lo += width + 1
+
+# --- GAP-WINDOW PROBE ---
+
+def _estimate_index(P: int) -> int:
+    """Prime index used for the predictor's field selection (exact when cheap)."""
+    from .primecount import SIEVE_CUTOFF, prime_count
+
+    if P < SIEVE_CUTOFF:
+        return max(prime_count(P), 1)
+    from .geometric_laws import li
+
+    return int(li(float(P)))
+
+
+def next_prime_within_predicted_gap(P: int, n=None, predictor=predict_maximum_prime_gap,
+                                    wheel: int = DEFAULT_WHEEL) -> ProbeResult:
+    """
+    Searches for the next prime after P inside the LGO predicted window.
+
+    The window [P + 1, P + predicted_gap] is sieved by the primes below
+    SMALL_PRIME_LIMIT and only the survivors get a Miller-Rabin test. If
+    the window holds no prime the prediction failed; the search then
+    continues past the window so the actual gap is still reported.
+
+    Args:
+        P (int): Starting value (normally a prime P_n), any size.
+        n (int, optional): Index of P for the predictor's field selection.
+            Estimated from pi(P) / Li(P) when omitted.
+        predictor (callable): (n, P_n) -> maximum predicted gap.
+        wheel (int): Wheel modulus for the window sieve (see lgo.sieve).
+
+    Returns:
+        ProbeResult: (P, next_prime, actual_gap, predicted_gap, held)
+    """
+    if n is None:
+        n = _estimate_index(P)
+    with instrument.phase("predict.probe"):
+        predicted_gap = predictor(n, P)
+
+    candidate = _first_prime(_window_survivors(P + 1, P + predicted_gap, wheel))
+    if candidate is not None:
+        return ProbeResult(P, candidate, candidate - P, predicted_gap, True)
+
+    next_prime = next_prime_after(P + predicted_gap, wheel)
+    return ProbeResult(P, next_prime, next_prime - P, predicted_gap, False)
+
+# --- BATCH PROBE ---
+
+def random_prime(bits: int, rng=None) -> int:
+    """Returns a random prime with the given bit length (rng also feeds is_prime)."""
+    rng = rng or _RNG
+    while True:
+        candidate = rng.getrandbits(bits) | (1 << (bits - 1)) | 1
+        if is_prime(candidate, rng):
+            return candidate
+
+
+def probe_batch(values, predictor=predict_maximum_prime_gap, wheel: int = DEFAULT_WHEEL):
+    """
+    Probes many starting values in one call.
+
+    Returns:
+        tuple[list[ProbeResult], dict]: (results, summary) where the summary
+        counts probes, held predictions and violations, and gives the
+        largest actual/predicted gap ratio seen.
+    """
+    results = [next_prime_within_predicted_gap(P, predictor=predictor, wheel=wheel) for P in values]
+    violations = [r for r in results if not r.held]
+    summary = {
+        "probes": len(results),
+        "held": len(results) - len(violations),
+        "violations": len(violations),
+        "max_gap_ratio": max((r.actual_gap / r.predicted_gap for r in results), default=0.0),
+    }
+    return results, summary
+
+
+def probe_random_primes(count: int, bits: int = 64, seed=None, predictor=predict_maximum_prime_gap,
+                        wheel: int = DEFAULT_WHEEL):
+    """Probes count random primes of the given bit length (e.g. 64, 128)."""
+    rng = random.Random(seed)
+    return probe_batch([random_prime(bits, rng) for _ in range(count)], predictor, wheel)
@@ -0,0 +1,175 @@
+# lgo/sensitivity.py - Law of Geometric Order (LGO) Unification Sensitivity Sweep
+# Runs the derivation chains of lgo/unified_field.py (V4) and
+# lgo/unification_laws.py over whole arrays of constants at once and returns
+# the deviation surfaces, so the robustness of the claimed closures can be
+# mapped instead of checked at a single point.
+
+import math
+
+import numpy as np
+
+from . import unification_laws, unified_field
+
+# --- CODATA REFERENCE MANTISSAS (as compared against by the scalar scripts) ---
+
+CODATA_G = 6.67430
+CODATA_HBAR = 1.05457182
+CODATA_C = 2.99792458
+CODATA_ALPHA_INV = 137.035999
+CODATA_M_P = 2.1764
+
+# Deviation surfaces returned by unified_field_batch / sweep_grid.
+SURFACES = ("G", "c", "hbar", "alpha_inv", "M_P")
+
+# Grid points evaluated per pass in sweep_grid (bounds the temporaries).
+SWEEP_CHUNK = 1 << 20
+
+
+def _deviation(value, actual):
+    """Percent deviation, in the same operation order as the scalar scripts."""
+    return np.abs(value - actual) / actual * 100
+
+
+def _as_arrays(*values):
+    return np.broadcast_arrays(*(np.asarray(v, dtype=np.float64) for v in values))
+
+# --- V4: STRUCTURAL SYSTEM (lgo/unified_field.py) ---
+
+def unified_field_batch(c_max, c_zeta=unified_field.C_ZETA, hbar_offset=unified_field.OFFSET_HBAR,
+                        g_offset=unified_field.OFFSET_G_CONSTANT):
+    """
+    Vectorized V4 derivation chain, including the Planck-mass closure test.
+
+    Every argument may be a scalar or an array; they are broadcast together.
+    At the default point each value equals the scalar derive_* /
+    test_system_closure result bit for bit.
+
+    Args:
+        c_max: Geometric volatility factor C_MAX.
+        c_zeta: Zeta normalization constant C_ZETA.
+        hbar_offset: Offset of the hbar mantissa identity, 1/C_MAX - offset.
+        g_offset: Constant part of the G offset identity, e/C_MAX + offset.
+
+    Returns:
+        dict: Arrays of the broadcast shape. "c_lgo", plus for each name in
+        SURFACES the derived mantissa (alpha_inv is the value itself) under
+        the name and its percent deviation from CODATA under
+        "<name>_deviation". M_P is 0 where the closure is undefined
+        (negative radicand or G = 0), as in test_system_closure.
+    """
+    c_max, c_zeta, hbar_offset, g_offset = _as_arrays(c_max, c_zeta, hbar_offset, g_offset)
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        inv_c_max = 1 / c_max
+        c_lgo = c_zeta / (c_max * (math.pi ** 4))
+        m_hbar = inv_c_max - hbar_offset
+        m_g = (math.pi ** 2 / c_max) - (math.e * inv_c_max + g_offset)
+        alpha_inv = (math.e * (1 / c_lgo)) - ((math.pi ** 3) + inv_c_max)
+        m_c = (1 / np.sqrt(c_lgo)) - math.pi / c_max
+
+        G = m_g * (10 ** -11)
+        c = m_c * (10 ** 8)
+        hbar = m_hbar * (10 ** -34)
+        m_p = np.sqrt((hbar * c) / G)
+        m_p = np.where(np.isnan(m_p) | (G == 0), 0.0, m_p)
+        m_p_mantissa = m_p / (10 ** -8)
+
+    return {
+        "c_lgo": c_lgo,
+        "G": m_g,
+        "c": m_c,
+        "hbar": m_hbar,
+        "alpha_inv": alpha_inv,
+        "M_P": m_p_mantissa,
+        "G_deviation": _deviation(m_g, CODATA_G),
+        "c_deviation": _deviation(m_c, CODATA_C),
+        "hbar_deviation": _deviation(m_hbar, CODATA_HBAR),
+        "alpha_inv_deviation": _deviation(alpha_inv, CODATA_ALPHA_INV),
+        "M_P_deviation": _deviation(m_p_mantissa, CODATA_M_P),
+    }
+
+
+def sweep_grid(c_max, c_zeta=(unified_field.C_ZETA,), hbar_offset=(unified_field.OFFSET_HBAR,),
+               g_offset=unified_field.OFFSET_G_CONSTANT, chunk=SWEEP_CHUNK):
+    """
+    Deviation surfaces of the V4 chain over the grid c_max x c_zeta x hbar_offset.
+
+    The grid is evaluated chunk points at a time, so only the five output
+    surfaces are held at full size.
+
+    Args:
+        c_max, c_zeta, hbar_offset: 1-D axes of the grid.
+        g_offset (float): Constant part of the G offset identity.
+        chunk (int): Grid points evaluated per pass.
+
+    Returns:
+        dict: name -> percent-deviation array of shape
+        (len(c_max), len(c_zeta), len(hbar_offset)) for each name in SURFACES.
+    """
+    axes = [np.atleast_1d(np.asarray(a, dtype=np.float64)) for a in (c_max, c_zeta, hbar_offset)]
+    shape = tuple(a.size for a in axes)
+    surfaces = {name: np.empty(shape) for name in SURFACES}
+    flat = {name: surface.reshape(-1) for name, surface in surfaces.items()}
+    total = math.prod(shape)
+
+    for start in range(0, total, chunk):
+        stop = min(start + chunk, total)
+        i, j, k = np.unravel_index(np.arange(start, stop), shape)
+        result = unified_field_batch(axes[0][i], axes[1][j], axes[2][k], g_offset)
+        for name in SURFACES:
+            flat[name][start:stop] = result[name + "_deviation"]
+    return surfaces
+
+
+def within_tolerance(surfaces, percent, names=SURFACES):
+    """Boolean mask of the grid points where every named deviation is <= percent."""
+    return np.logical_and.reduce([surfaces[name] <= percent for name in names])
+
+# --- V1: UNIFICATION CONSTRAINTS (lgo/unification_laws.py) ---
+
+def unification_laws_batch(c_lgo=unification_laws.C_LGO, c_max=unification_laws.C_MAX,
+                           offset_g=unification_laws.OFFSET_G, offset_alpha=unification_laws.OFFSET_ALPHA,
+                           offset_c=unification_laws.OFFSET_C):
+    """
+    Vectorized derive_gravitational_constant, derive_fine_structure_constant
+    and derive_speed_of_light (without the printing).
+
+    Returns:
+        dict: "G", "alpha_inv" and "c" (mantissas, alpha_inv as the value
+        itself) and their "<name>_deviation" percentages from CODATA.
+    """
+    c_lgo, c_max, offset_g, offset_alpha, offset_c = _as_arrays(c_lgo, c_max, offset_g, offset_alpha, offset_c)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        m_g = (math.pi ** 2 / c_max) - offset_g
+        alpha_inv = (math.e * (1 / c_lgo)) - offset_alpha
+        m_c = (1 / np.sqrt(c_lgo)) - offset_c
+
+    return {
+        "G": m_g,
+        "alpha_inv": alpha_inv,
+        "c": m_c,
+        "G_deviation": _deviation(m_g, CODATA_G),
+        "alpha_inv_deviation": _deviation(alpha_inv, CODATA_ALPHA_INV),
+        "c_deviation": _deviation(m_c, CODATA_C),
+    }
+
+
+if __name__ == "__main__":
+    import time
+
+    c_max = np.linspace(0.95, 1.05, 401) * unified_field.C_MAX
+    c_zeta = np.linspace(0.95, 1.05, 401) * unified_field.C_ZETA
+    hbar_offset = np.linspace(0.95, 1.05, 21) * unified_field.OFFSET_HBAR
+
+    started = time.perf_counter()
+    surfaces = sweep_grid(c_max, c_zeta, hbar_offset)
+    seconds = time.perf_counter() - started
+    points = c_max.size * c_zeta.size * hbar_offset.size
+    print(f"V4 chain over {points:,} (C_MAX, C_ZETA, hbar offset) points in {seconds:.2f} s")
+    print("-" * 60)
+    print(f"{'Surface':<10} | {'Min dev (%)':>12} | {'Max dev (%)':>12} | {'<= 1%':>8}")
+    for name in SURFACES:
+        dev = surfaces[name]
+        print(f"{name:<10} | {dev.min():>12.4f} | {dev.max():>12.4f} | {np.mean(dev <= 1.0):>8.2%}")
+    print("-" * 60)
+    closed = within_tolerance(surfaces, 1.0, ("G", "c", "hbar", "M_P"))
+    print(f"G, c, hbar and M_P all within 1%: {closed.mean():.4%} of the grid")
@@ -0,0 +1,391 @@
+# lgo/server.py - Law of Geometric Order (LGO) Local Prediction Server
+# Serves calculate_raw_lgo_gap, predict_maximum_prime_gap and nth-prime
+# lookups over HTTP (TCP or a Unix socket) from one warm process. Requests
+# arriving within BATCH_WINDOW of each other are answered by one call of the
+# batch predictors, and per-endpoint p50/p99 latency is reported at /stats.
+#
+# Usage:
+#   python -m lgo.server --port 8765
+#   curl 'http://127.0.0.1:8765/max-gap?p=1000003'
+#   curl 'http://127.0.0.1:8765/nth-prime?n=1000000'
+#   curl 'http://127.0.0.1:8765/gap?p=50021'
+#   curl 'http://127.0.0.1:8765/stats'
+
+import argparse
+import asyncio
+import json
+import time
+from collections import deque
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+
+from .batch import FIELD_NAMES, calculate_raw_lgo_gap_batch, predict_maximum_prime_gap_batch
+from .cli import field_indices, nth_primes
+
+# --- SERVER PARAMETERS ---
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+# Requests are collected for this long (seconds) after the first one of a
+# batch arrives, or until MAX_BATCH are pending.
+BATCH_WINDOW = 0.002
+MAX_BATCH = 4096
+
+# P_n table size loaded at start-up, so early nth-prime lookups never sieve.
+WARM_PRIMES = 1 << 20
+
+# Pending connections queued by the kernel (bursts of clients connect at once).
+BACKLOG = 1024
+
+# Largest prime index accepted by /nth-prime and /max-gap?n=. Up to here
+# primecount.nth_prime answers in about a second with O(sqrt(P_n)) memory.
+MAX_PRIME_INDEX = 10**9
+
+# Latency samples kept per endpoint for the percentiles.
+LATENCY_WINDOW = 1 << 14
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 500: "Internal Server Error"}
+
+# --- LATENCY STATISTICS ---
+
+class LatencyStats:
+    """Request count, errors and a rolling window of latencies for one endpoint."""
+
+    def __init__(self, window: int = LATENCY_WINDOW):
+        self._samples = deque(maxlen=window)
+        self.requests = 0
+        self.errors = 0
+
+    def record(self, seconds: float, ok: bool = True):
+        self._samples.append(seconds)
+        self.requests += 1
+        self.errors += not ok
+
+    def summary(self, elapsed: float) -> dict:
+        """Counts, p50/p99/max latency (ms) over the window and requests per second."""
+        samples = np.fromiter(self._samples, dtype=np.float64) * 1000
+        p50, p99 = np.percentile(samples, (50, 99)).tolist() if samples.size else (0.0, 0.0)
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "p50_ms": p50,
+            "p99_ms": p99,
+            "max_ms": float(samples.max()) if samples.size else 0.0,
+            "requests_per_second": self.requests / elapsed if elapsed > 0 else 0.0,
+        }
+
+# --- MICRO-BATCHING ---
+
+class MicroBatcher:
+    """
+    Coalesces concurrent submit() calls into one vectorized evaluation.
+
+    Batches are evaluated in the loop's default executor, so a slow batch
+    never blocks the event loop (and the other clients) while it runs.
+
+    Args:
+        evaluate (callable): list of argument tuples -> list of results, in
+            order. If it raises, every request of the batch is evaluated on
+            its own so one bad value only fails its own request.
+        window (float): Seconds to wait for more requests after the first.
+        max_batch (int): Pending requests that trigger an immediate flush.
+    """
+
+    def __init__(self, evaluate, window: float = BATCH_WINDOW, max_batch: int = MAX_BATCH):
+        self.evaluate = evaluate
+        self.window = window
+        self.max_batch = max_batch
+        self.batches = 0
+        self.items = 0
+        self._pending = []
+        self._timer = None
+
+    async def submit(self, *args):
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((args, future))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.window, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        pending, self._pending = self._pending, []
+        if not pending:
+            return
+        self.batches += 1
+        self.items += len(pending)
+        loop = asyncio.get_running_loop()
+        try:
+            task = loop.run_in_executor(None, self._evaluate_all, [args for args, _ in pending])
+        except RuntimeError as exc:  # executor already shut down
+            self._fail(pending, exc)
+            return
+        task.add_done_callback(lambda done: self._resolve(pending, done))
+
+    def _evaluate_all(self, batch):
+        """(ok, result or exception) per request; runs in the executor."""
+        try:
+            return [(True, value) for value in self.evaluate(batch)]
+        except Exception:
+            results = []
+            for args in batch:
+                try:
+                    results.append((True, self.evaluate([args])[0]))
+                except Exception as exc:
+                    results.append((False, exc))
+            return results
+
+    @staticmethod
+    def _fail(pending, exc):
+        for _, future in pending:
+            if not future.done():
+                future.set_exception(exc)
+
+    @classmethod
+    def _resolve(cls, pending, done):
+        """Settles every request of a batch from its finished executor future."""
+        if done.cancelled():
+            return cls._fail(pending, RuntimeError("batch evaluation was cancelled"))
+        error = done.exception()
+        if error is not None:
+            if not isinstance(error, Exception):
+                error = RuntimeError(f"batch evaluation failed: {error!r}")
+            return cls._fail(pending, error)
+        results = done.result()
+        if len(results) != len(pending):
+            error = RuntimeError(f"evaluator returned {len(results)} results for {len(pending)} requests")
+            return cls._fail(pending, error)
+        for (_, future), (ok, value) in zip(pending, results):
+            if future.done():
+                continue
+            if ok:
+                future.set_result(value)
+            else:
+                future.set_exception(value)
+
+# --- BATCH EVALUATORS ---
+
+def _raw_gap_batch(args):
+    P_n = np.array([a[0] for a in args], dtype=np.int64)
+    gaps, psi, fields = calculate_raw_lgo_gap_batch(P_n)
+    return [
+        {"P_n": p, "gap": g, "psi": s, "field": FIELD_NAMES[f]}
+        for p, g, s, f in zip(P_n.tolist(), gaps.tolist(), psi.tolist(), fields.tolist())
+    ]
+
+
+def _max_gap_batch(args):
+    n = np.array([-1 if a[0] is None else a[0] for a in args], dtype=np.int64)
+    P_n = np.array([-1 if a[1] is None else a[1] for a in args], dtype=np.int64)
+    missing_p, missing_n = P_n < 0, n < 0
+    if missing_p.any():
+        P_n[missing_p] = nth_primes(n[missing_p])
+    if missing_n.any():
+        n[missing_n] = field_indices(P_n[missing_n])
+    gaps = predict_maximum_prime_gap_batch(n, P_n)
+    return [{"n": i, "P_n": p, "max_gap": g} for i, p, g in zip(n.tolist(), P_n.tolist(), gaps.tolist())]
+
+
+def _nth_prime_batch(args):
+    n = np.array([a[0] for a in args], dtype=np.int64)
+    return [{"n": i, "P_n": p} for i, p in zip(n.tolist(), nth_primes(n).tolist())]
+
+# --- REQUEST PARSING ---
+
+def _int_param(query, name, required=True):
+    values = query.get(name)
+    if not values:
+        if required:
+            raise ValueError(f"missing parameter {name!r}")
+        return None
+    try:
+        value = int(values[0])
+    except ValueError:
+        raise ValueError(f"parameter {name!r} must be an integer") from None
+    if not 0 <= value < 1 << 63:
+        raise ValueError(f"parameter {name!r} is out of range")
+    return value
+
+
+def _raw_gap_args(query):
+    return (_int_param(query, "p"),)
+
+
+def _check_index(n):
+    if n < 1:
+        raise ValueError("n must be >= 1")
+    if n > MAX_PRIME_INDEX:
+        raise ValueError(f"n must be <= {MAX_PRIME_INDEX}")
+
+
+def _max_gap_args(query):
+    n, P_n = _int_param(query, "n", False), _int_param(query, "p", False)
+    if n is None and P_n is None:
+        raise ValueError("give p (P_n), n, or both")
+    if n is not None:
+        _check_index(n)
+    if P_n is not None and P_n < 2:
+        raise ValueError("p must be >= 2")
+    return n, P_n
+
+
+def _nth_prime_args(query):
+    n = _int_param(query, "n")
+    _check_index(n)
+    return (n,)
+
+
+# path -> (argument parser, batch evaluator)
+ENDPOINTS = {
+    "/gap": (_raw_gap_args, _raw_gap_batch),
+    "/max-gap": (_max_gap_args, _max_gap_batch),
+    "/nth-prime": (_nth_prime_args, _nth_prime_batch),
+}
+
+# --- SERVER ---
+
+class PredictionServer:
+    """
+    asyncio HTTP/1.1 server (keep-alive, GET only) for the LGO predictors.
+
+    Usage:
+        server = PredictionServer()
+        await server.start(port=0)          # or start(path="/tmp/lgo.sock")
+        ... GET http://127.0.0.1:<server.port>/max-gap?p=1000003 ...
+        server.close(); await server.wait_closed()
+    """
+
+    def __init__(self, window: float = BATCH_WINDOW, max_batch: int = MAX_BATCH, warm: int = WARM_PRIMES):
+        self.warm = warm
+        self.batchers = {path: MicroBatcher(evaluate, window, max_batch) for path, (_, evaluate) in ENDPOINTS.items()}
+        self.latency = {path: LatencyStats() for path in ENDPOINTS}
+        self.port = None
+        self._server = None
+        self._started = time.perf_counter()
+
+    async def start(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, path=None):
+        """Warms the prime table and starts listening on host:port or the Unix socket path."""
+        if self.warm:
+            nth_primes(np.array([self.warm]))
+        if path is not None:
+            self._server = await asyncio.start_unix_server(self._handle, path=path, backlog=BACKLOG)
+        else:
+            self._server = await asyncio.start_server(self._handle, host, port, backlog=BACKLOG)
+            self.port = self._server.sockets[0].getsockname()[1]
+        self._started = time.perf_counter()
+        return self
+
+    async def serve_forever(self):
+        await self._server.serve_forever()
+
+    def close(self):
+        self._server.close()
+
+    async def wait_closed(self):
+        await self._server.wait_closed()
+
+    def stats(self) -> dict:
+        """Per-endpoint latency summary plus batch counts and mean batch size."""
+        elapsed = time.perf_counter() - self._started
+        endpoints = {}
+        for path, stats in self.latency.items():
+            batcher = self.batchers[path]
+            endpoints[path] = stats.summary(elapsed)
+            endpoints[path]["batches"] = batcher.batches
+            endpoints[path]["mean_batch"] = batcher.items / batcher.batches if batcher.batches else 0.0
+        return {"uptime": elapsed, "endpoints": endpoints}
+
+    async def _dispatch(self, method, target):
+        url = urlsplit(target)
+        if url.path == "/stats":
+            return 200, self.stats()
+        if url.path not in ENDPOINTS:
+            return 404, {"error": f"unknown endpoint {url.path!r}"}
+        if method != "GET":
+            return 405, {"error": "only GET is supported"}
+        parse_args, _ = ENDPOINTS[url.path]
+        try:
+            args = parse_args(parse_qs(url.query))
+            return 200, await self.batchers[url.path].submit(*args)
+        except ValueError as exc:
+            return 400, {"error": str(exc)}
+        except Exception as exc:
+            return 500, {"error": f"{type(exc).__name__}: {exc}"}
+
+    @staticmethod
+    async def _respond(writer, status, payload, keep_alive):
+        body = json.dumps(payload).encode()
+        writer.write(
+            f"HTTP/1.1 {status} {_REASONS[status]}\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\nConnection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+            .encode() + body
+        )
+        await writer.drain()
+
+    async def _handle(self, reader, writer):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line.strip():
+                    break
+                request = line.decode("latin-1").split()
+                if len(request) != 3:
+                    await self._respond(writer, 400, {"error": "malformed request line"}, False)
+                    break
+                method, target, version = request
+                headers = {}
+                while (header := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    name, _, value = header.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                if "content-length" in headers:
+                    if not headers["content-length"].isdigit():
+                        await self._respond(writer, 400, {"error": "malformed Content-Length"}, False)
+                        break
+                    await reader.readexactly(int(headers["content-length"]))
+
+                started = time.perf_counter()
+                status, payload = await self._dispatch(method, target)
+                keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                await self._respond(writer, status, payload, keep_alive)
+                stats = self.latency.get(urlsplit(target).path)
+                if stats is not None:
+                    stats.record(time.perf_counter() - started, status == 200)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+# --- COMMAND LINE ---
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="LGO local prediction server")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--unix", metavar="PATH", help="listen on a Unix socket instead of TCP")
+    parser.add_argument("--window-ms", type=float, default=BATCH_WINDOW * 1000, help="micro-batch window")
+    parser.add_argument("--max-batch", type=int, default=MAX_BATCH)
+    parser.add_argument("--warm", type=int, default=WARM_PRIMES, help="primes loaded at start-up")
+    args = parser.parse_args(argv)
+
+    async def run():
+        server = PredictionServer(args.window_ms / 1000, args.max_batch, args.warm)
+        await server.start(args.host, args.port, args.unix)
+        print(f"LGO server listening on {args.unix or f'http://{args.host}:{server.port}'}", flush=True)
+        await server.serve_forever()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,508 @@
+# lgo/sieve.py - Law of Geometric Order (LGO) Segmented Prime Sieve Engine
+# Segmented Sieve of Eratosthenes (odd-only, or wheel-factorized mod 30 / 210)
+# used by the LGO verification scripts.
+
+import math
+import os
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
+from itertools import compress
+from operator import sub
+
+from . import instrument
+
+# --- SIEVE ENGINE PARAMETERS ---
+
+# Segment size in bytes. Each byte flags one odd number, so the default
+# 32 KiB segment covers 65,536 integers and stays resident in L1/L2 cache.
+SEGMENT_BYTES = 1 << 15
+
+# P_1 .. P_5: the Rosser upper bound below only holds from n = 6 onwards.
+_SMALL_PRIMES = (2, 3, 5, 7, 11)
+
+# Wheel moduli: only numbers coprime to the modulus are stored and sieved.
+# 2 is the plain odd-only sieve, 30 skips the multiples of 3 and 5 as
+# well (8 of every 30 numbers kept), 210 also skips the multiples of 7 (48/210).
+WHEEL_MODULI = (2, 30, 210)
+DEFAULT_WHEEL = 30
+
+# Flag bytes per segment for each wheel. A wheel does one slice assignment
+# per (prime, residue class) per segment instead of one per prime, so its
+# segments are larger to amortize that overhead.
+WHEEL_SEGMENT_BYTES = {2: SEGMENT_BYTES, 30: 1 << 19, 210: 1 << 20}
+
+# Wheel turns per flag-to-number conversion step (keeps the offset table small).
+_EMIT_TURNS = 64
+
+# --- UPPER BOUND FOR THE n-th PRIME ---
+
+def nth_prime_upper_bound(n: int) -> int:
+    """
+    Returns an integer guaranteed to be >= P_n, so that "first N primes"
+    can be sieved without guessing the range.
+
+    Uses Rosser's bound P_n < n * (ln(n) + ln(ln(n))), valid for n >= 6.
+
+    Args:
+        n (int): The 1-based prime index (n=1 for P_1=2).
+
+    Returns:
+        int: An upper bound for P_n.
+    """
+    if n < 1:
+        raise ValueError(f"prime index must be >= 1, got {n}")
+    if n <= len(_SMALL_PRIMES):
+        return _SMALL_PRIMES[n - 1]
+    log_n = math.log(n)
+    return math.ceil(n * (log_n + math.log(log_n)))
+
+# --- BASE PRIMES ---
+
+def base_primes(limit: int) -> list[int]:
+    """
+    Returns all primes <= limit using a plain odd-only sieve.
+    Used for the sieving primes up to sqrt(x) and for small ranges.
+    """
+    if limit < 2:
+        return []
+    started = time.perf_counter()
+    # flags[i] represents the odd number 2*i + 1
+    size = (limit - 1) // 2 + 1
+    flags = bytearray([1]) * size
+    flags[0] = 0
+    for i in range(1, (math.isqrt(limit) - 1) // 2 + 1):
+        if flags[i]:
+            p = 2 * i + 1
+            start = p * p // 2
+            flags[start::p] = bytes(len(range(start, size, p)))
+    primes = [2] + list(compress(range(1, 2 * size, 2), flags))
+    if instrument.ENABLED:
+        instrument.add_time("sieve.base", time.perf_counter() - started)
+        instrument.count("sieve.base.candidates", size)
+        instrument.count("sieve.base.primes", len(primes))
+    return primes
+
+# --- SEGMENTED SIEVE ---
+
+def iter_segments(lo: int, hi: int, sieving_primes=None, segment_bytes: int = SEGMENT_BYTES):
+    """
+    Sieves the odd numbers in [lo, hi) one cache-sized segment at a time.
+
+    Args:
+        lo (int): Inclusive lower bound.
+        hi (int): Exclusive upper bound.
+        sieving_primes (list[int], optional): All primes <= sqrt(hi - 1).
+            Computed when omitted; pass them in to reuse across calls.
+        segment_bytes (int): Number of odd numbers flagged per segment.
+
+    Yields:
+        tuple[int, bytearray]: (start, flags) where start is odd and
+        flags[i] is 1 exactly when start + 2*i is prime.
+    """
+    if sieving_primes is None:
+        sieving_primes = base_primes(math.isqrt(max(hi - 1, 0)))
+    odd_primes = sieving_primes[1:] if sieving_primes[:1] == [2] else sieving_primes
+
+    start = max(lo, 1) | 1
+    while start < hi:
+        started = time.perf_counter() if instrument.ENABLED else 0.0
+        size = min(segment_bytes, (hi - start + 1) // 2)
+        end = start + 2 * size  # exclusive
+        flags = bytearray([1]) * size
+        if start == 1:
+            flags[0] = 0
+
+        for p in odd_primes:
+            p_squared = p * p
+            if p_squared >= end:
+                break
+            # First odd multiple of p that is >= max(p^2, start)
+            first = max(p_squared, (start + p - 1) // p * p)
+            if not first & 1:
+                first += p
+            idx = (first - start) // 2
+            if idx < size:
+                flags[idx::p] = bytes((size - 1 - idx) // p + 1)
+
+        if instrument.ENABLED:
+            # One division to locate the first multiple and one slice per prime
+            sieved = bisect_right(odd_primes, math.isqrt(end - 1))
+            instrument.add_time("sieve.odd.segment", time.perf_counter() - started)
+            instrument.count("sieve.odd.candidates", size)
+            instrument.count("sieve.odd.modulo", sieved)
+            instrument.count("sieve.odd.slices", sieved)
+            instrument.tick()
+        yield start, flags
+        start = end
+
+# --- WHEEL-FACTORIZED SIEVE ---
+
+@lru_cache(maxsize=None)
+def wheel_residues(wheel: int) -> tuple[int, ...]:
+    """Returns the residues in [1, wheel) coprime to wheel, in order."""
+    if wheel not in WHEEL_MODULI:
+        raise ValueError(f"wheel must be one of {WHEEL_MODULI}, got {wheel}")
+    return tuple(r for r in range(1, wheel) if math.gcd(r, wheel) == 1)
+
+
+def wheel_primes(wheel: int) -> tuple[int, ...]:
+    """Returns the prime factors of wheel; they are never wheel candidates."""
+    return tuple(p for p in _SMALL_PRIMES if wheel % p == 0)
+
+
+@lru_cache(maxsize=None)
+def _wheel_offsets(wheel: int) -> list[int]:
+    """Number offsets of the flags in _EMIT_TURNS turns of the wheel."""
+    residues = wheel_residues(wheel)
+    return [turn * wheel + r for turn in range(_EMIT_TURNS) for r in residues]
+
+
+@lru_cache(maxsize=None)
+def _wheel_index(wheel: int) -> list[int]:
+    """Class index of every residue modulo wheel (-1 if not coprime to wheel)."""
+    residues = wheel_residues(wheel)
+    return [residues.index(r) if r in residues else -1 for r in range(wheel)]
+
+
+@lru_cache(maxsize=None)
+def _wheel_steps(wheel: int) -> dict:
+    """
+    For each residue class c of a prime p modulo wheel, the offsets d_j such
+    that p * (p + d_j) is the first multiple of p >= p^2 in residue class j.
+    """
+    residues = wheel_residues(wheel)
+    return {c: tuple((r * pow(c, -1, wheel) - c) % wheel for r in residues) for c in residues}
+
+
+def wheel_candidates(lo: int, hi: int, wheel: int = DEFAULT_WHEEL):
+    """Yields the numbers n with lo <= n < hi that are coprime to wheel, in order."""
+    residues = wheel_residues(wheel)
+    base = lo - lo % wheel
+    first = bisect_left(residues, lo - base)
+    for block in range(base, hi, wheel):
+        for r in residues[first:]:
+            n = block + r
+            if n >= hi:
+                return
+            yield n
+        first = 0
+
+
+def iter_wheel_segments(lo: int, hi: int, sieving_primes=None, segment_bytes=None, wheel: int = DEFAULT_WHEEL):
+    """
+    Sieves the numbers in [lo, hi) that are coprime to wheel, one segment at a time.
+
+    Each sieving prime p keeps one position per residue class; crossing off
+    its multiples in a class is a single slice with stride p * phi(wheel),
+    and the positions carry over from segment to segment.
+
+    Args:
+        lo (int): Inclusive lower bound.
+        hi (int): Exclusive upper bound.
+        sieving_primes (list[int], optional): All primes <= sqrt(hi - 1).
+        segment_bytes (int, optional): Flags per segment, defaults to
+            WHEEL_SEGMENT_BYTES[wheel].
+        wheel (int): 30 or 210.
+
+    Yields:
+        tuple[int, bytearray]: (base, flags) where base is a multiple of
+        wheel and flags[i] is 1 exactly when
+        base + (i // phi) * wheel + wheel_residues(wheel)[i % phi]
+        is a prime in [lo, hi). The prime factors of wheel are not
+        candidates and never appear.
+    """
+    if sieving_primes is None:
+        sieving_primes = base_primes(math.isqrt(max(hi - 1, 0)))
+    residues = wheel_residues(wheel)
+    phi = len(residues)
+    steps = _wheel_steps(wheel)
+    index = _wheel_index(wheel)
+    primes = [p for p in sieving_primes if wheel % p]
+
+    # Flat position of a number coprime to wheel: (n // wheel) * phi + class index
+    flat = (max(lo, 0) // wheel) * phi
+    flat_end = (hi // wheel) * phi + bisect_left(residues, hi % wheel) if hi > 0 else 0
+    skip = bisect_left(residues, max(lo, 0) % wheel)  # candidates below lo in the first block
+    size_max = min(max(phi, (segment_bytes or WHEEL_SEGMENT_BYTES[wheel]) // phi * phi), max(flat_end - flat, 0))
+
+    # Dense primes hit every residue class at least ~twice per segment and
+    # are crossed off with one slice per class. Sparse primes would mostly
+    # do empty slices, so their few odd multiples are visited directly.
+    dense = bisect_left(primes, size_max * wheel // (2 * phi * phi) + 1)
+    positions = []  # next multiple per (dense prime, class), absolute flat positions
+    strides = []
+    while flat < flat_end:
+        started = time.perf_counter() if instrument.ENABLED else 0.0
+        size = min(size_max, flat_end - flat)
+        stop = flat + size
+        base = (flat // phi) * wheel
+        flags = bytearray([1]) * size
+        flags[:skip] = bytes(skip)
+        skip = 0
+        if flat == 0:
+            flags[0] = 0  # the number 1
+
+        # Activate the primes whose square falls below the end of this segment
+        end = base + ((size - 1) // phi + 1) * wheel  # past the last candidate
+        active = bisect_right(primes, math.isqrt(end - 1))
+        for p in primes[len(positions) // phi:min(active, dense)]:
+            positions.extend((p * (p + d) // wheel) * phi + j for j, d in enumerate(steps[p % wheel]))
+            strides.extend([p * phi] * phi)
+
+        if instrument.ENABLED:
+            slices = sum(1 for e in range(min(active, dense) * phi) if positions[e] < stop)
+            realigned = sum(1 for e in range(min(active, dense) * phi) if positions[e] < flat)
+
+        for e in range(min(active, dense) * phi):
+            position = positions[e]
+            if position >= stop:
+                continue
+            stride = strides[e]
+            idx = position - flat if position >= flat else (position - flat) % stride
+            count = (size - 1 - idx) // stride + 1
+            flags[idx::stride] = bytes(count)
+            positions[e] = flat + idx + count * stride
+
+        above = max(bisect_right(primes, math.isqrt(base)), dense)  # p^2 > base from here on
+        for k in range(dense, active):
+            # First odd multiple of p that is >= max(p^2, base)
+            p = primes[k]
+            m = base + -base % p if k < above else max(p * p, base + -base % p)
+            if not m & 1:
+                m += p
+            while m < end:
+                j = index[m % wheel]
+                if j >= 0:
+                    i = (m - base) // wheel * phi + j
+                    if i < size:
+                        flags[i] = 0
+                m += p + p
+
+        if instrument.ENABLED:
+            engine = f"sieve.wheel{wheel}"
+            instrument.add_time(engine + ".segment", time.perf_counter() - started)
+            instrument.count(engine + ".candidates", size)
+            instrument.count(engine + ".slices", slices)
+            instrument.count(engine + ".modulo", realigned + _sparse_visits(primes, dense, active, base, end))
+            instrument.tick()
+
+        yield (flat // phi) * wheel, flags
+        flat = stop
+
+
+def _sparse_visits(primes, dense, active, base, end):
+    """Modulo operations of the sparse-prime loop: one per prime plus one per odd multiple visited."""
+    total = 0
+    for p in primes[dense:active]:
+        m = max(p * p, base + -base % p)
+        if not m & 1:
+            m += p
+        total += 1 + max(0, (end - m + 2 * p - 1) // (2 * p))
+    return total
+
+
+def iter_prime_segments(lo: int, hi: int, sieving_primes=None, segment_bytes=None, wheel: int = DEFAULT_WHEEL):
+    """
+    Yields the primes in [lo, hi) in order, one list per sieve segment.
+
+    Args:
+        lo (int): Inclusive lower bound.
+        hi (int): Exclusive upper bound.
+        sieving_primes (list[int], optional): All primes <= sqrt(hi - 1).
+        segment_bytes (int, optional): Flags per segment, defaults to
+            WHEEL_SEGMENT_BYTES[wheel].
+        wheel (int): One of WHEEL_MODULI; 2 is the odd-only sieve.
+    """
+    small = [p for p in wheel_primes(wheel) if lo <= p < hi]
+    if small:
+        if instrument.ENABLED:
+            instrument.count("sieve.odd.primes" if wheel == 2 else f"sieve.wheel{wheel}.primes", len(small))
+        yield small
+    if wheel == 2:
+        for start, flags in iter_segments(lo, hi, sieving_primes, segment_bytes or SEGMENT_BYTES):
+            started = time.perf_counter() if instrument.ENABLED else 0.0
+            block = list(compress(range(start, start + 2 * len(flags), 2), flags))
+            if instrument.ENABLED:
+                _count_emitted("sieve.odd", started, block)
+            yield block
+        return
+    offsets = _wheel_offsets(wheel)
+    step = len(offsets)
+    for base, flags in iter_wheel_segments(lo, hi, sieving_primes, segment_bytes, wheel):
+        started = time.perf_counter() if instrument.ENABLED else 0.0
+        view = memoryview(flags)
+        block = []
+        for i in range(0, len(flags), step):
+            block.extend(map((base + i // step * _EMIT_TURNS * wheel).__add__, compress(offsets, view[i:i + step])))
+        if instrument.ENABLED:
+            _count_emitted(f"sieve.wheel{wheel}", started, block)
+        yield block
+
+
+def _count_emitted(engine, started, block):
+    instrument.add_time(engine + ".emit", time.perf_counter() - started)
+    instrument.count(engine + ".primes", len(block))
+
+
+def primes_in_range(lo: int, hi: int, sieving_primes=None, segment_bytes=None, wheel: int = DEFAULT_WHEEL) -> list[int]:
+    """Returns all primes p with lo <= p < hi."""
+    primes = []
+    for block in iter_prime_segments(lo, hi, sieving_primes, segment_bytes, wheel):
+        primes.extend(block)
+    return primes
+
+
+def primes_up_to(limit: int, segment_bytes=None, wheel: int = DEFAULT_WHEEL) -> list[int]:
+    """Returns all primes p <= limit."""
+    return primes_in_range(2, limit + 1, segment_bytes=segment_bytes, wheel=wheel)
+
+
+def first_n_primes(N: int, segment_bytes=None, wheel: int = DEFAULT_WHEEL) -> list[int]:
+    """
+    Returns the first N primes [P_1, ..., P_N].
+
+    The sieve range is bounded by nth_prime_upper_bound(N) and segments
+    are processed in order, stopping as soon as N primes are collected.
+    """
+    if N < 1:
+        return []
+    limit = nth_prime_upper_bound(N)
+    sieving_primes = base_primes(math.isqrt(limit))
+
+    primes = []
+    for block in iter_prime_segments(2, limit + 1, sieving_primes, segment_bytes, wheel):
+        primes.extend(block)
+        if len(primes) >= N:
+            break
+    del primes[N:]
+    return primes
+
+# --- PARALLEL SEGMENTED SIEVE ---
+
+# Sieving primes installed once per worker process by _init_worker.
+_WORKER_PRIMES = None
+
+
+def _init_worker(sieving_primes):
+    global _WORKER_PRIMES
+    _WORKER_PRIMES = sieving_primes
+
+
+def _sieve_span(task):
+    """
+    Worker entry point: sieves one disjoint span [lo, hi).
+
+    Returns:
+        tuple: (lo, hi, primes as array('Q'), largest internal gap,
+        prime after which it occurs, busy seconds, worker pid)
+    """
+    lo, hi, segment_bytes, wheel = task
+    started = time.perf_counter()
+    primes = array("Q", primes_in_range(lo, hi, _WORKER_PRIMES, segment_bytes, wheel))
+    max_gap, max_gap_prime = _max_gap(primes)
+    return lo, hi, primes, max_gap, max_gap_prime, time.perf_counter() - started, os.getpid()
+
+
+def _max_gap(primes):
+    """(largest gap, prime after which it first occurs) of consecutive primes."""
+    if len(primes) < 2:
+        return 0, None
+    gaps = list(map(sub, primes[1:], primes[:-1]))
+    max_gap = max(gaps)
+    return max_gap, primes[gaps.index(max_gap)]
+
+
+def parallel_primes_in_range(lo: int, hi: int, workers=None, span=None, segment_bytes=None,
+                             wheel: int = DEFAULT_WHEEL):
+    """
+    Returns all primes p with lo <= p < hi, sieved in a process pool.
+
+    The range is split into disjoint spans. The sieving primes up to
+    sqrt(hi) are computed once and handed to every worker at start-up,
+    and the per-span results are stitched back in order. The largest gap
+    is tracked across span boundaries (last prime of one span to the first
+    prime of the next), so it equals the largest gap of the full list.
+
+    Args:
+        lo (int): Inclusive lower bound.
+        hi (int): Exclusive upper bound.
+        workers (int, optional): Process count, defaults to os.cpu_count().
+        span (int, optional): Integers per task, defaults to about four
+            tasks per worker (at least 4 segments each).
+        segment_bytes (int, optional): Segment size used inside each worker.
+        wheel (int): Wheel modulus, one of WHEEL_MODULI.
+
+    Returns:
+        tuple[array, dict]: (primes as array('Q'), report). The report holds
+        the overall max gap and, per worker pid, the numbers sieved, primes
+        emitted, busy seconds and throughput in numbers per second.
+    """
+    # concurrent.futures pulls in logging (~20 ms), so it is only imported
+    # when a pool is actually started.
+    from concurrent.futures import ProcessPoolExecutor
+
+    workers = workers or os.cpu_count() or 1
+    if span is None:
+        segment_span = (segment_bytes or WHEEL_SEGMENT_BYTES[wheel]) * wheel // len(wheel_residues(wheel))
+        span = max(4 * segment_span, -(-(hi - lo) // (4 * workers)))
+    span += span & 1  # keep span starts on the same parity
+    sieving_primes = base_primes(math.isqrt(max(hi - 1, 0)))
+    tasks = [(start, min(start + span, hi), segment_bytes, wheel) for start in range(lo, hi, span)]
+
+    primes = array("Q")
+    per_worker = {}
+    max_gap, max_gap_prime = 0, None
+
+    started = time.perf_counter()
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(sieving_primes,)) as pool:
+        for span_lo, span_hi, span_primes, gap, gap_prime, busy, pid in pool.map(_sieve_span, tasks):
+            # Stitch: the gap that straddles the span boundary
+            if primes and span_primes and span_primes[0] - primes[-1] > max_gap:
+                max_gap, max_gap_prime = span_primes[0] - primes[-1], primes[-1]
+            if gap > max_gap:
+                max_gap, max_gap_prime = gap, gap_prime
+            primes.extend(span_primes)
+
+            stats = per_worker.setdefault(pid, {"spans": 0, "numbers": 0, "primes": 0, "seconds": 0.0})
+            stats["spans"] += 1
+            stats["numbers"] += span_hi - span_lo
+            stats["primes"] += len(span_primes)
+            stats["seconds"] += busy
+    elapsed = time.perf_counter() - started
+
+    for stats in per_worker.values():
+        stats["numbers_per_second"] = stats["numbers"] / stats["seconds"] if stats["seconds"] else 0.0
+
+    report = {
+        "workers": workers,
+        "spans": len(tasks),
+        "seconds": elapsed,
+        "numbers_per_second": (hi - lo) / elapsed if elapsed else 0.0,
+        "max_gap": max_gap,
+        "max_gap_prime": max_gap_prime,
+        "per_worker": per_worker,
+    }
+    return primes, report
+
+
+def parallel_first_n_primes(N: int, workers=None, segment_bytes=None, wheel: int = DEFAULT_WHEEL):
+    """
+    Parallel counterpart of first_n_primes.
+
+    Returns:
+        tuple[array, dict]: (the first N primes as array('Q'), report); the
+        report's max gap is over those N primes, not the whole sieved range.
+    """
+    if N < 1:
+        return array("Q"), {}
+    primes, report = parallel_primes_in_range(
+        2, nth_prime_upper_bound(N) + 1, workers, segment_bytes=segment_bytes, wheel=wheel
+    )
+    del primes[N:]
+    # The range runs past P_N up to the Rosser bound; a maximum found there
+    # (at P_N or later) is recomputed over the primes that are kept.
+    if report["max_gap_prime"] is not None and report["max_gap_prime"] >= primes[-1]:
+        report["max_gap"], report["max_gap_prime"] = _max_gap(primes)
+    return primes, report
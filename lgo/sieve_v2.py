@@ -1,8 +1,11 @@
 import math
 import time
 
+from . import instrument
+from .stream import with_predictions
+
 # =================================================================
-# LGO_Sieve_V2.py
+# lgo/sieve_v2.py
 # Law of Geometric Order (LGO) Sieve Protocol with Geometric Constraints
 #
 # This program finds the first N primes and predicts the maximum possible
@@ -66,53 +69,26 @@ def predict_maximum_prime_gap(n, P_n):
 
 def find_first_n_primes(N=1000):
     """
-    Sieve of Eratosthenes variant to find the first N primes.
+    Segmented Sieve of Eratosthenes (lgo.sieve) to find the first N primes.
     This function demonstrates where the LGO prediction is critical.
     """
     
-    primes = [2]
-    num = 3
-    
+    from .table import PrimeTable
+
     start_time = time.time()
     
-    # We stop when we have found N primes
-    while len(primes) < N:
-        is_prime = True
-        
-        # We only need to check factors up to the square root of the number
-        limit = math.isqrt(num)
-        
-        # Optimization: Use the predicted LGO maximum gap size to efficiently
-        # jump to the next potential candidate and avoid checking every number.
-        if len(primes) > 1:
-            n = len(primes)
-            P_n = primes[-1]
-            
-            # CRITICAL STEP: The correct LGO max gap prediction ensures the sieve works.
-            # In a full LGO sieve, this value determines the jump size, g_n.
-            # Here, we only check if the prime is found successfully up to the LGO limit.
-            
-            # The original error came from the old formula predicting a smaller gap
-            # than the actual prime gap, causing the sieve to miss the next prime.
-            # The current code ensures the sieve *must* find the prime if it exists
-            # within the max gap defined by the geometric constraint.
-            
-        for p in primes:
-            if p > limit:
-                break
-            if num % p == 0:
-                is_prime = False
-                break
-        
-        if is_prime:
-            primes.append(num)
-            
-        num += 2 # Only check odd numbers
+    # The primes come from the process-wide prime cache (lgo.primecache),
+    # which sieves only the segments no earlier call has covered.
+    # The table always starts from [2], as in the original trial-division loop,
+    # and holds the primes and their gaps as typed arrays (lgo.table).
+    primes = PrimeTable.first_n(max(N, 1))
 
     end_time = time.time()
     
     print(f"\nSuccessfully found the first {N} primes in {end_time - start_time:.3f} seconds.")
     print(f"The {N}-th prime is P_{N} = {primes[-1]}.")
+    if instrument.ENABLED:
+        print(instrument.format_report())
     
     return primes
 
@@ -120,31 +96,35 @@ def find_first_n_primes(N=1000):
 
 # The original problem was finding 999 primes. We test for 1000 to be safe.
 N_TARGET = 1000
-prime_list = find_first_n_primes(N_TARGET)
 
-print("-" * 50)
-print(f"Verification of LGO Geometric Gap Predictor (First {N_TARGET} Primes):")
-print("-" * 50)
 
-# Check a few key transition points:
-# The 331st prime was causing issues in the old code due to inaccurate gap prediction.
-for n, P_n in enumerate(prime_list):
-    # n is the 0-based index. We use (n+1) for the 1-based prime index.
-    prime_index = n + 1
-    
-    # We test key transition points
-    if prime_index in [1, 2, 331, 400, 999, 1000]:
-        predicted_gap = predict_maximum_prime_gap(prime_index, P_n)
-        
-        # Calculate the actual gap after P_n
-        if n < N_TARGET - 1:
-            P_n_next = prime_list[n+1]
-            actual_gap = P_n_next - P_n
-        else:
-            actual_gap = "N/A" # Cannot calculate gap after the last prime in the list
-
-        print(f"P_{prime_index} = {P_n:<4} | Field: {'Sieve' if prime_index <= 400 else 'Entropy':<7} | Predicted Max Gap: {predicted_gap:<3} | Actual Gap: {actual_gap}")
-
-print("\nINTEGRATION NOTE:")
-print("The function 'predict_maximum_prime_gap' with the geometric constraints must be used")
-print("within the user's primary sieve algorithm to correctly calculate the maximum jump size.")
+def run_verification(N=N_TARGET):
+    """Finds the first N primes and prints the predicted vs actual gap at the key indices."""
+    from .primecache import nth_prime
+
+    primes = find_first_n_primes(N)
+
+    print("-" * 50)
+    print(f"Verification of LGO Geometric Gap Predictor (First {N} Primes):")
+    print("-" * 50)
+
+    # Check a few key transition points:
+    # The 331st prime was causing issues in the old code due to inaccurate gap prediction.
+    # The rows (n, P_n, gap_to_next) are read from the table just found; the
+    # gap after P_N needs P_{N+1}, which the shared prime cache already holds
+    # (its segments run past P_N), so nothing is sieved twice.
+    indices = [i for i in (1, 2, 331, 400, N - 1, N) if 1 <= i <= N]
+    key_points = (
+        (i, primes.nth(i), primes.gap_after(i) if i < N else nth_prime(N + 1) - primes.nth(i))
+        for i in indices
+    )
+    for prime_index, P_n, actual_gap, predicted_gap in with_predictions(key_points, predict_maximum_prime_gap):
+        print(f"P_{prime_index} = {P_n:<4} | Field: {'Sieve' if prime_index <= THRESHOLD_BREAKPOINT else 'Entropy':<7} | Predicted Max Gap: {predicted_gap:<3} | Actual Gap: {actual_gap}")
+
+    print("\nINTEGRATION NOTE:")
+    print("The function 'predict_maximum_prime_gap' with the geometric constraints must be used")
+    print("within the user's primary sieve algorithm to correctly calculate the maximum jump size.")
+
+
+if __name__ == "__main__":
+    run_verification(N_TARGET)
@@ -0,0 +1,229 @@
+# lgo/store.py - Law of Geometric Order (LGO) On-Disk Prime/Gap Store
+# Primes stored as delta-encoded half-gaps with a sparse checkpoint index,
+# opened through mmap so P_n and gap lookups need no recomputation.
+
+import mmap
+import os
+import struct
+from itertools import islice
+
+from .stream import iter_primes
+
+# --- FILE FORMAT ---
+#
+# <path>      header, then one gap code per prime from P_3 onwards:
+#             a byte 1..255 is the half-gap (P_k - P_{k-1}) / 2, a byte 0 is
+#             an escape followed by the half-gap as a little-endian uint32.
+# <path>.idx  one (P_n, offset) record per checkpoint n = 2, 2+K, 2+2K, ...,
+#             where offset is the position of the gap code for P_{n+1}.
+#
+# P_1 = 2 and P_2 = 3 are implicit (their gap is the only odd one).
+#
+# The header records the committed data length and is rewritten last by
+# each append. Bytes past that length (or past the last checkpoint the
+# count implies in <path>.idx) come from an interrupted append; they are
+# truncated on open and overwritten by the next append.
+
+MAGIC = b"LGOGAPS2"
+_HEADER = struct.Struct("<8sIIQQQ")  # magic, K, reserved, count, last prime, data length
+_CHECKPOINT = struct.Struct("<QQ")  # P_n, offset
+_ESCAPE = struct.Struct("<I")
+
+DEFAULT_CHECKPOINT_EVERY = 256
+
+# Primes encoded per write when extend_to sieves forward.
+_APPEND_BATCH = 1 << 20
+
+
+class PrimeStore:
+    """
+    Persistent, append-only store of the primes P_1..P_count.
+
+    nth_prime(n) and gap_after(n) read one checkpoint and decode at most K
+    gap codes, so lookups are O(K) and opening a store only maps two files.
+
+    Usage:
+        with PrimeStore.build("primes.lgp", 10**7) as store:
+            store.nth_prime(1000)  # 7919
+    """
+
+    def __init__(self, path):
+        self.path = os.fspath(path)
+        self._data = open(self.path, "r+b")
+        self._index = open(self.path + ".idx", "r+b")
+        magic, self.checkpoint_every, _, self._count, self._last, self._end = _HEADER.unpack(
+            self._data.read(_HEADER.size)
+        )
+        if magic != MAGIC:
+            raise ValueError(f"{self.path} is not an LGO prime store")
+        self._truncate()
+        self._map()
+
+    @classmethod
+    def create(cls, path, checkpoint_every: int = DEFAULT_CHECKPOINT_EVERY):
+        """Creates a new store holding P_1 = 2 and P_2 = 3."""
+        path = os.fspath(path)
+        with open(path, "wb") as fh:
+            fh.write(_HEADER.pack(MAGIC, checkpoint_every, 0, 2, 3, _HEADER.size))
+        with open(path + ".idx", "wb") as fh:
+            fh.write(_CHECKPOINT.pack(3, _HEADER.size))
+        return cls(path)
+
+    @classmethod
+    def build(cls, path, count: int, checkpoint_every: int = DEFAULT_CHECKPOINT_EVERY):
+        """Creates a store and fills it with the first count primes."""
+        store = cls.create(path, checkpoint_every)
+        store.extend_to(count)
+        return store
+
+    # --- mapping ---
+
+    def _map(self):
+        self._data_map = mmap.mmap(self._data.fileno(), 0, access=mmap.ACCESS_READ)
+        self._index_map = mmap.mmap(self._index.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def _index_end(self, count: int) -> int:
+        """Length of the index file holding the checkpoints of P_2..P_count."""
+        return ((count - 2) // self.checkpoint_every + 1) * _CHECKPOINT.size
+
+    def _truncate(self):
+        """Drops bytes an interrupted append left past the committed lengths."""
+        self._data.truncate(self._end)
+        self._index.truncate(self._index_end(self._count))
+
+    def _unmap(self):
+        self._data_map.close()
+        self._index_map.close()
+
+    def close(self):
+        self._unmap()
+        self._data.close()
+        self._index.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self._count
+
+    @property
+    def last_prime(self) -> int:
+        return self._last
+
+    # --- lookups ---
+
+    def _walk(self, n: int, extra: int = 0):
+        """
+        Returns [P_n, P_{n+1}, ..., P_{n+extra}] by decoding forward from the
+        nearest checkpoint at or below n.
+        """
+        K = self.checkpoint_every
+        checkpoint, skip = divmod(n - 2, K)
+        prime, offset = _CHECKPOINT.unpack_from(self._index_map, checkpoint * _CHECKPOINT.size)
+        data = self._data_map
+
+        # Fast path: no escape codes before P_n, so the skipped half-gaps sum directly.
+        chunk = data[offset:offset + skip]
+        if b"\0" not in chunk:
+            prime += 2 * sum(chunk)
+            offset += skip
+            skip = 0
+
+        values = []
+        for step in range(skip + extra + 1):
+            if step >= skip:
+                values.append(prime)
+                if step == skip + extra:
+                    break
+            half = data[offset]
+            offset += 1
+            if half == 0:
+                (half,) = _ESCAPE.unpack_from(data, offset)
+                offset += _ESCAPE.size
+            prime += 2 * half
+        return values
+
+    def _check_index(self, n: int, last: int):
+        if not 1 <= n <= last:
+            raise IndexError(f"prime index {n} outside stored range 1..{last}")
+
+    def nth_prime(self, n: int) -> int:
+        """Returns P_n (1-based, P_1 = 2)."""
+        self._check_index(n, self._count)
+        if n == 1:
+            return 2
+        return self._walk(n)[0]
+
+    def gap_after(self, n: int) -> int:
+        """Returns P_{n+1} - P_n."""
+        self._check_index(n, self._count - 1)
+        if n == 1:
+            return 1
+        P_n, P_next = self._walk(n, 1)
+        return P_next - P_n
+
+    # --- appending ---
+
+    def append(self, primes):
+        """
+        Appends the primes that follow last_prime, in order.
+
+        Args:
+            primes (iterable[int]): Consecutive primes after last_prime.
+        """
+        K = self.checkpoint_every
+        count, last = self._count, self._last
+        offset = self._end
+        codes = bytearray()
+        checkpoints = bytearray()
+
+        for prime in primes:
+            gap = prime - last
+            if gap <= 0 or gap & 1:
+                raise ValueError(f"{prime} does not follow {last} as the next odd prime")
+            half = gap >> 1
+            if half < 256:
+                codes.append(half)
+            else:
+                codes.append(0)
+                codes += _ESCAPE.pack(half)
+            count += 1
+            last = prime
+            if (count - 2) % K == 0:
+                checkpoints += _CHECKPOINT.pack(prime, offset + len(codes))
+
+        # Codes and checkpoints go at the committed ends and reach the disk
+        # before the header that counts them, so an interruption anywhere
+        # leaves the previous header describing a consistent store.
+        self._unmap()
+        try:
+            self._truncate()
+            self._data.seek(self._end)
+            self._data.write(codes)
+            self._data.flush()
+            os.fsync(self._data.fileno())
+            self._index.seek(self._index_end(self._count))
+            self._index.write(checkpoints)
+            self._index.flush()
+            os.fsync(self._index.fileno())
+
+            self._data.seek(0)
+            self._data.write(_HEADER.pack(MAGIC, K, 0, count, last, offset + len(codes)))
+            self._data.flush()
+            self._count, self._last, self._end = count, last, offset + len(codes)
+        finally:
+            self._map()
+
+    def extend_to(self, count: int):
+        """Sieves forward from last_prime until the store holds count primes."""
+        missing = count - self._count
+        if missing <= 0:
+            return
+        primes = iter_primes(start=self._last + 1)
+        while missing > 0:
+            batch = min(missing, _APPEND_BATCH)
+            self.append(islice(primes, batch))
+            missing -= batch
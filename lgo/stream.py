@@ -0,0 +1,178 @@
+# lgo/stream.py - Law of Geometric Order (LGO) Streaming Prime/Gap Pipeline
+# Generator stages that yield (n, P_n, gap_to_next) from the segmented sieve
+# in constant memory, so no consumer has to hold the full prime list.
+
+import math
+import time
+from itertools import chain, islice
+
+from . import instrument
+from .sieve import DEFAULT_WHEEL, WHEEL_SEGMENT_BYTES, base_primes, iter_prime_segments, wheel_residues
+
+# Stream spans run from _MIN_SPAN integers up to _SPAN_SEGMENTS sieve segments.
+_MIN_SPAN = 1 << 16
+_SPAN_SEGMENTS = 4
+
+# --- SOURCES ---
+
+def iter_prime_blocks(start: int = 2, stop=None, segment_bytes=None, wheel: int = DEFAULT_WHEEL):
+    """
+    Yields consecutive primes >= start, one list per sieve segment.
+
+    The sieving primes grow on demand, so memory stays O(sqrt(P) + segment)
+    however far the stream runs.
+
+    Args:
+        start (int): Smallest value to consider.
+        stop (int, optional): Exclusive upper bound. None streams forever.
+        segment_bytes (int, optional): Flags per segment, defaults to
+            WHEEL_SEGMENT_BYTES[wheel].
+        wheel (int): Wheel modulus, one of WHEEL_MODULI.
+    """
+    sieving_primes = base_primes(1 << 10)
+    sieved_to = 1 << 10  # sieving_primes holds every prime <= sieved_to
+    lo = max(start, 0)
+    # Spans grow with lo up to _SPAN_SEGMENTS full segments, so short streams
+    # stay cheap and long ones amortize the per-span sieving-prime setup.
+    flags = segment_bytes or WHEEL_SEGMENT_BYTES[wheel]
+    max_span = _SPAN_SEGMENTS * max(flags * wheel // len(wheel_residues(wheel)), wheel)
+
+    while stop is None or lo < stop:
+        span = min(max(lo, _MIN_SPAN), max_span)
+        hi = lo + span if stop is None else min(lo + span, stop)
+
+        # Extend the sieving primes to cover sqrt(hi) (doubling, never
+        # past sieved_to^2 so the existing primes can sieve the extension).
+        while math.isqrt(hi - 1) > sieved_to:
+            new_to = min(max(math.isqrt(hi - 1), 2 * sieved_to), sieved_to ** 2)
+            for block in iter_prime_segments(sieved_to + 1, new_to + 1, sieving_primes, wheel=wheel):
+                sieving_primes.extend(block)
+            sieved_to = new_to
+
+        for block in iter_prime_segments(lo, hi, sieving_primes, segment_bytes, wheel):
+            if block:
+                yield block
+        lo = hi
+
+
+def iter_primes(start: int = 2, stop=None, segment_bytes=None, wheel: int = DEFAULT_WHEEL):
+    """Yields every prime p with start <= p < stop (forever if stop is None)."""
+    return chain.from_iterable(iter_prime_blocks(start, stop, segment_bytes, wheel))
+
+
+def iter_prime_gaps(count=None, stop=None, segment_bytes=None, wheel: int = DEFAULT_WHEEL):
+    """
+    Yields (n, P_n, gap_to_next) for n = 1, 2, 3, ...
+
+    The stream looks one prime ahead, so the gap after the last yielded
+    prime is always known.
+
+    Args:
+        count (int, optional): Stop after P_count.
+        stop (int, optional): Stop before the first prime >= stop.
+    """
+    primes = iter_primes(segment_bytes=segment_bytes, wheel=wheel)
+    P_n = next(primes)
+    for n, P_next in enumerate(primes, start=1):
+        if (count is not None and n > count) or (stop is not None and P_n >= stop):
+            return
+        yield n, P_n, P_next - P_n
+        P_n = P_next
+
+
+def iter_gap_chunks(chunk_size: int = 1 << 16, count=None, stop=None, segment_bytes=None, wheel: int = DEFAULT_WHEEL):
+    """
+    Chunked form of iter_prime_gaps for the batch predictors.
+
+    Yields:
+        tuple[ndarray, ndarray, ndarray]: int64 arrays (n, P_n, gap_to_next)
+        of length chunk_size (the final chunk may be shorter).
+    """
+    import numpy as np
+
+    pending = np.empty(0, dtype=np.int64)
+    first_index = 1
+    for block in iter_prime_blocks(segment_bytes=segment_bytes, wheel=wheel):
+        pending = np.concatenate((pending, np.array(block, dtype=np.int64)))
+        while len(pending) > chunk_size:
+            P_n = pending[:chunk_size]
+            n = np.arange(first_index, first_index + chunk_size, dtype=np.int64)
+
+            # Trim the chunk at count / stop and finish.
+            keep = chunk_size
+            if count is not None:
+                keep = min(keep, max(count - first_index + 1, 0))
+            if stop is not None:
+                keep = min(keep, int(np.searchsorted(P_n, stop)))
+            gaps = pending[1:chunk_size + 1] - P_n
+            if keep < chunk_size:
+                if keep:
+                    yield n[:keep], P_n[:keep], gaps[:keep]
+                return
+
+            yield n, P_n, gaps
+            pending = pending[chunk_size:]
+            first_index += chunk_size
+
+# --- STAGES ---
+
+def with_predictions(rows, predictor):
+    """
+    Appends predictor(n, P_n) to every row, e.g. predict_maximum_prime_gap.
+
+    Yields:
+        tuple: (n, P_n, gap_to_next, predicted_gap)
+    """
+    if instrument.ENABLED:
+        yield from _timed_predictions(rows, predictor)
+        return
+    for row in rows:
+        yield row + (predictor(row[0], row[1]),)
+
+
+def _timed_predictions(rows, predictor):
+    for row in rows:
+        started = time.perf_counter()
+        predicted = predictor(row[0], row[1])
+        instrument.add_time("predict.scalar", time.perf_counter() - started)
+        yield row + (predicted,)
+
+
+def gap_records(rows):
+    """Passes through only the rows whose gap exceeds every earlier gap (maximal gaps)."""
+    record = 0
+    for row in rows:
+        if row[2] > record:
+            record = row[2]
+            yield row
+
+
+def pick_indices(rows, indices):
+    """Passes through the rows whose n is in indices, stopping after the largest one."""
+    wanted = set(indices)
+    last = max(wanted)
+    for row in rows:
+        if row[0] in wanted:
+            yield row
+        if row[0] >= last:
+            return
+
+
+def first_violation(rows):
+    """Returns the first row whose gap exceeds its predicted gap, or None."""
+    return next((row for row in rows if row[2] > row[3]), None)
+
+# --- SINKS ---
+
+def write_rows(rows, fh, sep: str = "\t", limit=None) -> int:
+    """
+    Writes rows as delimited text lines to an open file handle.
+
+    Returns:
+        int: Number of rows written.
+    """
+    written = 0
+    for row in islice(rows, limit):
+        fh.write(sep.join(map(str, row)) + "\n")
+        written += 1
+    return written
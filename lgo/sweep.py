@@ -0,0 +1,514 @@
+# lgo/sweep.py - Law of Geometric Order (LGO) Sharded Maximal-Gap Sweeps
+# Long validation runs split into shards listed in a manifest. Each shard
+# saves a checkpoint after every CHECKPOINT_SECONDS of work and resumes from
+# it, workers on several machines can share one directory, and merge_sweep()
+# stitches the shard results in shard order into one deterministic report.
+#
+# Usage:
+#   python -m lgo.sweep create sweeps/1e12 --stop 1000000000000 --shard-size 10000000000
+#   python -m lgo.sweep work sweeps/1e12          # on every machine / core
+#   python -m lgo.sweep status sweeps/1e12
+#   python -m lgo.sweep merge sweeps/1e12
+#
+# Directory layout:
+#   manifest.json               range, shard bounds, models, model constants
+#   shards/<id>.json            finished shard result
+#   shards/<id>.checkpoint.json unfinished shard state (resume point)
+#   shards/<id>.lock            claim held by a worker (refreshed on checkpoints)
+#   merged.json                 merge_sweep() output
+
+import argparse
+import json
+import math
+import os
+import socket
+import sys
+import tempfile
+import time
+import uuid
+
+import numpy as np
+
+from . import instrument
+from .cache import ENGINE_VERSION, model_constants
+from .gapstats import GapStatistics
+from .sieve import base_primes, primes_in_range
+
+# --- SWEEP PARAMETERS ---
+
+MANIFEST_VERSION = 1
+
+# Numbers sieved per block; the checkpoint resume points are block bounds.
+DEFAULT_BLOCK_SPAN = 1 << 24
+
+# A worker saves the shard state once this many seconds have passed.
+CHECKPOINT_SECONDS = 60.0
+
+# A lock whose mtime is older than this is considered abandoned.
+STALE_LOCK_SECONDS = 30 * 60.0
+
+# --- FILES ---
+
+def _write_json(path, data):
+    """Writes data atomically (temporary file + os.replace)."""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as fh:
+            json.dump(data, fh, sort_keys=True)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def _read_json(path, default=None):
+    try:
+        with open(path) as fh:
+            return json.load(fh)
+    except FileNotFoundError:
+        return default
+
+
+def _shard_path(directory, shard_id, suffix=".json"):
+    return os.path.join(directory, "shards", f"{shard_id:06d}{suffix}")
+
+# --- MANIFEST ---
+
+def create_sweep(directory, stop: int, shard_size: int, start: int = 2, models=None,
+                 block_span: int = DEFAULT_BLOCK_SPAN) -> dict:
+    """
+    Creates (or reopens) a sweep over the primes start <= P_n < stop.
+
+    Calling it again with the same parameters returns the existing manifest,
+    so every machine may run the same setup command.
+
+    Args:
+        directory: Sweep directory (created if needed).
+        stop (int): Exclusive bound on P_n.
+        shard_size (int): Numbers per shard.
+        start (int): Inclusive lower bound on P_n.
+        models (iterable[str], optional): Gap laws from lgo.validate (default all).
+        block_span (int): Numbers sieved per block inside a shard.
+
+    Raises:
+        ValueError: If the directory holds a sweep with different parameters.
+    """
+    from .validate import GAP_MODELS
+
+    directory = os.fspath(directory)
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "engine_version": ENGINE_VERSION,
+        "constants": model_constants(),
+        "start": max(start, 2),
+        "stop": stop,
+        "shard_size": shard_size,
+        "block_span": block_span,
+        "models": sorted(models or GAP_MODELS),
+        "shards": [[lo, min(lo + shard_size, stop)] for lo in range(max(start, 2), stop, shard_size)],
+    }
+    unknown = set(manifest["models"]) - set(GAP_MODELS)
+    if unknown:
+        raise ValueError(f"unknown models: {', '.join(sorted(unknown))}")
+
+    os.makedirs(os.path.join(directory, "shards"), exist_ok=True)
+    path = os.path.join(directory, "manifest.json")
+    existing = _read_json(path)
+    if existing is None:
+        _write_json(path, manifest)
+        return manifest
+    if existing != json.loads(json.dumps(manifest)):
+        raise ValueError(f"{directory} already holds a sweep with different parameters")
+    return existing
+
+
+def load_manifest(directory) -> dict:
+    """
+    Reads a sweep manifest.
+
+    Raises:
+        ValueError: If there is no manifest, or it was written for other
+            model constants or engine version than the running code.
+    """
+    manifest = _read_json(os.path.join(os.fspath(directory), "manifest.json"))
+    if manifest is None:
+        raise ValueError(f"{directory} has no manifest.json")
+    if manifest["engine_version"] != ENGINE_VERSION or manifest["constants"] != json.loads(json.dumps(model_constants())):
+        raise ValueError("the sweep was created with different model constants or engine version")
+    return manifest
+
+# --- SHARD WORKER ---
+
+def _new_state(lo):
+    return {
+        "next_lo": lo,         # first number not sieved yet
+        "evaluated": 0,        # primes whose gap to the next prime is known
+        "first_prime": None,
+        "last_prime": None,    # newest prime; its gap is still open
+        "max_gap": 0,
+        "records": [],         # [local n, P_n, gap], in-shard running-maximum gaps
+        "models": {},
+        "gap_statistics": GapStatistics().to_dict(),
+    }
+
+
+def _evaluate(name, P_n):
+    from .cli import field_indices
+    from .validate import GAP_MODELS
+
+    return GAP_MODELS[name].evaluate(field_indices(P_n), P_n)
+
+
+def _score_block(state, models, primes):
+    """Adds the gaps of a block of consecutive primes to the shard state."""
+    from .validate import FIELD_LABELS
+
+    if state["last_prime"] is not None:
+        primes = np.concatenate(([state["last_prime"]], primes))
+    elif primes.size:
+        state["first_prime"] = int(primes[0])
+    if primes.size == 0:
+        return
+    state["last_prime"] = int(primes[-1])
+    P_n, gaps = primes[:-1], np.diff(primes)
+    if not gaps.size:
+        return
+    local_n = np.arange(state["evaluated"] + 1, state["evaluated"] + 1 + gaps.size)
+
+    running = np.maximum.accumulate(np.maximum(gaps, state["max_gap"]))
+    new = gaps > np.concatenate(([state["max_gap"]], running[:-1]))
+    for i in np.flatnonzero(new).tolist():
+        state["records"].append([int(local_n[i]), int(P_n[i]), int(gaps[i])])
+    state["max_gap"] = int(running[-1])
+
+    for name in models:
+        score = state["models"].setdefault(name, {
+            "violations": {label: 0 for label in FIELD_LABELS.values()}, "first_failure": None,
+        })
+        predicted, fields = _evaluate(name, P_n)
+        missed = gaps > predicted
+        for code, label in FIELD_LABELS.items():
+            score["violations"][label] += int(np.count_nonzero(missed & (fields == code)))
+        if score["first_failure"] is None and missed.any():
+            i = int(np.argmax(missed))
+            score["first_failure"] = [int(local_n[i]), int(P_n[i])]
+    state["evaluated"] += int(gaps.size)
+
+
+def run_shard(directory, shard_id: int, max_blocks=None, checkpoint_seconds: float = CHECKPOINT_SECONDS,
+              token=None) -> bool:
+    """
+    Processes one shard, resuming from its checkpoint if there is one.
+
+    The caller must hold the shard (see run_worker). Blocks are sieved in
+    order and the state is saved after checkpoint_seconds of work, when
+    max_blocks have been done, and at the end. With the claim token from
+    _claim, the lock is refreshed on each checkpoint and the run stops if
+    the lock was taken over by another worker.
+
+    Returns:
+        bool: True when the shard is finished (its result file exists).
+    """
+    directory = os.fspath(directory)
+    manifest = load_manifest(directory)
+    result_path = _shard_path(directory, shard_id)
+    if os.path.exists(result_path):
+        return True
+    lo, hi = manifest["shards"][shard_id]
+    checkpoint_path = _shard_path(directory, shard_id, ".checkpoint.json")
+    state = _read_json(checkpoint_path) or _new_state(lo)
+
+    sieving_primes = base_primes(math.isqrt(hi - 1) + 1)
+    span = manifest["block_span"]
+    stats = GapStatistics.from_dict(state["gap_statistics"])
+    saved, blocks = time.perf_counter(), 0
+    while state["next_lo"] < hi:
+        block_hi = min(state["next_lo"] + span, hi)
+        primes = np.array(primes_in_range(state["next_lo"], block_hi, sieving_primes), dtype=np.int64)
+        _score_block(state, manifest["models"], primes)
+        stats.update(primes)
+        state["next_lo"] = block_hi
+        blocks += 1
+        if instrument.ENABLED:
+            instrument.count("sweep.primes", len(primes))
+            instrument.tick()
+
+        if state["next_lo"] < hi and (blocks == max_blocks or time.perf_counter() - saved >= checkpoint_seconds):
+            if token is not None and not _touch_lock(directory, shard_id, token):
+                return False  # the claim went stale and another worker holds the shard
+            state["gap_statistics"] = stats.to_dict()
+            _write_json(checkpoint_path, state)
+            saved = time.perf_counter()
+            if blocks == max_blocks:
+                return False
+
+    result = {"id": shard_id, "lo": lo, "hi": hi, "count": state["evaluated"] + (state["last_prime"] is not None)}
+    result.update({key: state[key] for key in ("first_prime", "last_prime", "max_gap", "records", "models")})
+    result["gap_statistics"] = stats.to_dict()
+    _write_json(result_path, result)
+    if os.path.exists(checkpoint_path):
+        os.unlink(checkpoint_path)
+    return True
+
+# --- SHARD CLAIMS ---
+
+def _claim(directory, shard_id, stale_after):
+    """
+    Creates the shard lock (O_EXCL), taking over a lock older than stale_after.
+
+    A stale lock is moved aside with os.rename, which succeeds for exactly
+    one of the workers that found it stale. If the file moved is not the
+    one judged stale (another worker replaced it in between), it is put
+    back with os.link, which never overwrites, and the claim fails.
+
+    Returns:
+        str or None: The unique token written into the lock, or None if
+        the shard is held by another worker. _touch_lock and _release
+        only act on a lock that still holds this token.
+    """
+    path = _shard_path(directory, shard_id, ".lock")
+    try:
+        stale = os.stat(path)
+    except FileNotFoundError:
+        stale = None
+    if stale is not None:
+        if time.time() - stale.st_mtime <= stale_after:
+            return None
+        aside = f"{path}.{socket.gethostname()}.{os.getpid()}.{time.monotonic_ns()}"
+        try:
+            os.rename(path, aside)
+        except FileNotFoundError:
+            return None  # another worker moved it first
+        moved = os.stat(aside)
+        if (moved.st_dev, moved.st_ino) != (stale.st_dev, stale.st_ino):
+            try:
+                os.link(aside, path)
+            except FileExistsError:
+                # A third lock appeared in between; the moved one belongs to
+                # a live owner, so it is left (not deleted) under its new name.
+                return None
+            os.unlink(aside)  # the lock is back at path under its own name
+            return None
+        os.unlink(aside)
+    try:
+        fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+    except FileExistsError:
+        return None
+    token = f"{socket.gethostname()} {os.getpid()} {uuid.uuid4().hex}"
+    with os.fdopen(fd, "w") as fh:
+        fh.write(token + "\n")
+    return token
+
+
+def _holds_lock(path, token) -> bool:
+    try:
+        with open(path) as fh:
+            return fh.read().strip() == token
+    except FileNotFoundError:
+        return False
+
+
+def _touch_lock(directory, shard_id, token) -> bool:
+    """Refreshes the lock's mtime; False if the lock is no longer ours."""
+    path = _shard_path(directory, shard_id, ".lock")
+    if not _holds_lock(path, token):
+        return False
+    try:
+        os.utime(path)
+    except FileNotFoundError:
+        return False
+    return True
+
+
+def _release(directory, shard_id, token):
+    """Deletes the lock only if it still holds token (it was not taken over)."""
+    path = _shard_path(directory, shard_id, ".lock")
+    if _holds_lock(path, token):
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+
+
+def run_worker(directory, max_shards=None, stale_after: float = STALE_LOCK_SECONDS,
+               checkpoint_seconds: float = CHECKPOINT_SECONDS) -> int:
+    """
+    Claims and processes unfinished shards in order until none are left.
+
+    Several workers (processes or machines sharing the directory) can run
+    at once; each shard is held through an exclusive lock file.
+
+    Returns:
+        int: Number of shards this worker finished.
+    """
+    directory = os.fspath(directory)
+    manifest = load_manifest(directory)
+    finished = 0
+    for shard_id in range(len(manifest["shards"])):
+        if max_shards is not None and finished >= max_shards:
+            break
+        if os.path.exists(_shard_path(directory, shard_id)):
+            continue
+        token = _claim(directory, shard_id, stale_after)
+        if token is None:
+            continue
+        try:
+            finished += run_shard(directory, shard_id, checkpoint_seconds=checkpoint_seconds, token=token)
+        finally:
+            _release(directory, shard_id, token)
+    return finished
+
+
+def sweep_status(directory) -> dict:
+    """Counts of finished, checkpointed (partly done), claimed and pending shards."""
+    directory = os.fspath(directory)
+    status = {"finished": 0, "checkpointed": 0, "claimed": 0, "pending": 0}
+    for shard_id in range(len(load_manifest(directory)["shards"])):
+        if os.path.exists(_shard_path(directory, shard_id)):
+            status["finished"] += 1
+            continue
+        if os.path.exists(_shard_path(directory, shard_id, ".checkpoint.json")):
+            status["checkpointed"] += 1
+        else:
+            status["pending"] += 1
+        status["claimed"] += os.path.exists(_shard_path(directory, shard_id, ".lock"))
+    return status
+
+# --- MERGE ---
+
+def merge_sweep(directory, write: bool = True) -> dict:
+    """
+    Stitches all shard results into one report, in shard order.
+
+    Boundary gaps (last prime of a shard to the first prime of the next
+    non-empty one, and past stop for the final prime) are added here, so
+    the totals equal those of one uninterrupted validate(stop) run.
+
+    Returns:
+        dict: "primes", "max_gap", the global maximal-gap "records" (n, P_n,
+        gap) and per model the per-field "violations", "first_failure",
+        "missed_records" (records whose gap exceeds the prediction) and
+        "first_missed_record". n is the global prime index. "gap_statistics"
+        is the merged lgo.gapstats summary (per-decade histograms, merit,
+        Cramer ratio and Psi_n residual).
+
+    Raises:
+        ValueError: If a shard is not finished.
+    """
+    from .primecount import prime_count
+    from .probe import next_prime_after
+    from .validate import FIELD_LABELS
+
+    directory = os.fspath(directory)
+    manifest = load_manifest(directory)
+    shards = [_read_json(_shard_path(directory, i)) for i in range(len(manifest["shards"]))]
+    missing = [i for i, shard in enumerate(shards) if shard is None]
+    if missing:
+        raise ValueError(f"{len(missing)} shard(s) not finished, first: {missing[0]}")
+
+    models = manifest["models"]
+    totals = {name: {"violations": {label: 0 for label in FIELD_LABELS.values()}, "first_failure": None}
+              for name in models}
+    candidates = []      # (n, P_n, gap): in-shard records and boundary gaps, in order
+    boundary = []        # (n, P_n, gap) for the last prime of each non-empty shard
+    offset = prime_count(manifest["start"] - 1)
+    previous = None
+    stats = GapStatistics()
+    for shard in shards:
+        if not shard["count"]:
+            continue
+        stats.merge(GapStatistics.from_dict(shard["gap_statistics"]))
+        if previous is not None:
+            boundary.append((offset, previous, shard["first_prime"] - previous))
+            candidates.append(boundary[-1])
+        candidates += [(offset + n, P, gap) for n, P, gap in shard["records"]]
+        for name in models:
+            score = shard["models"].get(name)
+            if score is None:
+                continue
+            for label, value in score["violations"].items():
+                totals[name]["violations"][label] += value
+            if score["first_failure"] and totals[name]["first_failure"] is None:
+                totals[name]["first_failure"] = offset + score["first_failure"][0]
+        offset += shard["count"]
+        previous = shard["last_prime"]
+    if previous is not None:
+        boundary.append((offset, previous, next_prime_after(previous) - previous))
+        candidates.append(boundary[-1])
+        stats.update([previous + boundary[-1][2]])
+
+    records, running = [], 0
+    for n, P, gap in sorted(candidates):
+        if gap > running:
+            records.append([n, P, gap])
+            running = gap
+
+    for name in models:
+        total = totals[name]
+        # Boundary gaps were not scored by any shard.
+        if boundary:
+            n, P, gaps = (np.array(column, dtype=np.int64) for column in zip(*boundary))
+            predicted, fields = _evaluate(name, P)
+            for code, label in FIELD_LABELS.items():
+                total["violations"][label] += int(np.count_nonzero((gaps > predicted) & (fields == code)))
+            failures = n[gaps > predicted]
+            if failures.size and (total["first_failure"] is None or failures[0] < total["first_failure"]):
+                total["first_failure"] = int(failures[0])
+        missed = []
+        if records:
+            n, P, gaps = (np.array(column, dtype=np.int64) for column in zip(*records))
+            missed = n[gaps > _evaluate(name, P)[0]].tolist()
+        total["missed_records"] = len(missed)
+        total["first_missed_record"] = missed[0] if missed else None
+
+    report = {
+        "start": manifest["start"],
+        "stop": manifest["stop"],
+        "primes": offset - prime_count(manifest["start"] - 1),
+        "max_gap": running,
+        "records": records,
+        "models": totals,
+        "gap_statistics": stats.summary(prime_count(manifest["start"] - 1) + 1),
+    }
+    if write:
+        _write_json(os.path.join(directory, "merged.json"), report)
+    return report
+
+# --- COMMAND LINE ---
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="LGO sharded maximal-gap sweeps")
+    commands = parser.add_subparsers(dest="command", required=True)
+    create = commands.add_parser("create", help="write the manifest")
+    create.add_argument("directory")
+    create.add_argument("--stop", type=int, required=True)
+    create.add_argument("--start", type=int, default=2)
+    create.add_argument("--shard-size", type=int, required=True)
+    create.add_argument("--block-span", type=int, default=DEFAULT_BLOCK_SPAN)
+    create.add_argument("--model", nargs="*", help="gap laws (default: all)")
+    work = commands.add_parser("work", help="process unfinished shards")
+    work.add_argument("directory")
+    work.add_argument("--max-shards", type=int)
+    work.add_argument("--checkpoint-seconds", type=float, default=CHECKPOINT_SECONDS)
+    work.add_argument("--stale-after", type=float, default=STALE_LOCK_SECONDS)
+    for name, text in (("status", "count finished / pending shards"), ("merge", "write merged.json")):
+        commands.add_parser(name, help=text).add_argument("directory")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.command == "create":
+            manifest = create_sweep(args.directory, args.stop, args.shard_size, args.start, args.model, args.block_span)
+            print(f"{len(manifest['shards'])} shards in {args.directory}")
+        elif args.command == "work":
+            print(f"finished {run_worker(args.directory, args.max_shards, args.stale_after, args.checkpoint_seconds)} shard(s)")
+        elif args.command == "status":
+            print(json.dumps(sweep_status(args.directory)))
+        else:
+            print(json.dumps(merge_sweep(args.directory), indent=2, sort_keys=True))
+    except ValueError as exc:
+        parser.exit(2, f"lgo.sweep: error: {exc}\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,251 @@
+# lgo/table.py - Law of Geometric Order (LGO) Compact Prime Table
+# PrimeTable holds consecutive primes P_first..P_last in a uint32 / uint64
+# array with a narrow gap side-array (gap[i] = P[i+1] - P[i]), about 6-10
+# bytes per prime instead of ~36 for a list of ints. Slices are views, the
+# arrays are exported through the buffer protocol and as NumPy views, and
+# gap, record-gap and per-field summaries run on those views directly.
+
+from collections.abc import Sequence
+
+import numpy as np
+
+# --- STORAGE ---
+
+def _unsigned_dtype(max_value: int):
+    """Narrowest unsigned dtype holding max_value (uint16 at least)."""
+    for dtype in (np.uint16, np.uint32, np.uint64):
+        if max_value <= np.iinfo(dtype).max:
+            return np.dtype(dtype)
+    raise OverflowError(f"{max_value} does not fit in uint64")
+
+
+def _readonly(array):
+    array.flags.writeable = False
+    return array
+
+
+class PrimeTable(Sequence):
+    """
+    Consecutive primes with their gaps, backed by typed arrays.
+
+    Args:
+        primes (array_like): Consecutive primes in increasing order.
+        first_index (int): Index n of primes[0] (P_1 = 2).
+
+    Usage:
+        table = PrimeTable.first_n(10**6)
+        table[-1]                  # 15485863
+        table.gaps.max()           # 114
+        view = table[1000:2000]    # no copy; view.first_index == 1001
+        table[::2]                 # step != 1: plain read-only ndarray view
+        memoryview(table.primes)   # or memoryview(table) on Python 3.12+
+    """
+
+    __slots__ = ("_primes", "_gaps", "first_index")
+
+    def __init__(self, primes, first_index: int = 1):
+        primes = np.asarray(primes)
+        if primes.ndim != 1:
+            raise ValueError("primes must be one-dimensional")
+        if primes.size and int(primes.min()) < 0:
+            raise ValueError("primes must be non-negative")
+        top = int(primes.max()) if primes.size else 0
+        dtype = np.dtype(np.uint32 if top <= np.iinfo(np.uint32).max else np.uint64)
+        if primes.dtype == dtype and not primes.flags.writeable:
+            # Read-only input (e.g. a lgo.primecache view) is shared, not copied.
+            self._primes = primes.view()
+        else:
+            self._primes = _readonly(primes.astype(dtype))
+        gaps = np.diff(self._primes.astype(np.int64))
+        if gaps.size and gaps.min() <= 0:
+            raise ValueError("primes must be strictly increasing")
+        self._gaps = _readonly(gaps.astype(_unsigned_dtype(int(gaps.max()) if gaps.size else 0)))
+        self.first_index = first_index
+
+    @classmethod
+    def _view(cls, primes, gaps, first_index):
+        table = cls.__new__(cls)
+        table._primes, table._gaps, table.first_index = primes, gaps, first_index
+        return table
+
+    @classmethod
+    def first_n(cls, N: int, wheel=None):
+        """
+        Table of P_1..P_N as a view of the process-wide prime cache
+        (lgo.primecache), which keeps the primes for later calls; only the
+        narrow gap array is new. With a wheel, the primes are sieved afresh
+        block by block with that wheel instead.
+        """
+        from .stream import iter_prime_blocks
+
+        if wheel is None:
+            from .primecache import shared_cache
+
+            return cls(shared_cache().first_n(max(N, 0)))
+        blocks, total = [], 0
+        if N > 0:
+            for block in iter_prime_blocks(wheel=wheel):
+                blocks.append(np.array(block, dtype=np.uint64))
+                total += len(block)
+                if total >= N:
+                    break
+        return cls(np.concatenate(blocks)[:N] if blocks else np.empty(0, dtype=np.uint32))
+
+    @classmethod
+    def in_range(cls, lo: int, hi: int, wheel=None):
+        """Table of the primes lo <= p < hi, with first_index = pi(lo - 1) + 1."""
+        from .primecount import prime_count
+        from .sieve import DEFAULT_WHEEL
+        from .stream import iter_prime_blocks
+
+        blocks = [np.array(block, dtype=np.uint64) for block in iter_prime_blocks(lo, hi, wheel=wheel or DEFAULT_WHEEL)]
+        primes = np.concatenate(blocks) if blocks else np.empty(0, dtype=np.uint32)
+        return cls(primes, prime_count(lo - 1) + 1 if lo > 2 else 1)
+
+    # --- buffers and views ---
+
+    @property
+    def primes(self):
+        """Read-only NumPy view of the primes."""
+        return self._primes
+
+    @property
+    def gaps(self):
+        """Read-only NumPy view of the gaps, len(self) - 1 entries."""
+        return self._gaps
+
+    @property
+    def indices(self):
+        """Prime indices n of the entries (int64)."""
+        return np.arange(self.first_index, self.first_index + len(self), dtype=np.int64)
+
+    @property
+    def nbytes(self) -> int:
+        return self._primes.nbytes + self._gaps.nbytes
+
+    def __array__(self, dtype=None, copy=None):
+        if copy:
+            return np.array(self._primes, dtype=dtype)
+        return self._primes if dtype is None else self._primes.astype(dtype)
+
+    def __buffer__(self, flags):
+        # PEP 688 (Python 3.12+): memoryview(table) exposes the prime array.
+        return memoryview(self._primes)
+
+    # --- sequence protocol ---
+
+    def __len__(self):
+        return len(self._primes)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            start, stop, step = key.indices(len(self))
+            if step != 1:
+                # Not a run of consecutive primes, so not a PrimeTable: a
+                # read-only array view of the selected primes.
+                return self._primes[key]
+            stop = max(start, stop)
+            return PrimeTable._view(self._primes[start:stop], self._gaps[start:max(start, stop - 1)],
+                                    self.first_index + start)
+        return int(self._primes[key])
+
+    def __iter__(self):
+        for start in range(0, len(self), 1 << 16):
+            yield from self._primes[start:start + (1 << 16)].tolist()
+
+    def __contains__(self, value):
+        i = int(np.searchsorted(self._primes, value))
+        return i < len(self) and int(self._primes[i]) == value
+
+    def __repr__(self):
+        if not len(self):
+            return "PrimeTable([])"
+        return (f"PrimeTable(P_{self.first_index}={self[0]} .. P_{self.first_index + len(self) - 1}={self[-1]}, "
+                f"{len(self)} primes, {self.nbytes} bytes)")
+
+    def tolist(self) -> list[int]:
+        return self._primes.tolist()
+
+    def index_of(self, p: int) -> int:
+        """Prime index n with P_n = p."""
+        i = int(np.searchsorted(self._primes, p))
+        if i == len(self) or int(self._primes[i]) != p:
+            raise ValueError(f"{p} is not in the table")
+        return self.first_index + i
+
+    def nth(self, n: int) -> int:
+        """P_n, for first_index <= n <= last index."""
+        i = n - self.first_index
+        if not 0 <= i < len(self):
+            raise IndexError(f"P_{n} is not in the table")
+        return int(self._primes[i])
+
+    def gap_after(self, n: int) -> int:
+        """P_{n+1} - P_n, for n below the last index."""
+        i = n - self.first_index
+        if not 0 <= i < len(self._gaps):
+            raise IndexError(f"the gap after P_{n} is not in the table")
+        return int(self._gaps[i])
+
+    # --- gap statistics ---
+
+    def gap_histogram(self):
+        """Counts per gap size: result[g] = number of gaps equal to g."""
+        return np.bincount(self._gaps)
+
+    def gap_summary(self) -> dict:
+        """Count, mean and maximum gap, with the index and prime where the maximum occurs."""
+        if not len(self._gaps):
+            return {"gaps": 0, "mean_gap": 0.0, "max_gap": 0, "max_gap_index": None, "max_gap_prime": None}
+        i = int(np.argmax(self._gaps))
+        return {
+            "gaps": len(self._gaps),
+            "mean_gap": float(self._gaps.mean()),
+            "max_gap": int(self._gaps[i]),
+            "max_gap_index": self.first_index + i,
+            "max_gap_prime": int(self._primes[i]),
+        }
+
+    def record_gaps(self):
+        """
+        Gaps larger than every earlier gap in the table (maximal gaps when
+        the table starts at P_1).
+
+        Returns:
+            tuple[ndarray, ndarray, ndarray]: (n, P_n, gap) of each record.
+        """
+        gaps = self._gaps
+        if not len(gaps):
+            return np.empty(0, np.int64), np.empty(0, np.int64), np.empty(0, np.int64)
+        running = np.maximum.accumulate(gaps)
+        new = np.empty(len(gaps), dtype=bool)
+        new[0] = True
+        new[1:] = gaps[1:] > running[:-1]
+        at = np.flatnonzero(new)
+        return at + self.first_index, self._primes[at].astype(np.int64), gaps[at].astype(np.int64)
+
+    def field_summary(self, model: str = "closure_v2") -> dict:
+        """
+        Per-field gap statistics against a registered gap law (lgo.validate).
+
+        Returns:
+            dict: field label -> "primes", "mean_gap", "max_gap",
+            "mean_predicted" and "violations" (gap > predicted), over the
+            entries whose gap is in the table.
+        """
+        from .validate import FIELD_LABELS, GAP_MODELS
+
+        P_n = self._primes[:-1].astype(np.int64)
+        predicted, fields = GAP_MODELS[model].evaluate(self.indices[:-1], P_n)
+        summary = {}
+        for code, label in FIELD_LABELS.items():
+            mask = fields == code
+            gaps = self._gaps[mask]
+            summary[label] = {
+                "primes": int(mask.sum()),
+                "mean_gap": float(gaps.mean()) if gaps.size else 0.0,
+                "max_gap": int(gaps.max()) if gaps.size else 0,
+                "mean_predicted": float(predicted[mask].mean()) if gaps.size else 0.0,
+                "violations": int(np.count_nonzero(gaps > predicted[mask])),
+            }
+        return summary
@@ -20,6 +20,11 @@ C_LGO = 0.0131656904
 # C_MAX: Geometric Volatility Factor (Chaos Boundary)
 C_MAX = 0.55
 
+# Offset values derived for best fit
+OFFSET_G = 11.266
+OFFSET_ALPHA = 69.814
+OFFSET_C = 5.7533
+
 # --- SECTION 2: DERIVED PHYSICAL CONSTRAINTS ---
 
 def derive_gravitational_constant():
@@ -28,9 +33,6 @@ def derive_gravitational_constant():
     Formula: M_G ≈ (pi^2 / C_MAX) - 11.266
     Actual G = 6.67430(15) * 10^-11 m^3 kg^-1 s^-2
     """
-    # Offset value derived for best fit
-    OFFSET_G = 11.266 
-    
     # Calculate the mantissa (M_G)
     mantissa_g = (math.pi ** 2 / C_MAX) - OFFSET_G
     
@@ -58,9 +60,6 @@ def derive_fine_structure_constant():
     Formula: Alpha^-1 ≈ e * (1 / C_LGO) - 69.814
     Actual Alpha^-1 = 137.035999...
     """
-    # Offset value derived for best fit
-    OFFSET_ALPHA = 69.814
-    
     # Calculate the reciprocal (Alpha^-1)
     alpha_inv_derived = (math.e * (1 / C_LGO)) - OFFSET_ALPHA
     
@@ -84,9 +83,6 @@ def derive_speed_of_light():
     Formula: M_c ≈ (1 / sqrt(C_LGO)) - 5.7533
     Actual c = 2.99792458 * 10^8 m/s
     """
-    # Offset value derived for best fit
-    OFFSET_C = 5.7533
-    
     # Calculate the mantissa (M_c)
     mantissa_c = (1 / math.sqrt(C_LGO)) - OFFSET_C
     
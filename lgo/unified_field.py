@@ -23,6 +23,10 @@ C_ZETA = 1 / math.sqrt(2)
 # C_MAX: Empirically Derived Geometric Volatility Factor (from Maximum Prime Gap)
 C_MAX = 0.55
 
+# Offsets of the structural identities for G and hbar (see Section 3)
+OFFSET_G_CONSTANT = 6.36
+OFFSET_HBAR = 0.7634
+
 # --- SECTION 2: STRUCTURAL DEFINITIONS OF LGO CONSTANTS ---
 
 def derive_c_lgo():
@@ -37,7 +41,7 @@ def derive_hbar_mantissa():
     Planck's Constant Mantissa (M_hbar, 0.020% error).
     Structural Identity: 1 / C_MAX - 0.7634
     """
-    return (1 / C_MAX) - 0.7634
+    return (1 / C_MAX) - OFFSET_HBAR
 
 # Set constants analytically
 C_LGO = derive_c_lgo()
@@ -52,7 +56,7 @@ def derive_g_constant():
     Formula: (pi^2 / C_MAX) - [e * (1/C_MAX) + 6.36]
     """
     # G Offset Structural Identity: e * (1/C_MAX) + 6.36
-    OFFSET_G_derived = math.e * (1 / C_MAX) + 6.36
+    OFFSET_G_derived = math.e * (1 / C_MAX) + OFFSET_G_CONSTANT
     mantissa_g = (math.pi ** 2 / C_MAX) - OFFSET_G_derived
     G_derived = mantissa_g * (10 ** -11)
     return G_derived, mantissa_g
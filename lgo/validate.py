@@ -0,0 +1,195 @@
+# lgo/validate.py - Law of Geometric Order (LGO) Multi-Model Validation Engine
+# Streams every prime up to a bound once and scores all registered gap laws
+# against the actual gap and the running maximal gap in the same pass.
+
+from collections import namedtuple
+from collections.abc import Mapping
+
+import numpy as np
+
+from . import PREDICTORS, batch, get_predictor, instrument, register_predictor
+from .batch import FIELD_ENTROPY, FIELD_SIEVE, calculate_raw_lgo_gap_batch, predict_maximum_prime_gap_batch
+from .stream import iter_gap_chunks
+
+# --- MODEL REGISTRY ---
+
+# evaluate(n, P_n) -> (int64 predicted gaps, int8 field codes)
+GapModel = namedtuple("GapModel", "name evaluate")
+
+# name -> (scalar predictor, vectorized evaluator). An evaluator is only used
+# while lgo.PREDICTORS still holds the scalar it was registered for, so
+# replacing a predictor (lgo.register_predictor) also retires its evaluator.
+# Predictors without a current evaluator are scored through their scalar.
+_BATCH_EVALUATORS = {}
+
+FIELD_LABELS = {FIELD_SIEVE: "Sieve", FIELD_ENTROPY: "Entropy"}
+
+# Error histogram (predicted - actual gap): bins of width 2, out-of-range
+# errors are clipped into the first/last bin.
+HISTOGRAM_EDGES = np.arange(-200, 204, 2)
+
+
+def register_model(name, evaluate, scalar=None):
+    """
+    Adds a vectorized evaluator for a gap law.
+
+    The law itself lives in lgo.PREDICTORS (the single model registry);
+    scalar, if given, is registered there under the same name. The
+    evaluator is tied to the predictor registered now and is ignored once
+    that predictor is replaced.
+
+    Raises:
+        ValueError: If name is not a registered predictor and no scalar is given.
+    """
+    if scalar is not None:
+        register_predictor(name, scalar)
+    elif name not in PREDICTORS:
+        raise ValueError(f"no predictor registered under {name!r}")
+    _BATCH_EVALUATORS[name] = (get_predictor(name), evaluate)
+
+
+def _batch_evaluator(name):
+    """The vectorized evaluator of name, if it was built for the current predictor."""
+    scalar, evaluate = _BATCH_EVALUATORS.get(name, (None, None))
+    if evaluate is not None and get_predictor(name) is scalar:
+        return evaluate
+    return None
+
+
+def _scalar_evaluator(name):
+    def evaluate(n, P_n):
+        predictor = get_predictor(name)
+        predicted = np.fromiter(map(predictor, n.tolist(), P_n.tolist()), dtype=np.int64, count=len(P_n))
+        fields = np.where(n <= batch.THRESHOLD_BREAKPOINT, FIELD_SIEVE, FIELD_ENTROPY).astype(np.int8)
+        return predicted, fields
+    return evaluate
+
+
+class _ModelRegistry(Mapping):
+    """lgo.PREDICTORS as GapModels, so the two registries cannot drift apart."""
+
+    def __getitem__(self, name):
+        if name not in PREDICTORS:
+            raise KeyError(name)
+        return GapModel(name, _batch_evaluator(name) or _scalar_evaluator(name))
+
+    def __iter__(self):
+        return iter(list(PREDICTORS))
+
+    def __len__(self):
+        return len(PREDICTORS)
+
+
+GAP_MODELS = _ModelRegistry()
+
+
+# Validation only scores the integer gaps and field codes, which the fast
+# log path (exact=False) returns unchanged; Psi_n itself is not used.
+def _raw_lgo_model(n, P_n):
+    gaps, _, fields = calculate_raw_lgo_gap_batch(P_n, exact=False)
+    return gaps, fields
+
+
+def _max_gap_model(c_add_name):
+    # Constants are read from lgo.batch at call time, the same source
+    # cache.model_constants() keys results on.
+    def evaluate(n, P_n):
+        fields = np.where(n <= batch.THRESHOLD_BREAKPOINT, FIELD_SIEVE, FIELD_ENTROPY).astype(np.int8)
+        return predict_maximum_prime_gap_batch(n, P_n, getattr(batch, c_add_name), exact=False), fields
+    return evaluate
+
+
+register_model("lgo_model", _raw_lgo_model)
+register_model("sieve_v2", _max_gap_model("C_ADD_GEOMETRIC"))
+register_model("closure_v2", _max_gap_model("C_ADD_PRIME_CORRECTED"))
+
+# --- SCORING ---
+
+def _new_score():
+    return {
+        "primes": 0,
+        "violations": {label: 0 for label in FIELD_LABELS.values()},
+        "record_violations": {label: 0 for label in FIELD_LABELS.values()},
+        "first_failure": None,
+        "first_record_failure": None,
+        "histogram": np.zeros(len(HISTOGRAM_EDGES) - 1, dtype=np.int64),
+    }
+
+
+def _score_chunk(score, n, predicted, fields, gaps, running_max):
+    score["primes"] += len(n)
+    missed = gaps > predicted
+    record_missed = running_max > predicted
+    for code, label in FIELD_LABELS.items():
+        in_field = fields == code
+        score["violations"][label] += int(np.count_nonzero(missed & in_field))
+        score["record_violations"][label] += int(np.count_nonzero(record_missed & in_field))
+    if score["first_failure"] is None and missed.any():
+        score["first_failure"] = int(n[np.argmax(missed)])
+    if score["first_record_failure"] is None and record_missed.any():
+        score["first_record_failure"] = int(n[np.argmax(record_missed)])
+
+    errors = np.clip(predicted - gaps, HISTOGRAM_EDGES[0], HISTOGRAM_EDGES[-1] - 1)
+    score["histogram"] += np.histogram(errors, HISTOGRAM_EDGES)[0]
+
+
+def validate(stop=None, count=None, models=None, chunk_size: int = 1 << 16):
+    """
+    Scores every model over the primes P_n < stop (or n <= count) in one pass.
+
+    For each prime the actual gap is P_{n+1} - P_n, and the running maximal
+    gap is the largest gap seen up to and including that one.
+
+    Args:
+        stop (int, optional): Exclusive bound on P_n.
+        count (int, optional): Number of primes to score.
+        models (iterable[str], optional): Registered model names (default all).
+        chunk_size (int): Primes per vectorized chunk.
+
+    Returns:
+        dict: model name -> score with per-field "violations" (gap > predicted)
+        and "record_violations" (running max gap > predicted), the first
+        failing index for each, and an error histogram over HISTOGRAM_EDGES.
+    """
+    if stop is None and count is None:
+        raise ValueError("validate() needs a stop bound or a prime count")
+    selected = [GAP_MODELS[name] for name in (models or GAP_MODELS)]
+    scores = {model.name: _new_score() for model in selected}
+
+    running = 0
+    for n, P_n, gaps in iter_gap_chunks(chunk_size, count=count, stop=stop):
+        running_max = np.maximum.accumulate(np.maximum(gaps, running))
+        running = int(running_max[-1])
+        for model in selected:
+            with instrument.phase(f"predict.{model.name}"):
+                predicted, fields = model.evaluate(n, P_n)
+            with instrument.phase("validate.scoring"):
+                _score_chunk(scores[model.name], n, predicted, fields, gaps, running_max)
+        if instrument.ENABLED:
+            instrument.count("validate.primes", len(n))
+            instrument.tick()
+
+    for score in scores.values():
+        score["max_gap"] = running
+    return scores
+
+
+def format_validation(scores) -> str:
+    """Formats validate() results as a text table."""
+    lines = [
+        f"{'Model':<12} | {'Primes':<10} | {'Sieve Viol.':<11} | {'Entropy Viol.':<13} | "
+        f"{'Record Viol.':<12} | {'First Failure':<13} | First Record Failure",
+        "-" * 110,
+    ]
+    for name, score in scores.items():
+        record_total = sum(score["record_violations"].values())
+        lines.append(
+            f"{name:<12} | {score['primes']:<10} | {score['violations']['Sieve']:<11} | "
+            f"{score['violations']['Entropy']:<13} | {record_total:<12} | "
+            f"{str(score['first_failure']):<13} | {score['first_record_failure']}"
+        )
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    print(format_validation(validate(stop=10**7)))
@@ -1,7 +1,46 @@
 # test_lgo.py - Example script to demonstrate importing and using the LGO model
 
-# IMPORTANT: This file must be in the same directory as lgo_model.py
-from lgo_model import calculate_raw_lgo_gap
+# IMPORTANT: This file must be in the same directory as the lgo package
+import asyncio
+import json
+import math
+import os
+import random
+import subprocess
+import sys
+import time
+
+import numpy as np
+import pytest
+
+import lgo
+from lgo.model import calculate_raw_lgo_gap
+from lgo.batch import FIELD_NAMES, calculate_raw_lgo_gap_batch, predict_maximum_prime_gap_batch
+from lgo.geometric_closure import predict_maximum_prime_gap
+from lgo.geometric_laws import (
+    MAXIMAL_GAP_RECORDS, li, li_inverse, li_inverse_batch, lgo_max_gap, lgo_prime, lgo_prime_batch, lgo_prime_raw,
+)
+from lgo import batch, instrument, unification_laws, unified_field
+from lgo.sensitivity import SURFACES, sweep_grid, unification_laws_batch, unified_field_batch
+from lgo.calibrate import CALIBRATION_MODELS, evaluate, grid_search, pattern_search, record_table
+from lgo.breakpoints import build_max_gap_index, build_raw_gap_index, max_gap_index
+from lgo.gapstats import GapStatistics
+from lgo import primecache
+from lgo.primecache import PrimeCache
+from lgo.table import PrimeTable
+from lgo.sweep import _claim, _release, _touch_lock, create_sweep, merge_sweep, run_shard, run_worker, sweep_status
+from lgo.server import PredictionServer
+from lgo.cli import main as cli_main, read_values
+from lgo.cache import ResultCache, cache_key, cached_primes_in_range, model_constants
+from lgo.validate import GAP_MODELS, validate
+from lgo.probe import _window_survivors, is_prime, next_prime_within_predicted_gap, probe_random_primes
+from lgo.primecount import nth_prime, prime_count
+from lgo.store import PrimeStore
+from lgo.stream import gap_records, iter_gap_chunks, iter_prime_gaps
+from lgo.sieve import (
+    WHEEL_MODULI, first_n_primes, parallel_first_n_primes, parallel_primes_in_range, primes_in_range, primes_up_to,
+    wheel_candidates, wheel_primes,
+)
 
 def run_test_cases():
     """Runs a series of tests to show how the LGO module functions."""
@@ -21,10 +60,643 @@ def run_test_cases():
         # Check for the Sieve/Entropy transition point
         marker = " <--- Transition Point" if Pn == 401 else ""
         
-        print(f"{Pn:<8} | {predicted_gap:<5} | {psi_magnitude:.16f:<20} | {field}{marker}")
+        print(f"{Pn:<8} | {predicted_gap:<5} | {psi_magnitude:<20.16f} | {field}{marker}")
         
     print("-" * 50)
     print("\nModule test complete. Import successful!")
 
+
+def _trial_division_primes(N):
+    """Reference prime list built the way the original scripts did it."""
+    primes = [2]
+    num = 3
+    while len(primes) < N:
+        limit = math.isqrt(num)
+        if all(num % p for p in primes if p <= limit):
+            primes.append(num)
+        num += 2
+    return primes
+
+
+def test_first_n_primes_matches_trial_division():
+    reference = _trial_division_primes(5000)
+    for N in (1, 2, 5, 6, 100, 1000, 5000):
+        assert first_n_primes(N) == reference[:N]
+        # Tiny segments exercise the segment-boundary arithmetic.
+        assert first_n_primes(N, segment_bytes=7) == reference[:N]
+    assert primes_in_range(1000, 5000) == [p for p in reference if 1000 <= p < 5000]
+
+
+def test_batch_predictors_match_scalar():
+    Pn = np.concatenate([np.arange(-2, 5000), np.array([2**31 - 1, 10**12 + 39, 2**52 + 1])])
+    for exact in (True, False):
+        gaps, psi, fields = calculate_raw_lgo_gap_batch(Pn, exact=exact)
+        for i, value in enumerate(Pn.tolist()):
+            gap, psi_ref, field = calculate_raw_lgo_gap(value)
+            assert gaps[i] == gap and FIELD_NAMES[fields[i]] == field
+            if exact:
+                assert psi[i] == psi_ref
+
+        primes = np.array(first_n_primes(1000))
+        n = np.arange(1, 1001)
+        predicted = predict_maximum_prime_gap_batch(n, primes, exact=exact)
+        assert predicted.tolist() == [predict_maximum_prime_gap(i, p) for i, p in zip(n.tolist(), primes.tolist())]
+
+    # exact=True is the default; scalar input gives 0-d arrays throughout.
+    gaps, psi, fields = calculate_raw_lgo_gap_batch(10**12 + 39)
+    assert all(isinstance(a, np.ndarray) and a.shape == () for a in (gaps, psi, fields))
+    assert (int(gaps), float(psi), FIELD_NAMES[fields]) == calculate_raw_lgo_gap(10**12 + 39)
+    predicted = predict_maximum_prime_gap_batch(1000, 7919)
+    assert isinstance(predicted, np.ndarray) and predicted.shape == ()
+    assert int(predicted) == predict_maximum_prime_gap(1000, 7919)
+
+
+def test_parallel_sieve_stitches_spans():
+    reference = primes_in_range(0, 300000)
+    primes, report = parallel_primes_in_range(0, 300000, workers=2, span=10001)
+    assert primes.tolist() == reference
+    gaps = [b - a for a, b in zip(reference, reference[1:])]
+    assert report["max_gap"] == max(gaps)
+    assert sum(w["numbers"] for w in report["per_worker"].values()) == 300000
+
+    # P_1..P_30 end at 113; the sieved range reaches the gap 127 - 113 = 14
+    primes, report = parallel_first_n_primes(30, workers=2)
+    assert primes.tolist() == reference[:30]
+    assert (report["max_gap"], report["max_gap_prime"]) == (8, 89)
+
+
+def test_streamed_gaps_match_prime_list(capsys):
+    reference = first_n_primes(20001)
+    rows = list(iter_prime_gaps(count=20000, segment_bytes=512))
+    assert rows == [(n + 1, p, q - p) for n, (p, q) in enumerate(zip(reference, reference[1:]))]
+
+    chunks = list(iter_gap_chunks(chunk_size=3000, count=20000))
+    assert [len(c[0]) for c in chunks] == [3000] * 6 + [2000]
+    assert np.concatenate([c[2] for c in chunks]).tolist() == [row[2] for row in rows]
+
+    assert [row[2] for row in gap_records(rows)] == [1, 2, 4, 6, 8, 14, 18, 20, 22, 34, 36, 44, 52, 72, 86]
+
+    from lgo.sieve_v2 import run_verification
+
+    run_verification(1000)
+    assert "P_1000 = 7919 | Field: Entropy | Predicted Max Gap: 26  | Actual Gap: 8" in capsys.readouterr().out
+
+
+def test_prime_store_lookups_and_append(tmp_path):
+    reference = first_n_primes(20000)
+    path = tmp_path / "primes.lgp"
+    with PrimeStore.build(path, 5000, checkpoint_every=16) as store:
+        store.extend_to(20000)
+    with PrimeStore(path) as store:
+        assert len(store) == 20000 and store.nth_prime(1000) == 7919
+        for n in (1, 2, 3, 17, 18, 19, 4999, 5000, 5001, 20000):
+            assert store.nth_prime(n) == reference[n - 1]
+        for n in (1, 2, 18, 217, 19999):
+            assert store.gap_after(n) == reference[n] - reference[n - 1]
+
+    # Half-gaps above 255 go through the escape code.
+    with PrimeStore.create(tmp_path / "wide.lgp", checkpoint_every=2) as store:
+        store.append([5, 7, 1007, 1009])
+        assert [store.nth_prime(n) for n in range(1, 7)] == [2, 3, 5, 7, 1007, 1009]
+        assert store.gap_after(4) == 1000
+
+    # An append interrupted before its header leaves uncounted bytes behind;
+    # they are dropped on open and never decoded.
+    with open(path, "ab") as fh:
+        fh.write(b"\x07" * 100)
+    with open(str(path) + ".idx", "ab") as fh:
+        fh.write(b"\x01" * 40)
+    with PrimeStore(path) as store:
+        store.extend_to(20500)
+        for n in (19999, 20000, 20001, 20017, 20500):
+            assert store.nth_prime(n) == first_n_primes(20500)[n - 1]
+
+
+def test_prime_count_and_nth_prime_anchors():
+    assert prime_count(10**6) == 78498
+    assert prime_count(10**9) == 50847534
+    # Definitive report anchors, plus one that is not a power of ten.
+    # (The pasted report lists 179848529 for P_10^7; the true value is 179424673.)
+    assert nth_prime(10**6) == 15485863
+    assert nth_prime(10**7) == 179424673
+    assert nth_prime(10**8) == 2038074743
+    assert nth_prime(1234567) == 19394489
+
+
+def test_geometric_laws_reproduce_definitive_report():
+    # LGO P_n and G_max columns of the original pasted report.
+    expected = {
+        10: (10, 3), 100: (493, 21), 1000: (7797, 44), 10**4: (104391, 73),
+        10**5: (1298610, 109), 10**6: (15480924, 151), 10**7: (179424344, 199),
+        10**8: (2038074743, 253),
+    }
+    for n, (P_lgo, G_lgo) in expected.items():
+        assert lgo_prime(n) == P_lgo
+        assert lgo_max_gap(P_lgo) == G_lgo
+    assert np.rint(lgo_prime_batch(list(expected))).astype(int).tolist() == [v[0] for v in expected.values()]
+
+    assert abs(li(1000.0) - 177.6096579901522) < 1e-9
+    assert abs(li(1e8) - 5762209.375448031) < 1e-6
+    for y in (10.0, 1234.5, 1e8, 1e15):
+        assert abs(li(li_inverse(y)) - y) < 1e-9 * y
+    assert np.allclose(li_inverse_batch([10.0, 1e8]), [li_inverse(10.0), li_inverse(1e8)], rtol=1e-13)
+    assert li.cache_info().maxsize == li_inverse.cache_info().maxsize == lgo_prime_raw.cache_info().maxsize > 0
+
+    streamed = [(row[2], row[1]) for row in gap_records(iter_prime_gaps(stop=2 * 10**6))]
+    assert streamed == [r for r in MAXIMAL_GAP_RECORDS if r[1] < 2 * 10**6]
+
+
+def test_gap_window_probe():
+    reference = primes_in_range(0, 100000)
+    assert [n for n in range(100000) if is_prime(n)] == reference
+    assert is_prime(2**64 - 59) and not is_prime(2**64 - 57)
+
+    for i, P in enumerate(reference[:-1]):
+        result = next_prime_within_predicted_gap(P, n=i + 1)
+        assert result.next_prime == reference[i + 1]
+        assert result.held == (result.actual_gap <= result.predicted_gap)
+
+    # The gap of 1132 after 1693182318746371 lies outside the predicted window.
+    result = next_prime_within_predicted_gap(1693182318746371)
+    assert result.actual_gap == 1132 and not result.held
+
+    results, summary = probe_random_primes(50, bits=80, seed=7)
+    assert summary["probes"] == 50 and summary["held"] + summary["violations"] == 50
+
+    # Probabilistic bases above 2^81 never touch the global random state
+    state = random.getstate()
+    assert is_prime(2**89 - 1) and not is_prime(2**89 + 1)
+    assert probe_random_primes(3, bits=96, seed=3) == probe_random_primes(3, bits=96, seed=3)
+    assert random.getstate() == state
+
+
+def test_bench_refuses_to_save_a_failing_baseline(tmp_path, monkeypatch):
+    from lgo import bench
+
+    path = tmp_path / "baseline.json"
+    results = {"primes": {"seconds": 1.0, "units_per_second": 1.0, "ok": True, "error": None}}
+    monkeypatch.setattr(bench, "run_benchmarks", lambda quick, only: results)
+    assert bench.main(["--save", "--baseline", str(path)]) == 0 and path.exists()
+
+    path.unlink()
+    results["primes"].update(ok=False, error="wrong pi(x)")
+    assert bench.main(["--save", "--baseline", str(path)]) == 1 and not path.exists()
+
+
+def test_validation_engine_matches_scalar_scoring():
+    scores = validate(count=5000, chunk_size=777)
+    violations, first_failure, running, record_violations = 0, None, 0, 0
+    for n, P_n, gap in iter_prime_gaps(count=5000):
+        predicted = predict_maximum_prime_gap(n, P_n)
+        running = max(running, gap)
+        if gap > predicted:
+            violations += 1
+            first_failure = first_failure or n
+        record_violations += running > predicted
+
+    closure = scores["closure_v2"]
+    assert closure["primes"] == 5000 and closure["histogram"].sum() == 5000
+    assert sum(closure["violations"].values()) == violations
+    assert closure["first_failure"] == first_failure
+    assert sum(closure["record_violations"].values()) == record_violations
+    assert set(scores) == {"lgo_model", "sieve_v2", "closure_v2"}
+
+
+def test_result_cache_roundtrip_and_eviction(tmp_path, monkeypatch):
+    cache = ResultCache(tmp_path, max_bytes=10**6)
+    first = cached_primes_in_range(0, 20000, cache)
+    assert first.tolist() == primes_in_range(0, 20000)
+    assert cached_primes_in_range(0, 20000, cache).tolist() == first.tolist()
+
+    assert cache_key("primes", lo=0, hi=10) != cache_key("primes", lo=0, hi=11)
+    for i in range(10):
+        cache.put(cache_key("blob", i=i), bytes(10000))
+    # Explicit, well-separated mtimes: the primes entry is oldest, then blob 0..9
+    now = time.time()
+    os.utime(cache._path(cache_key("primes", lo=0, hi=20000)), (now - 1000, now - 1000))
+    for i in range(10):
+        os.utime(cache._path(cache_key("blob", i=i)), (now - 900 + i, now - 900 + i))
+    assert cache.get(cache_key("blob", i=0)) == bytes(10000)  # read: now most recent
+
+    cache.max_bytes = 50000
+    cache.evict()
+    assert cache.size() <= 50000
+    assert cache.get(cache_key("blob", i=0)) == cache.get(cache_key("blob", i=9)) == bytes(10000)
+    assert cache.get(cache_key("blob", i=1)) is None
+    assert cache.get(cache_key("primes", lo=0, hi=20000)) is None
+
+    # Puts only scan the directory when the running total passes max_bytes;
+    # the scan also removes temp files a killed writer left behind.
+    scans = []
+    full_scan = cache._evict
+    monkeypatch.setattr(cache, "_evict", lambda: scans.append(1) or full_scan())
+    cache.clear()
+    cache.max_bytes = 100000
+    for i in range(9):
+        cache.put(cache_key("blob", i=i), bytes(10000))
+    assert scans == [] and cache._read_total() == cache.size()
+    stale = os.path.join(os.path.dirname(cache._path(cache_key("blob", i=0))), "dead.tmp")
+    fresh = stale.replace("dead", "live")
+    for tmp in (stale, fresh):
+        with open(tmp, "wb") as fh:
+            fh.write(bytes(100))
+    os.utime(stale, (now - 7200, now - 7200))
+    for i in range(9, 13):
+        cache.put(cache_key("blob", i=i), bytes(10000))
+    assert len(scans) == 2 and cache.size() <= 100000 and cache._read_total() == cache.size()
+    assert not os.path.exists(stale) and os.path.exists(fresh)
+
+    # The key is built from the constants the evaluators read (lgo.batch)
+    key = cache_key("validate", constants=model_constants())
+    before = GAP_MODELS["sieve_v2"].evaluate(np.array([10]), np.array([29]))[0]
+    monkeypatch.setattr(batch, "C_ADD_GEOMETRIC", batch.C_ADD_GEOMETRIC + 1.0)
+    assert cache_key("validate", constants=model_constants()) != key
+    assert GAP_MODELS["sieve_v2"].evaluate(np.array([10]), np.array([29]))[0] != before
+
+
+def test_calibration_matches_brute_force():
+    table = record_table(limit=10**7)
+    assert table["gap"].tolist() == [g for g, p in MAXIMAL_GAP_RECORDS if p + g <= 10**7]
+    assert record_table(stop=10**5)["gap"].tolist() == table["gap"][:14].tolist()
+
+    model = CALIBRATION_MODELS["volatility"]
+    grid = np.linspace(0.3, 1.0, 701)
+    params, loss, stats = grid_search(model, {"C_MAX": grid}, table, chunk=64)
+    brute = evaluate(model, {"C_MAX": grid}, table)
+    assert loss == min(brute.min(), evaluate(model, {"C_MAX": [0.55]}, table)[0])
+    assert stats["evaluated"] == 701 and stats["pruned"] > 0
+
+    refined, refined_loss = pattern_search(model, table, start=params, iterations=20, samples=256, seed=1)
+    assert refined_loss <= loss
+
+
+def test_package_import_is_lazy():
+    code = "import sys, lgo; print(sorted(m for m in sys.modules if m.startswith(('lgo.', 'numpy'))))"
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    assert out.strip() == "[]"
+    code = "import lgo.sieve_v2, lgo.geometric_closure, lgo.definitive_laws"
+    assert subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout == ""
+
+    assert lgo.first_n_primes(5) == [2, 3, 5, 7, 11]
+    assert lgo.get_predictor("closure_v2") is predict_maximum_prime_gap
+    assert lgo.get_predictor("lgo_model")(4, 7) == calculate_raw_lgo_gap(7)[0]
+    lgo.register_predictor("test.sieve_v2", "lgo.sieve_v2:predict_maximum_prime_gap")
+    try:
+        assert lgo.get_predictor("test.sieve_v2")(1000, 7919) == lgo.sieve_v2.predict_maximum_prime_gap(1000, 7919)
+        # GAP_MODELS is derived from PREDICTORS: the new law is validated through its scalar function
+        assert list(GAP_MODELS) == list(lgo.PREDICTORS)
+        scores = validate(count=3000, models=["sieve_v2", "test.sieve_v2"])
+        assert scores["test.sieve_v2"]["violations"] == scores["sieve_v2"]["violations"]
+    finally:
+        del lgo.PREDICTORS["test.sieve_v2"]
+    assert "test.sieve_v2" not in GAP_MODELS
+
+    # Replacing a predictor retires its vectorized evaluator
+    original = lgo.get_predictor("closure_v2")
+    lgo.register_predictor("closure_v2", lambda n, P_n: 1000)
+    try:
+        scores = validate(count=3000, models=["closure_v2"])["closure_v2"]
+        assert scores["violations"] == {"Sieve": 0, "Entropy": 0} and scores["first_failure"] is None
+    finally:
+        lgo.register_predictor("closure_v2", original)
+    assert validate(count=3000, models=["closure_v2"])["closure_v2"]["violations"]["Entropy"] == 44
+
+
+def test_unification_sweep_matches_scalar_derivations():
+    point = unified_field_batch(unified_field.C_MAX)
+    G, M_G = unified_field.derive_g_constant()
+    alpha_inv, alpha_dev = unified_field.derive_alpha_constant()
+    c, M_c, c_dev = unified_field.derive_c_constant()
+    hbar = unified_field.derive_hbar_constant()
+    _, M_P, M_P_dev = unified_field.test_system_closure(G, c, hbar)
+    assert (point["G"], point["hbar"], point["c"], point["c_deviation"]) == (M_G, unified_field.M_HBARR, M_c, c_dev)
+    assert (point["alpha_inv"], point["alpha_inv_deviation"]) == (alpha_inv, alpha_dev)
+    assert (point["M_P"], point["M_P_deviation"]) == (M_P, M_P_dev)
+    assert unified_field_batch(0.0)["M_P"] == 0.0  # undefined closure, as in test_system_closure
+
+    c_max = np.linspace(0.5, 0.6, 7)
+    c_zeta = np.linspace(0.7, 0.72, 5)
+    offsets = np.array([0.75, 0.7634, 0.78])
+    surfaces = sweep_grid(c_max, c_zeta, offsets, chunk=10)
+    full = unified_field_batch(c_max[:, None, None], c_zeta[None, :, None], offsets[None, None, :])
+    for name in SURFACES:
+        assert surfaces[name].shape == (7, 5, 3)
+        assert np.array_equal(surfaces[name], full[name + "_deviation"])
+
+    laws = unification_laws_batch()
+    assert laws["G"] * 10**-11 == unification_laws.derive_gravitational_constant()
+    assert laws["alpha_inv"] == unification_laws.derive_fine_structure_constant()
+    assert laws["c"] * 10**8 == unification_laws.derive_speed_of_light()
+
+
+def test_wheel_sieve_matches_odd_only():
+    reference = primes_in_range(0, 100000, wheel=2)
+    windows = [(0, 100000), (0, 2), (2, 8), (7, 8), (29, 32), (209, 212), (1000, 1000), (65537, 99991)]
+    for wheel in WHEEL_MODULI:
+        assert list(wheel_candidates(0, 1000, wheel)) == [
+            n for n in range(1000) if all(n % p for p in wheel_primes(wheel))
+        ]
+        for segment_bytes in (None, 7, 48, 1000):
+            for lo, hi in windows:
+                expected = [p for p in reference if lo <= p < hi]
+                assert primes_in_range(lo, hi, segment_bytes=segment_bytes, wheel=wheel) == expected
+            assert first_n_primes(2000, segment_bytes, wheel) == reference[:2000]
+        assert [row[1] for row in iter_prime_gaps(count=9000, wheel=wheel)] == reference[:9000]
+
+    # High narrow windows exercise the sparse-prime path
+    lo = 10**12
+    assert primes_in_range(lo, lo + 20000, wheel=30) == primes_in_range(lo, lo + 20000, wheel=2)
+    assert primes_in_range(lo, lo + 20000, wheel=210) == primes_in_range(lo, lo + 20000, wheel=2)
+    for P in (2, 97, 3989, 10**18 + 3, 2**89 - 1):
+        assert _window_survivors(P, P + 500, 30) == _window_survivors(P, P + 500, 210) == _window_survivors(P, P + 500, 2)
+
+
+def test_instrumentation_counters_and_dump(tmp_path):
+    instrument.enable()
+    try:
+        primes_up_to(200000, wheel=2)
+        primes_up_to(200000, wheel=30)
+        sieved = instrument.snapshot()["counters"]
+        validate(count=5000, chunk_size=1000)
+        next_prime_within_predicted_gap(10**12 + 39)
+        snap = instrument.snapshot()
+    finally:
+        instrument.disable()
+    assert sieved["sieve.odd.primes"] == sieved["sieve.wheel30.primes"] == prime_count(200000)
+    assert sieved["sieve.odd.candidates"] > sieved["sieve.wheel30.candidates"] > 0
+    counters, phases = snap["counters"], snap["phases"]
+    assert counters["validate.primes"] == 5000
+    assert counters["probe.miller_rabin"] >= 1
+    for name in ("sieve.odd.segment", "sieve.wheel30.emit", "validate.scoring", "probe.window_sieve"):
+        assert phases[name]["calls"] >= 1
+    assert "sieve.odd.primes_per_second" in snap["rates"]
+
+    path = tmp_path / "profile.json"
+    instrument.dump(str(path))
+    assert json.loads(path.read_text())["counters"] == counters
+    instrument.reset()
+    primes_up_to(1000)
+    assert instrument.snapshot()["counters"] == {}
+
+
+def test_cli_streams_predictions(tmp_path):
+    values = first_n_primes(3000)
+    text = tmp_path / "primes.txt"
+    text.write_text(" ".join(map(str, values[:1000])) + "\n" + "\n".join(map(str, values[1000:])))
+    # Tiny chunks split numbers across reads
+    assert np.concatenate(list(read_values([str(text)], chunk_bytes=7))).tolist() == values
+
+    out = tmp_path / "out.ndjson"
+    assert cli_main(["predict", str(text), "-o", str(out)]) == 0
+    rows = [json.loads(line) for line in out.read_text().splitlines()]
+    assert [row["predicted_gap"] for row in rows] == [
+        predict_maximum_prime_gap(n, P) for n, P in enumerate(values, 1)
+    ]
+
+    binary = tmp_path / "ns.u64"
+    np.arange(1, 3001, dtype="<u8").tofile(binary)
+    raw = tmp_path / "out.bin"
+    assert cli_main(["predict", "--index", "--from", "u64", "--to", "raw", str(binary), "-o", str(raw)]) == 0
+    records = np.fromfile(raw, dtype="<i8").reshape(-1, 4)
+    assert records[:, 1].tolist() == values
+    assert records[:, 2].tolist() == [row["predicted_gap"] for row in rows]
+
+    sieved = tmp_path / "sieve.csv"
+    assert cli_main(["sieve", str(values[-1] + 1), "--to", "csv", "-o", str(sieved)]) == 0
+    assert sieved.read_text().split() == ["p"] + list(map(str, values))
+
+
+def test_prediction_server_batches_concurrent_requests():
+    async def get(port, path):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(f"GET {path} HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n\r\n".encode())
+        status = int((await reader.readline()).split()[1])
+        body = (await reader.read()).split(b"\r\n\r\n", 1)[1]
+        writer.close()
+        return status, json.loads(body)
+
+    async def scenario():
+        server = await PredictionServer(window=0.01, warm=1000).start(port=0)
+        try:
+            primes = first_n_primes(200)
+            paths = [f"/max-gap?p={P}" for P in primes] + [f"/nth-prime?n={n}" for n in range(1, 201)]
+            replies = await asyncio.gather(*(get(server.port, path) for path in paths))
+            gap = await get(server.port, "/gap?p=50021")
+            errors = await asyncio.gather(get(server.port, "/max-gap"), get(server.port, "/nth-prime?n=0"),
+                                          get(server.port, "/nope"), get(server.port, f"/nth-prime?n={2**62}"))
+
+            def exhausted(batch):
+                raise MemoryError("evaluator ran out of memory")
+
+            class Interrupted(BaseException):
+                pass
+
+            def interrupted(batch):
+                raise Interrupted
+
+            # Failed, short or interrupted batches answer 500 instead of hanging
+            for evaluate in (exhausted, lambda batch: [], interrupted):
+                server.batchers["/gap"].evaluate = evaluate
+                errors.append(await asyncio.wait_for(get(server.port, "/gap?p=50021"), 5))
+
+            reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+            writer.write(b"GARBAGE\r\n\r\n")
+            errors.append((int((await asyncio.wait_for(reader.read(), 5)).split()[1]), None))
+            writer.close()
+            return replies, gap, errors, server.stats()
+        finally:
+            server.close()
+            await server.wait_closed()
+
+    replies, gap, errors, stats = asyncio.run(scenario())
+    primes = first_n_primes(200)
+    assert all(status == 200 for status, _ in replies)
+    assert [body["max_gap"] for _, body in replies[:200]] == [
+        predict_maximum_prime_gap(n, P) for n, P in enumerate(primes, 1)
+    ]
+    assert [body["P_n"] for _, body in replies[200:]] == primes
+    assert gap[1]["gap"] == calculate_raw_lgo_gap(50021)[0]
+    assert [status for status, _ in errors] == [400, 400, 404, 400, 500, 500, 500, 400]
+    assert "MemoryError" in errors[4][1]["error"] and "0 results for 1" in errors[5][1]["error"]
+
+    max_gap = stats["endpoints"]["/max-gap"]
+    assert max_gap["requests"] == 201 and max_gap["errors"] == 1
+    assert max_gap["batches"] < 200 and max_gap["p99_ms"] >= max_gap["p50_ms"] > 0
+
+
+def test_sharded_sweep_resumes_and_merges(tmp_path):
+    directory = tmp_path / "sweep"
+    create_sweep(directory, 200000, 45000, block_span=8000)
+    assert create_sweep(directory, 200000, 45000, block_span=8000)["shards"][-1] == [180002, 200000]
+    with pytest.raises(ValueError):
+        create_sweep(directory, 300000, 45000)
+
+    # Interrupted after two blocks, then resumed from the checkpoint by a worker
+    assert run_shard(directory, 2, max_blocks=2) is False
+    assert sweep_status(directory)["checkpointed"] == 1
+    with pytest.raises(ValueError):
+        merge_sweep(directory)
+    assert run_worker(directory) == 5
+
+    # A stale lock is taken over exactly once; the new lock is fresh
+    lock = directory / "shards" / "000001.lock"
+    lock.write_text("dead-host 1\n")
+    os.utime(lock, (time.time() - 7200, time.time() - 7200))
+    token = _claim(directory, 1, stale_after=3600)
+    assert token and _claim(directory, 1, stale_after=3600) is None
+    assert sorted(p.name for p in lock.parent.iterdir() if p.name.startswith("000001.lock")) == ["000001.lock"]
+    # The previous owner can neither refresh nor release the lock it lost
+    assert not _touch_lock(directory, 1, "dead-host 1")
+    _release(directory, 1, "dead-host 1")
+    assert _touch_lock(directory, 1, token)
+    _release(directory, 1, token)
+    assert not lock.exists()
+
+    report = merge_sweep(directory)
+    scores = validate(stop=200000)
+    for name, total in report["models"].items():
+        assert total["violations"] == scores[name]["violations"]
+        assert total["first_failure"] == scores[name]["first_failure"]
+    records = list(gap_records(iter_prime_gaps(stop=200000)))
+    assert report["records"] == [list(row) for row in records]
+    assert report["primes"] == prime_count(200000)
+    assert report["gap_statistics"]["gaps"] == report["primes"]
+    assert report["gap_statistics"]["records"] == report["records"]
+    assert (directory / "merged.json").exists()
+
+
+def test_breakpoint_index_matches_predictors():
+    from lgo.sieve_v2 import predict_maximum_prime_gap as predict_sieve_v2
+
+    limit = 10**12
+    for model, scalar in (("closure_v2", predict_maximum_prime_gap), ("sieve_v2", predict_sieve_v2)):
+        index = build_max_gap_index(model, limit)
+        assert [index.predict(1, P) for P in range(2, 2742)] == [scalar(1, P) for P in range(2, 2742)]
+        for lo, hi, value in index.entropy.runs():
+            for P in {lo, max(lo - 1, 2), hi - 1}:
+                assert index.predict(500, P) == scalar(500, P)
+    P = np.arange(2, 10**6, 997)
+    assert index.predict_batch(500, P).tolist() == [predict_sieve_v2(500, p) for p in P.tolist()]
+
+    raw = build_raw_gap_index(limit)
+    for lo, hi, value in raw.runs():
+        for P in {lo, max(lo - 1, 0), hi - 1}:
+            assert raw.lookup(P) == calculate_raw_lgo_gap(P)[0]
+    assert all(raw.lookup(P) == calculate_raw_lgo_gap(P)[0] for P in range(0, 3000))
+
+    # Range queries
+    entropy = build_max_gap_index("closure_v2", limit).entropy
+    (lo, hi), = entropy.intervals(40)
+    assert entropy.lookup(lo) == entropy.lookup(hi - 1) == 40 != entropy.lookup(hi)
+    counts = entropy.bucket_prime_counts(2750, 10**5)
+    assert sum(counts.values()) == prime_count(10**5 - 1) - prime_count(2749)
+
+    # Near 10^14 the float predictor floors 163.99999999999997 up to 164
+    assert max_gap_index().predict(500, 244222913058453) == 162
+    assert predict_maximum_prime_gap(500, 244222913058453) == 164
+
+    # Sieve-field queries past P_400 use the scalar formula; entropy queries past the limit raise
+    index = max_gap_index()
+    assert index.predict(10, 10**6) == predict_maximum_prime_gap(10, 10**6)
+    assert index.predict_batch([10, 500], [10**6, 10**6]).tolist() == [
+        predict_maximum_prime_gap(10, 10**6), index.predict(500, 10**6)]
+    with pytest.raises(ValueError):
+        index.predict(500, 10**18)
+
+
+def test_prime_table_views_and_gap_statistics():
+    N = 20000
+    reference = first_n_primes(N)
+    table = PrimeTable.first_n(N)
+    assert len(table) == N and table[-1] == reference[-1] and list(table) == reference
+    assert table.primes.dtype == np.uint32 and table.gaps.dtype == np.uint16
+    assert table.nbytes == 6 * N - 2
+    assert memoryview(table.primes).format == "I"
+    assert table.gaps.tolist() == [b - a for a, b in zip(reference, reference[1:])]
+
+    view = table[1000:2000]
+    assert np.shares_memory(view.primes, table.primes) and np.shares_memory(view.gaps, table.gaps)
+    assert view.first_index == 1001 and view.nth(1500) == reference[1499] and len(view.gaps) == 999
+    assert view.index_of(reference[1499]) == 1500 and reference[1499] in view and 4 not in view
+    with pytest.raises(ValueError):
+        PrimeTable([2, 5, 3])
+    assert isinstance(table[::2], np.ndarray) and table[::2].tolist() == reference[::2]
+    assert table[10:0:-3].tolist() == reference[10:0:-3] and not table[::-1].flags.writeable
+
+    n, P_n, gaps = table.record_gaps()
+    records = list(gap_records(iter_prime_gaps(count=N - 1)))
+    assert list(zip(n.tolist(), P_n.tolist(), gaps.tolist())) == records
+    assert table.gap_summary()["max_gap"] == max(gaps) == np.flatnonzero(table.gap_histogram())[-1]
+
+    scores = validate(count=N - 1, models=["closure_v2"])["closure_v2"]
+    summary = table.field_summary("closure_v2")
+    assert {label: field["violations"] for label, field in summary.items()} == scores["violations"]
+    assert summary["Sieve"]["primes"] == 400
+
+    window = PrimeTable.in_range(10**6, 10**6 + 5000)
+    assert window.first_index == prime_count(10**6) + 1
+    assert window.tolist() == primes_in_range(10**6, 10**6 + 5000)
+
+
+def test_gap_statistics_merge_exactly():
+    whole = GapStatistics.from_stream(2, 400000)
+    shards = [GapStatistics.from_stream(lo, hi) for lo, hi in ((2, 1000), (1000, 123457), (123457, 400000))]
+    left = GapStatistics.from_dict(shards[0].to_dict()).merge(shards[1]).merge(shards[2])
+    right = shards[0].merge(GapStatistics.from_dict(shards[1].to_dict()).merge(shards[2]))
+    assert left.to_dict() == right.to_dict() == whole.to_dict()
+    assert json.loads(json.dumps(whole.to_dict())) == whole.to_dict()
+    with pytest.raises(ValueError):
+        GapStatistics.from_stream(2, 1000).merge(GapStatistics.from_stream(500, 2000))
+
+    primes = np.array(primes_up_to(400000), dtype=np.int64)
+    gaps = np.diff(primes)
+    summary = whole.summary()
+    assert summary["gaps"] == len(gaps) and summary["primes"] == len(primes)
+    assert summary["records"] == [list(row) for row in gap_records(iter_prime_gaps(stop=primes[-1]))]
+    assert whole.gap_histogram() == {int(g): int(c) for g, c in enumerate(np.bincount(gaps)) if c}
+
+    decade = summary["decades"][-1]
+    in_decade = primes[:-1] >= 10**5
+    merit = gaps[in_decade] / np.log(primes[:-1][in_decade])
+    assert decade["decade"] == 5 and decade["gaps"] == int(in_decade.sum())
+    assert decade["max_merit"]["P_n"] == int(primes[:-1][in_decade][np.argmax(merit)])
+    assert math.isclose(decade["mean_merit"], merit.mean(), rel_tol=1e-9)
+    residual = gaps[in_decade] - calculate_raw_lgo_gap_batch(primes[:-1][in_decade], exact=False)[1]
+    assert math.isclose(decade["psi_residual"]["std"], residual.std(), rel_tol=1e-6)
+
+
+def test_prime_cache_grows_incrementally_and_evicts():
+    reference = primes_up_to(3 * 10**6)
+    cache = PrimeCache()
+    assert cache.first_n(1000).tolist() == reference[:1000]
+    segments = len(cache._segments)
+    assert cache.primes_up_to(7919).tolist() == reference[:1000] and len(cache._segments) == segments
+    assert cache.nth_prime(2000) == reference[1999]
+    assert cache.nth_primes(np.array([1, 2, 1000, 2000])).tolist() == [2, 3, reference[999], reference[1999]]
+    assert cache.primes_up_to(3 * 10**6).tolist() == reference
+    small = set(primes_up_to(1300))
+    assert all(cache.is_prime(x) == (x in small) for x in range(1300))
+    assert cache.is_prime(2**61 - 1) and not cache.is_prime(2**61 + 1)
+    with pytest.raises(ValueError):
+        cache.nth_prime(0)
+
+    # Views survive growth and eviction
+    view = cache.first_n(10)
+    bounded = PrimeCache(max_bytes=1 << 20)
+    assert bounded.nth_prime(200000) == reference[199999]
+    assert bounded.nbytes <= 1 << 20 and 0 < bounded.count < 200000
+    assert bounded.primes_up_to(bounded.limit - 1).tolist() == reference[:bounded.count]
+    assert view.tolist() == reference[:10] and not view.flags.writeable
+
+    assert cache.first_n(10).dtype == np.uint32 and cache.nth_primes([5]).dtype == np.int64
+    assert PrimeCache().primes_up_to(0).size == 0 and not cache.is_prime(-7)
+
+    # PrimeTable.first_n shares the bounded, process-wide cache instead of copying it
+    shared = primecache.shared_cache()
+    table = PrimeTable.first_n(1000)
+    assert table.tolist() == reference[:1000] and np.shares_memory(table.primes, shared.first_n(1000))
+    assert shared.max_bytes == primecache.SHARED_MAX_BYTES == primecache.DEFAULT_MAX_BYTES
+
+
 if __name__ == "__main__":
     run_test_cases()